@@ -1,7 +1,10 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Awaitable, Callable, List, Optional, Tuple
+import asyncio
 import structlog
 
+from ...services.search_result_cache import SearchResultCache, copy_results
+
 logger = structlog.get_logger()
 
 
@@ -30,6 +33,35 @@ class SearchStrategy(ABC):
         return matches
 
 
+class StrategyMemo:
+    """Strategy results memoized for one order
+    
+    Keyed by (strategy, normalized query, filters, top_k). Concurrent callers
+    with the same key share one in-flight search instead of each hitting the
+    catalog; every caller gets its own copy of the results.
+    """
+    
+    def __init__(self):
+        self._searches: Dict[Tuple, asyncio.Task] = {}
+        self.stats = {"hits": 0, "misses": 0}
+    
+    @staticmethod
+    def make_key(strategy: SearchStrategy, query: str, filters: Optional[Dict], top_k: int) -> Tuple:
+        return (strategy.strategy_type,) + SearchResultCache.make_key(query, filters, top_k)
+    
+    async def get_or_run(self, key: Tuple,
+                         search: Callable[[], Awaitable[List[Dict[str, Any]]]]) -> List[Dict[str, Any]]:
+        task = self._searches.get(key)
+        if task is None:
+            self.stats["misses"] += 1
+            task = self._searches[key] = asyncio.ensure_future(search())
+        else:
+            self.stats["hits"] += 1
+        
+        # Shielded so one cancelled caller doesn't cancel the search for the others
+        return copy_results(await asyncio.shield(task))
+
+
 class SearchContext:
     """Context for executing search strategies"""
     
@@ -39,8 +71,18 @@ class SearchContext:
         self.min_confidence_threshold = 0.5
     
     async def execute_strategy(self, strategy: SearchStrategy, query: str, 
-                             filters: Optional[Dict] = None, top_k: int = 10) -> List[Dict[str, Any]]:
-        """Execute a strategy with context"""
+                             filters: Optional[Dict] = None, top_k: int = 10,
+                             memo: Optional[StrategyMemo] = None) -> List[Dict[str, Any]]:
+        """Execute a strategy with context, reusing results from ``memo`` if given"""
+        if memo is not None:
+            key = memo.make_key(strategy, query, filters, top_k)
+            return await memo.get_or_run(
+                key, lambda: self._execute_strategy(strategy, query, filters, top_k)
+            )
+        return await self._execute_strategy(strategy, query, filters, top_k)
+    
+    async def _execute_strategy(self, strategy: SearchStrategy, query: str,
+                                filters: Optional[Dict], top_k: int) -> List[Dict[str, Any]]:
         try:
             matches = await strategy.execute(query, filters, top_k)
             weighted_matches = strategy.apply_weight(matches)
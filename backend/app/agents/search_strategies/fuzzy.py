@@ -25,27 +25,30 @@ class FuzzyMatchStrategy(SearchStrategy):
         if not important_words:
             return []
         
-        all_matches = []
+        # Combinations of up to two adjacent important words
+        phrases = [
+            " ".join(important_words[i:j])
+            for i in range(len(important_words))
+            for j in range(i + 1, min(i + 3, len(important_words) + 1))
+        ]
         
-        # Search for combinations of important words
-        for i in range(len(important_words)):
-            for j in range(i + 1, min(i + 3, len(important_words) + 1)):
-                phrase = " ".join(important_words[i:j])
-                
-                matches = await self.parts_catalog.search_parts(
-                    phrase,
-                    filters,
-                    top_k=3
-                )
-                
-                # Mark as fuzzy matches
-                for match in matches:
-                    if "scores" not in match:
-                        match["scores"] = {}
-                    match["scores"]["fuzzy_match"] = True
-                    match["scores"]["combined_score"] *= 0.8  # Reduce confidence
-                
-                all_matches.extend(matches)
+        # One batched catalog search for all phrases instead of one search each
+        phrase_matches = await self.parts_catalog.search_parts_batch(
+            phrases,
+            filters,
+            top_k=3
+        )
+        
+        all_matches = []
+        for matches in phrase_matches:
+            # Mark as fuzzy matches
+            for match in matches:
+                if "scores" not in match:
+                    match["scores"] = {}
+                match["scores"]["fuzzy_match"] = True
+                match["scores"]["combined_score"] *= 0.8  # Reduce confidence
+            
+            all_matches.extend(matches)
         
         # Deduplicate by part ID
         seen_ids = set()
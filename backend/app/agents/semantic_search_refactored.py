@@ -4,7 +4,7 @@ import structlog
 
 from ..services.local_parts_catalog import LocalPartsCatalogService
 from ..services.embeddings import PartEmbeddingService
-from .search_strategies.base import SearchContext
+from .search_strategies.base import SearchContext, StrategyMemo
 from .search_strategies.part_number import PartNumberStrategy
 from .search_strategies.description import FullDescriptionStrategy, NormalizedDescriptionStrategy
 from .search_strategies.key_terms import KeyTermsStrategy
@@ -50,15 +50,19 @@ class SemanticSearchAgent:
             matches = {}
             match_stats = self._init_match_stats(len(line_items))
             
+            # Items in one order often repeat descriptions; share their searches
+            memo = StrategyMemo()
+            
             # Process each line item
             tasks = []
             for i, item in enumerate(line_items):
                 item_id = f"item_{i}"
-                task = self._process_item(item_id, item)
+                task = self._process_item(item_id, item, memo)
                 tasks.append(task)
             
             # Process items concurrently
             results = await asyncio.gather(*tasks, return_exceptions=True)
+            logger.debug("Strategy memo usage", **memo.stats)
             
             # Collect results and update statistics
             for i, result in enumerate(results):
@@ -83,13 +87,14 @@ class SemanticSearchAgent:
             logger.error("Semantic search failed", error=str(e))
             raise Exception(f"Semantic search failed: {str(e)}")
     
-    async def _process_item(self, item_id: str, item: Dict[str, Any]) -> List[Dict[str, Any]]:
+    async def _process_item(self, item_id: str, item: Dict[str, Any],
+                            memo: Optional[StrategyMemo] = None) -> List[Dict[str, Any]]:
         """Process a single line item"""
         logger.debug(f"Processing {item_id}", 
                     description=item.get("description", "")[:100])
         
         # Find matches
-        item_matches = await self._find_matches_for_item(item)
+        item_matches = await self._find_matches_for_item(item, memo)
         
         # Add match explanations
         for match in item_matches:
@@ -99,7 +104,8 @@ class SemanticSearchAgent:
         
         return item_matches
     
-    async def _find_matches_for_item(self, item: Dict[str, Any]) -> List[Dict[str, Any]]:
+    async def _find_matches_for_item(self, item: Dict[str, Any],
+                                     memo: Optional[StrategyMemo] = None) -> List[Dict[str, Any]]:
         """Find matches for a single line item using multiple strategies"""
         description = item.get("description", "")
         part_number = item.get("part_number")
@@ -130,7 +136,7 @@ class SemanticSearchAgent:
             filters = self._extract_filters(item, query)
             
             matches = await self.search_context.execute_strategy(
-                strategy, query, filters, top_k=10
+                strategy, query, filters, top_k=10, memo=memo
             )
             all_matches.extend(matches)
         
@@ -139,7 +145,7 @@ class SemanticSearchAgent:
         
         # Apply fuzzy matching if results are poor
         if self._should_apply_fuzzy_matching(unique_matches):
-            fuzzy_matches = await self._apply_fuzzy_matching(description, item)
+            fuzzy_matches = await self._apply_fuzzy_matching(description, item, memo)
             unique_matches.extend(fuzzy_matches)
             unique_matches = self.match_processor.deduplicate_matches(unique_matches)
         
@@ -195,13 +201,14 @@ class SemanticSearchAgent:
         
         return best_score < 0.6
     
-    async def _apply_fuzzy_matching(self, description: str, item: Dict[str, Any]) -> List[Dict[str, Any]]:
+    async def _apply_fuzzy_matching(self, description: str, item: Dict[str, Any],
+                                    memo: Optional[StrategyMemo] = None) -> List[Dict[str, Any]]:
         """Apply fuzzy matching strategy"""
         strategy = self.strategies["fuzzy"]
         filters = self._extract_filters(item, description)
         
         return await self.search_context.execute_strategy(
-            strategy, description, filters, top_k=5
+            strategy, description, filters, top_k=5, memo=memo
         )
     
     def _init_match_stats(self, total_items: int) -> Dict[str, int]:
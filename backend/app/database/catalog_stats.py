@@ -0,0 +1,218 @@
+"""
+Materialized parts catalog statistics
+Aggregates are computed once and reused until SQLite's data_version shows the
+catalog was modified, so stats and health endpoints cost O(1) between writes
+"""
+
+import sqlite3
+import threading
+import time
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CatalogStatsSnapshot:
+    """Catalog aggregates as of one data_version"""
+    data_version: int
+    total_parts: int
+    categories: List[Dict[str, Any]]
+    availability: List[Dict[str, Any]]
+    pricing: Dict[str, Any]
+    materials: List[str]
+    refreshed_at: str = field(default_factory=lambda: datetime.now().isoformat())
+    refresh_time: float = 0.0
+
+    def to_stats(self) -> Dict[str, Any]:
+        """Fresh copy in the get_database_stats() shape (callers may annotate it)"""
+        return {
+            'total_parts': self.total_parts,
+            'availability': [dict(row) for row in self.availability],
+            'pricing': dict(self.pricing),
+            'categories': [dict(row) for row in self.categories],
+            'stats_refreshed_at': self.refreshed_at,
+        }
+
+    @classmethod
+    def merge(cls, snapshots: List["CatalogStatsSnapshot"]) -> "CatalogStatsSnapshot":
+        """Combine the snapshots of a sharded catalog into catalog-wide stats
+
+        data_version is the sum of the shards' versions: each only ever grows,
+        so the sum changes whenever any shard changes.
+        """
+        if len(snapshots) == 1:
+            return snapshots[0]
+
+        category_counts: Dict[str, int] = {}
+        availability_counts: Dict[str, int] = {}
+        for snapshot in snapshots:
+            for row in snapshot.categories:
+                category_counts[row['category']] = category_counts.get(row['category'], 0) + row['part_count']
+            for row in snapshot.availability:
+                status = row['availability_status']
+                availability_counts[status] = availability_counts.get(status, 0) + row['count']
+
+        priced = [s.pricing for s in snapshots if s.pricing.get('total_with_price')]
+        total_with_price = sum(p['total_with_price'] for p in priced)
+        pricing = {
+            'min_price': min((p['min_price'] for p in priced), default=None),
+            'max_price': max((p['max_price'] for p in priced), default=None),
+            'avg_price': (
+                sum(p['avg_price'] * p['total_with_price'] for p in priced) / total_with_price
+                if total_with_price else None
+            ),
+            'total_with_price': total_with_price,
+        }
+
+        # Same orderings as the single-database queries (NULL category first)
+        categories = sorted(category_counts.items(), key=lambda item: (item[0] is not None, item[0]))
+        availability = sorted(availability_counts.items(), key=lambda item: -item[1])
+
+        return cls(
+            data_version=sum(s.data_version for s in snapshots),
+            total_parts=sum(s.total_parts for s in snapshots),
+            categories=[{'category': name, 'part_count': count} for name, count in categories],
+            availability=[{'availability_status': status, 'count': count} for status, count in availability],
+            pricing=pricing,
+            materials=sorted(set().union(*(s.materials for s in snapshots))),
+            refreshed_at=min(s.refreshed_at for s in snapshots),
+            refresh_time=sum(s.refresh_time for s in snapshots)
+        )
+
+
+class DataVersionWatcher:
+    """Reads a database's PRAGMA data_version on a connection of its own
+
+    Kept apart from CatalogStatsCache's connection so a version check never
+    waits behind a stats recompute.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def data_version(self) -> int:
+        with self._lock:
+            if self._conn is None:
+                self._conn = sqlite3.connect(
+                    f"file:{self.db_path}?mode=ro", uri=True,
+                    timeout=30.0, check_same_thread=False, isolation_level=None
+                )
+            return self._conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class CatalogStatsCache:
+    """Keeps a CatalogStatsSnapshot in step with the database file
+
+    ``PRAGMA data_version`` changes on a connection whenever *another*
+    connection commits, so a dedicated read-only connection that never writes
+    sees every change made by the app, CLIs or other processes.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._snapshot: Optional[CatalogStatsSnapshot] = None
+        self.refresh_count = 0
+
+    def _get_connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(
+                f"file:{self.db_path}?mode=ro", uri=True,
+                timeout=30.0, check_same_thread=False, isolation_level=None
+            )
+            self._conn.row_factory = sqlite3.Row
+        return self._conn
+
+    def data_version(self) -> int:
+        """The database's current data_version, without recomputing anything"""
+        with self._lock:
+            return self._get_connection().execute("PRAGMA data_version").fetchone()[0]
+
+    def get_snapshot(self) -> CatalogStatsSnapshot:
+        """Current stats, recomputed only if the catalog changed since the last call"""
+        with self._lock:
+            conn = self._get_connection()
+            version = conn.execute("PRAGMA data_version").fetchone()[0]
+            if self._snapshot is None or self._snapshot.data_version != version:
+                self._snapshot = self._compute(conn, version)
+            return self._snapshot
+
+    def invalidate(self):
+        """Force the next call to recompute (e.g. after writes on the same connection)"""
+        with self._lock:
+            self._snapshot = None
+
+    def _compute(self, conn: sqlite3.Connection, version: int) -> CatalogStatsSnapshot:
+        start_time = time.time()
+
+        # One read transaction so every aggregate sees the same catalog state
+        conn.execute("BEGIN")
+        try:
+            total = conn.execute(
+                "SELECT COUNT(*) as total FROM parts_catalog WHERE active = 1"
+            ).fetchone()['total']
+
+            categories = conn.execute("""
+                SELECT category, COUNT(*) as part_count
+                FROM parts_catalog
+                WHERE active = 1
+                GROUP BY category
+                ORDER BY category
+            """).fetchall()
+
+            availability = conn.execute("""
+                SELECT availability_status, COUNT(*) as count
+                FROM parts_catalog
+                WHERE active = 1
+                GROUP BY availability_status
+                ORDER BY count DESC
+            """).fetchall()
+
+            pricing = conn.execute("""
+                SELECT
+                    MIN(list_price) as min_price,
+                    MAX(list_price) as max_price,
+                    AVG(list_price) as avg_price,
+                    COUNT(*) as total_with_price
+                FROM parts_catalog
+                WHERE active = 1 AND list_price > 0
+            """).fetchone()
+
+            materials = conn.execute(
+                "SELECT DISTINCT material FROM parts_catalog WHERE material IS NOT NULL ORDER BY material"
+            ).fetchall()
+        finally:
+            conn.execute("COMMIT")
+
+        self.refresh_count += 1
+        refresh_time = time.time() - start_time
+        logger.info(f"Refreshed catalog stats (data_version={version}) in {refresh_time * 1000:.1f}ms")
+
+        return CatalogStatsSnapshot(
+            data_version=version,
+            total_parts=total,
+            categories=[dict(row) for row in categories],
+            availability=[dict(row) for row in availability],
+            pricing=dict(pricing),
+            materials=[row['material'] for row in materials],
+            refresh_time=refresh_time
+        )
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
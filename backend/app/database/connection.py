@@ -9,6 +9,8 @@ from typing import Dict, List, Any, Optional
 from pathlib import Path
 import logging
 
+from .catalog_stats import CatalogStatsCache
+
 logger = logging.getLogger(__name__)
 
 # Database path relative to backend directory
@@ -23,6 +25,8 @@ class DatabaseManager:
         if not os.path.exists(self.db_path):
             logger.warning(f"Database not found at {self.db_path}")
             raise FileNotFoundError(f"Parts catalog database not found. Please run generate_parts_database.py first.")
+        
+        self._stats_cache = CatalogStatsCache(self.db_path)
     
     @contextmanager
     def get_connection(self):
@@ -138,55 +142,15 @@ class DatabaseManager:
     
     def get_materials(self) -> List[str]:
         """Get all unique materials"""
-        query = "SELECT DISTINCT material FROM parts_catalog WHERE material IS NOT NULL ORDER BY material"
-        results = self.execute_query(query)
-        return [row['material'] for row in results]
+        return list(self._stats_cache.get_snapshot().materials)
     
     def get_categories(self) -> List[Dict[str, Any]]:
         """Get all categories with part counts"""
-        query = """
-        SELECT category, COUNT(*) as part_count
-        FROM parts_catalog 
-        WHERE active = 1
-        GROUP BY category
-        ORDER BY category
-        """
-        return self.execute_query(query)
+        return [dict(row) for row in self._stats_cache.get_snapshot().categories]
     
     def get_database_stats(self) -> Dict[str, Any]:
-        """Get database statistics"""
-        stats = {}
-        
-        # Total parts
-        total_query = "SELECT COUNT(*) as total FROM parts_catalog WHERE active = 1"
-        stats['total_parts'] = self.execute_query(total_query)[0]['total']
-        
-        # Parts by availability
-        availability_query = """
-        SELECT availability_status, COUNT(*) as count
-        FROM parts_catalog 
-        WHERE active = 1
-        GROUP BY availability_status
-        ORDER BY count DESC
-        """
-        stats['availability'] = self.execute_query(availability_query)
-        
-        # Average price ranges
-        price_query = """
-        SELECT 
-            MIN(list_price) as min_price,
-            MAX(list_price) as max_price,
-            AVG(list_price) as avg_price,
-            COUNT(*) as total_with_price
-        FROM parts_catalog 
-        WHERE active = 1 AND list_price > 0
-        """
-        stats['pricing'] = self.execute_query(price_query)[0]
-        
-        # Category breakdown
-        stats['categories'] = self.get_categories()
-        
-        return stats
+        """Get database statistics (recomputed only when the catalog changes)"""
+        return self._stats_cache.get_snapshot().to_stats()
 
 # Global database manager instance
 db_manager = DatabaseManager()
@@ -2,32 +2,314 @@
 Enhanced database connection manager with better security and connection management
 """
 
+import asyncio
+import itertools
 import sqlite3
 import os
 import threading
+from collections import OrderedDict
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
-from typing import Dict, List, Any, Optional, Union
+from typing import Callable, Dict, Iterator, List, Any, Optional, Sequence, Tuple, Type, TypeVar, Union
 from pathlib import Path
 import logging
+import re
 from dataclasses import dataclass
 import time
 
+from .catalog_stats import CatalogStatsCache, CatalogStatsSnapshot, DataVersionWatcher
+from .sharding import SHARD_KEYS, merge_sorted_rows, paths_from_env, shard_index
+
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+
+class CatalogRow(Mapping):
+    """Read-only, tuple-backed result row
+    
+    Rows of one statement share a single column-name index, so building a row
+    costs one small object instead of a dict per row. Supports ``row["col"]``,
+    ``row[0]``, ``row.get()``, ``keys()``/``items()`` and ``dict(row)``.
+    """
+    
+    __slots__ = ('_values', '_index')
+    
+    def __init__(self, values: tuple, index: Dict[str, int]):
+        self._values = values
+        self._index = index
+    
+    def __getitem__(self, key: Union[str, int]) -> Any:
+        if isinstance(key, int):
+            return self._values[key]
+        return self._values[self._index[key]]
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._index)
+    
+    def __len__(self) -> int:
+        return len(self._values)
+    
+    def __repr__(self) -> str:
+        return f"CatalogRow({dict(self)!r})"
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Mutable copy, for callers that annotate rows"""
+        return dict(zip(self._index, self._values))
+
 
 @dataclass
 class QueryResult:
     """Type-safe query result wrapper"""
-    rows: List[Dict[str, Any]]
+    rows: List[Union[Dict[str, Any], CatalogRow]]
     row_count: int
     execution_time: float
 
 
+@dataclass
+class _StatementInfo:
+    """Per-SQL-text facts that do not change between executions"""
+    error: Optional[str] = None  # validation failure, re-raised on every use
+    # Result column names and the name -> position index shared by its rows
+    layout: Optional[Tuple[Tuple[str, ...], Dict[str, int]]] = None
+
+
+class _QueryHandle:
+    """Tracks the connections an off-loop query is using so a timeout can interrupt them
+    
+    A sharded query holds one connection per shard at the same time.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._conns: List[sqlite3.Connection] = []
+        self._cancelled = False
+    
+    def attach(self, conn: sqlite3.Connection):
+        with self._lock:
+            if self._cancelled:
+                raise TimeoutError("Query was cancelled before it started")
+            self._conns.append(conn)
+    
+    def detach(self, conn: sqlite3.Connection):
+        # Cleared before the connection returns to the pool, so cancel() can
+        # never interrupt another caller's query
+        with self._lock:
+            if conn in self._conns:
+                self._conns.remove(conn)
+    
+    def cancel(self):
+        with self._lock:
+            self._cancelled = True
+            for conn in self._conns:
+                conn.interrupt()
+
+
+# Catalog version: data_version per shard, then the file identity of each replica
+CatalogVersion = Tuple[int, ...]
+
+
+class _ReplicaConnection(sqlite3.Connection):
+    """Connection to an immutable replica, remembering which file it opened"""
+    file_identity: Optional[Tuple[int, ...]] = None
+
+
+class ConnectionPool:
+    """Bounded pool of SQLite connections to one database file
+    
+    ``read_only`` pools open the file as an immutable replica
+    (``mode=ro&immutable=1``): SQLite skips locking and change detection, so the
+    file must not be modified while it is being served. To update a replica,
+    replace the file (e.g. rename a new copy over it); connections still on the
+    old file are discarded at their next checkout.
+    """
+    
+    def __init__(self, db_path: str, max_connections: int = 10,
+                 acquire_timeout: float = 30.0, idle_timeout: float = 300.0,
+                 health_check_interval: float = 30.0, statement_cache_size: int = 512,
+                 read_only: bool = False):
+        self.db_path = db_path
+        self.max_connections = max_connections
+        self.acquire_timeout = acquire_timeout
+        self.idle_timeout = idle_timeout
+        self.health_check_interval = health_check_interval
+        self.statement_cache_size = statement_cache_size
+        self.read_only = read_only
+        
+        # Idle connections as (connection, last_used) pairs, most recently used last
+        self._connection_pool: List[Tuple[sqlite3.Connection, float]] = []
+        self._pool_lock = threading.Lock()
+        self._pool_available = threading.Condition(self._pool_lock)
+        self._open_connections = 0
+        self._pool_stats = {'created': 0, 'reused': 0, 'evicted': 0, 'discarded': 0, 'waits': 0}
+    
+    def _create_connection(self) -> sqlite3.Connection:
+        """Open a raw SQLite connection with security settings applied once"""
+        if self.read_only:
+            # Taken before opening: a file replaced in between is caught at checkout
+            identity = self.file_identity()
+            conn = sqlite3.connect(
+                f"file:{self.db_path}?mode=ro&immutable=1",
+                uri=True,
+                check_same_thread=False,
+                cached_statements=self.statement_cache_size,
+                factory=_ReplicaConnection
+            )
+            conn.file_identity = identity
+        else:
+            conn = sqlite3.connect(
+                self.db_path,
+                timeout=30.0,  # 30 second timeout
+                check_same_thread=False,
+                isolation_level='DEFERRED',  # Better concurrency
+                cached_statements=self.statement_cache_size
+            )
+        try:
+            conn.row_factory = sqlite3.Row
+            
+            # Security settings
+            conn.execute("PRAGMA foreign_keys = ON")
+            if not self.read_only:
+                conn.execute("PRAGMA journal_mode = WAL")  # Better concurrency
+                conn.execute("PRAGMA synchronous = NORMAL")  # Good balance of safety/performance
+            conn.execute("PRAGMA temp_store = MEMORY")  # Faster temporary operations
+            conn.execute("PRAGMA cache_size = -64000")  # 64MB cache
+        except Exception:
+            conn.close()
+            raise
+        return conn
+    
+    def file_identity(self) -> Tuple[int, ...]:
+        """Identity of the file currently at db_path; changes when it is replaced"""
+        stat = os.stat(self.db_path)
+        return (stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns)
+    
+    def _is_healthy(self, conn: sqlite3.Connection) -> bool:
+        """Cheap liveness probe for a connection that has been sitting idle"""
+        try:
+            conn.execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+    
+    def _evict_idle(self, now: float) -> List[sqlite3.Connection]:
+        """Remove connections idle longer than idle_timeout (caller holds the lock)"""
+        expired = [conn for conn, last_used in self._connection_pool if now - last_used > self.idle_timeout]
+        if expired:
+            self._connection_pool = [
+                (conn, last_used) for conn, last_used in self._connection_pool
+                if now - last_used <= self.idle_timeout
+            ]
+            self._open_connections -= len(expired)
+            self._pool_stats['evicted'] += len(expired)
+        return expired
+    
+    def checkout(self) -> sqlite3.Connection:
+        """Take an idle connection or open a new one, waiting while the pool is exhausted"""
+        deadline = time.monotonic() + self.acquire_timeout
+        
+        while True:
+            with self._pool_lock:
+                now = time.monotonic()
+                expired = self._evict_idle(now)
+                
+                candidate = None
+                if self._connection_pool:
+                    candidate = self._connection_pool.pop()
+                elif self._open_connections < self.max_connections:
+                    # Reserve the slot before connecting outside the lock
+                    self._open_connections += 1
+                else:
+                    self._pool_stats['waits'] += 1
+                    remaining = deadline - now
+                    if remaining <= 0 or not self._pool_available.wait(remaining):
+                        raise TimeoutError(
+                            f"No database connection available within {self.acquire_timeout}s "
+                            f"(max_connections={self.max_connections})"
+                        )
+                    continue
+            
+            for conn in expired:
+                conn.close()
+            
+            if candidate is None:
+                try:
+                    conn = self._create_connection()
+                except Exception:
+                    self._release_slot()
+                    raise
+                with self._pool_lock:
+                    self._pool_stats['created'] += 1
+                return conn
+            
+            conn, last_used = candidate
+            if self.read_only and conn.file_identity != self.file_identity():
+                # The replica was replaced; the old file must not serve reads
+                self.discard(conn)
+                continue
+            if now - last_used < self.health_check_interval or self._is_healthy(conn):
+                with self._pool_lock:
+                    self._pool_stats['reused'] += 1
+                return conn
+            
+            logger.warning("Discarding unhealthy pooled database connection")
+            self.discard(conn)
+    
+    def checkin(self, conn: sqlite3.Connection):
+        """Return a connection to the idle pool"""
+        with self._pool_available:
+            self._connection_pool.append((conn, time.monotonic()))
+            self._pool_available.notify()
+    
+    def _release_slot(self):
+        with self._pool_available:
+            self._open_connections -= 1
+            self._pool_available.notify()
+    
+    def discard(self, conn: sqlite3.Connection):
+        """Close a connection that must not go back into the pool"""
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+        with self._pool_lock:
+            self._pool_stats['discarded'] += 1
+        self._release_slot()
+    
+    def get_stats(self) -> Dict[str, int]:
+        with self._pool_lock:
+            stats = dict(self._pool_stats)
+            stats['open_connections'] = self._open_connections
+            stats['idle_connections'] = len(self._connection_pool)
+            stats['max_connections'] = self.max_connections
+        return stats
+    
+    def close_idle(self):
+        """Close every idle connection; checked-out connections are unaffected"""
+        with self._pool_lock:
+            idle = [conn for conn, _ in self._connection_pool]
+            self._connection_pool = []
+            self._open_connections -= len(idle)
+        for conn in idle:
+            conn.close()
+
+
 class SecureDatabaseManager:
-    """Enhanced database manager with security features and connection management"""
+    """Enhanced database manager with security features and connection management
+    
+    The catalog can be one file or several shards (``shard_paths``), each
+    holding the parts whose ``shard_key`` hashes to it (see sharding.py).
+    Sharded queries run on every shard in parallel and the results are merged.
+    Unsharded catalogs can add read-only replicas (``replica_paths``) that
+    serve execute_query traffic round-robin.
+    """
     
     # SQL injection protection: whitelist allowed table/column names
-    ALLOWED_TABLES = {'parts_catalog', 'parts_search'}
+    ALLOWED_TABLES = {'parts_catalog', 'parts_search', 'parts_search_trigram'}
+    
+    # The trigram tokenizer can only use its index for patterns of 3+ characters
+    MIN_TRIGRAM_LENGTH = 3
     ALLOWED_COLUMNS = {
         'parts_catalog': {
             'id', 'part_number', 'description', 'category', 'subcategory', 
@@ -37,68 +319,255 @@ class SecureDatabaseManager:
         }
     }
     
-    def __init__(self, db_path: Optional[str] = None, max_connections: int = 10):
-        self.db_path = db_path or str(Path(__file__).parent.parent.parent / "parts_catalog.db")
+    def __init__(self, db_path: Optional[str] = None, max_connections: int = 10,
+                 acquire_timeout: float = 30.0, idle_timeout: float = 300.0,
+                 health_check_interval: float = 30.0, query_timeout: float = 30.0,
+                 max_pending_queries: Optional[int] = None, statement_cache_size: int = 512,
+                 shard_paths: Optional[List[str]] = None, shard_key: str = 'part_number',
+                 replica_paths: Optional[List[str]] = None, version_check_interval: float = 0.5):
+        if shard_key not in SHARD_KEYS:
+            raise ValueError(f"shard_key must be one of {SHARD_KEYS}")
+        if shard_paths and len(shard_paths) > 1 and replica_paths:
+            raise ValueError("Read replicas are only supported for an unsharded catalog")
+        
+        self.shard_paths = list(shard_paths) if shard_paths else [
+            db_path or str(Path(__file__).parent.parent.parent / "parts_catalog.db")
+        ]
+        self.db_path = self.shard_paths[0]
+        self.shard_key = shard_key
+        self.replica_paths = list(replica_paths or [])
         self.max_connections = max_connections
-        self._connection_pool = []
-        self._pool_lock = threading.Lock()
+        self.acquire_timeout = acquire_timeout
+        self.idle_timeout = idle_timeout
+        self.health_check_interval = health_check_interval
+        
+        # One pool per shard (max_connections each), plus one per replica
+        pool_options = dict(
+            max_connections=max_connections, acquire_timeout=acquire_timeout,
+            idle_timeout=idle_timeout, health_check_interval=health_check_interval,
+            statement_cache_size=statement_cache_size
+        )
+        self._shard_pools = [ConnectionPool(path, **pool_options) for path in self.shard_paths]
+        self._replica_pools = [
+            ConnectionPool(path, read_only=True, **pool_options) for path in self.replica_paths
+        ]
+        self._next_replica = itertools.count()
+        
+        # Async execution: a dedicated thread pool sized to the connection pool,
+        # with a bound on queries queued or running per event loop
+        self.query_timeout = query_timeout
+        self.max_pending_queries = max_pending_queries or 4 * max_connections
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._scatter_executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        self._query_slots: Optional[asyncio.Semaphore] = None
+        self._query_slots_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._local = threading.local()
+        
+        # Validation results and result columns keyed by SQL text; each
+        # connection also keeps this many compiled statements
+        self.statement_cache_size = statement_cache_size
+        self._statement_cache: "OrderedDict[str, _StatementInfo]" = OrderedDict()
+        self._statement_lock = threading.Lock()
+        
+        # Optional schema features, detected lazily (see app/database/migrations.py)
+        self._has_trigram_index: Optional[bool] = None
+        
+        # Aggregates reused until a shard's data_version changes
+        self._stats_caches = [CatalogStatsCache(path) for path in self.shard_paths]
+        
+        # Catalog version, reused for version_check_interval seconds: (version, expires at)
+        self.version_check_interval = version_check_interval
+        self._version_watchers = [DataVersionWatcher(path) for path in self.shard_paths]
+        self._catalog_version: Optional[Tuple[CatalogVersion, float]] = None
+        
         self._validate_database()
     
+    @property
+    def is_sharded(self) -> bool:
+        return len(self._shard_pools) > 1
+    
     def _validate_database(self):
-        """Validate database exists and is accessible"""
-        if not os.path.exists(self.db_path):
-            logger.warning(f"Database not found at {self.db_path}")
-            raise FileNotFoundError(
-                f"Parts catalog database not found at {self.db_path}. "
-                "Please run generate_parts_database.py first."
-            )
+        """Validate every shard and replica exists and is accessible"""
+        for path in self.shard_paths + self.replica_paths:
+            if not os.path.exists(path):
+                logger.warning(f"Database not found at {path}")
+                raise FileNotFoundError(
+                    f"Parts catalog database not found at {path}. "
+                    "Please load it with ingest_parts_catalog.py first."
+                )
         
         # Test connection
-        try:
-            with self._get_raw_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute("SELECT COUNT(*) FROM sqlite_master WHERE type='table'")
-                table_count = cursor.fetchone()[0]
-                logger.info(f"Database validated: {table_count} tables found")
-        except Exception as e:
-            raise ConnectionError(f"Failed to connect to database: {e}")
+        for pool in self._shard_pools + self._replica_pools:
+            try:
+                with self._pooled_connection(pool) as conn:
+                    cursor = conn.cursor()
+                    cursor.execute("SELECT COUNT(*) FROM sqlite_master WHERE type='table'")
+                    table_count = cursor.fetchone()[0]
+                    logger.info(f"Database validated: {table_count} tables found in {pool.db_path}")
+            except Exception as e:
+                raise ConnectionError(f"Failed to connect to database: {e}")
     
     @contextmanager
-    def _get_raw_connection(self):
-        """Get a raw SQLite connection with security settings"""
-        conn = None
+    def _pooled_connection(self, pool: ConnectionPool):
+        conn = pool.checkout()
+        handle: Optional[_QueryHandle] = getattr(self._local, 'query_handle', None)
         try:
-            conn = sqlite3.connect(
-                self.db_path,
-                timeout=30.0,  # 30 second timeout
-                check_same_thread=False,
-                isolation_level='DEFERRED'  # Better concurrency
-            )
-            conn.row_factory = sqlite3.Row
-            
-            # Security settings
-            conn.execute("PRAGMA foreign_keys = ON")
-            conn.execute("PRAGMA journal_mode = WAL")  # Better concurrency
-            conn.execute("PRAGMA synchronous = NORMAL")  # Good balance of safety/performance
-            conn.execute("PRAGMA temp_store = MEMORY")  # Faster temporary operations
-            conn.execute("PRAGMA cache_size = -64000")  # 64MB cache
-            
+            if handle is not None:
+                handle.attach(conn)
             yield conn
-            
         except Exception as e:
-            if conn:
-                conn.rollback()
             logger.error(f"Database error: {e}")
             raise
         finally:
-            if conn:
-                conn.close()
+            if handle is not None:
+                handle.detach(conn)
+            
+            # Never hand the next caller a connection with an open transaction
+            try:
+                if conn.in_transaction:
+                    conn.rollback()
+                reusable = True
+            except sqlite3.Error:
+                reusable = False
+            
+            if reusable:
+                pool.checkin(conn)
+            else:
+                pool.discard(conn)
     
-    @contextmanager
-    def get_connection(self):
-        """Get a database connection from the pool"""
-        with self._get_raw_connection() as conn:
-            yield conn
+    def get_connection(self, shard: int = 0):
+        """Get a database connection from the pool (of one shard, when sharded)"""
+        return self._pooled_connection(self._shard_pools[shard])
+    
+    def _read_pool(self, shard: int) -> ConnectionPool:
+        """Pool serving reads for a shard: a replica in turn if any are configured"""
+        if self._replica_pools:
+            return self._replica_pools[next(self._next_replica) % len(self._replica_pools)]
+        return self._shard_pools[shard]
+    
+    def shard_for(self, key_value: Any) -> int:
+        """Shard holding the parts whose shard_key column equals ``key_value``"""
+        return shard_index(key_value, len(self._shard_pools))
+    
+    def get_pool_stats(self) -> Dict[str, int]:
+        """Connection pool counters, summed over shards and replicas"""
+        stats: Dict[str, int] = {}
+        for pool in self._shard_pools + self._replica_pools:
+            for name, value in pool.get_stats().items():
+                stats[name] = stats.get(name, 0) + value
+        stats['shards'] = len(self._shard_pools)
+        stats['replicas'] = len(self._replica_pools)
+        with self._statement_lock:
+            stats['cached_statements'] = len(self._statement_cache)
+        return stats
+    
+    def close_all(self):
+        """Stop the async query threads and close every idle connection
+        
+        Checked-out connections are unaffected.
+        """
+        with self._executor_lock:
+            for executor in (self._executor, self._scatter_executor):
+                if executor is not None:
+                    executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+            self._scatter_executor = None
+        
+        for pool in self._shard_pools + self._replica_pools:
+            pool.close_idle()
+        
+        for stats_cache in self._stats_caches:
+            stats_cache.close()
+        for watcher in self._version_watchers:
+            watcher.close()
+    
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_connections,
+                    thread_name_prefix="catalog-db"
+                )
+            return self._executor
+    
+    def _get_scatter_executor(self) -> ThreadPoolExecutor:
+        # Separate from _executor: a query running there waits on its shard
+        # queries, which must never queue behind it
+        with self._executor_lock:
+            if self._scatter_executor is None:
+                self._scatter_executor = ThreadPoolExecutor(
+                    max_workers=self.max_connections * len(self._shard_pools),
+                    thread_name_prefix="catalog-shard"
+                )
+            return self._scatter_executor
+    
+    def _get_query_slots(self) -> asyncio.Semaphore:
+        # Semaphores bind to an event loop; rebuild if a new loop is running (CLI, tests)
+        loop = asyncio.get_running_loop()
+        if self._query_slots is None or self._query_slots_loop is not loop:
+            self._query_slots = asyncio.Semaphore(self.max_pending_queries)
+            self._query_slots_loop = loop
+        return self._query_slots
+    
+    def _call_with_handle(self, handle: _QueryHandle, func: Callable[..., T],
+                          args: tuple, kwargs: dict) -> T:
+        """Worker-thread entry point: connections checked out by ``func`` register with ``handle``"""
+        self._local.query_handle = handle
+        try:
+            return func(*args, **kwargs)
+        finally:
+            self._local.query_handle = None
+    
+    async def run_async(self, func: Callable[..., T], *args,
+                        timeout: Optional[float] = None, **kwargs) -> T:
+        """Run a synchronous database call on the query thread pool without blocking the event loop
+        
+        Waits for a slot when ``max_pending_queries`` calls are already queued or
+        running. If the call (including that wait) exceeds ``timeout`` seconds
+        (default ``query_timeout``), the running SQLite statement is interrupted
+        and TimeoutError is raised.
+        """
+        timeout = self.query_timeout if timeout is None else timeout
+        handle = _QueryHandle()
+        loop = asyncio.get_running_loop()
+        
+        async def dispatch():
+            async with self._get_query_slots():
+                return await loop.run_in_executor(
+                    self._get_executor(), self._call_with_handle, handle, func, args, kwargs
+                )
+        
+        try:
+            return await asyncio.wait_for(dispatch(), timeout)
+        except asyncio.TimeoutError:
+            handle.cancel()
+            logger.warning(f"Database call {getattr(func, '__name__', func)} timed out after {timeout}s")
+            raise TimeoutError(f"Database query exceeded {timeout}s timeout")
+        except asyncio.CancelledError:
+            handle.cancel()
+            raise
+    
+    async def fetch_all(self, query: str, params: Union[tuple, dict] = None,
+                        validate_table: str = None,
+                        timeout: Optional[float] = None,
+                        row_type: Type[Union[dict, CatalogRow]] = dict,
+                        order_by: Optional[Sequence[str]] = None,
+                        limit: Optional[int] = None) -> List[Union[Dict[str, Any], CatalogRow]]:
+        """Async counterpart of execute_query returning just the rows"""
+        result = await self.run_async(
+            self.execute_query, query, params, validate_table, row_type,
+            order_by=order_by, limit=limit, timeout=timeout
+        )
+        return result.rows
+    
+    async def fetch_one(self, query: str, params: Union[tuple, dict] = None,
+                        validate_table: str = None,
+                        timeout: Optional[float] = None,
+                        row_type: Type[Union[dict, CatalogRow]] = dict) -> Optional[Union[Dict[str, Any], CatalogRow]]:
+        """Async query returning the first row, or None"""
+        rows = await self.fetch_all(query, params, validate_table, timeout, row_type)
+        return rows[0] if rows else None
     
     def _validate_query_params(self, table_name: str, columns: List[str] = None) -> None:
         """Validate table and column names to prevent SQL injection"""
@@ -111,48 +580,173 @@ class SecureDatabaseManager:
                 if col not in allowed_cols:
                     raise ValueError(f"Column '{col}' not allowed for table '{table_name}'")
     
+    # Statements containing these are only allowed if they are SELECTs
+    DANGEROUS_KEYWORDS = ('DROP', 'DELETE', 'TRUNCATE', 'ALTER', 'CREATE', 'INSERT', 'UPDATE')
+    
+    def _get_statement(self, query: str) -> _StatementInfo:
+        """Look up (or validate and remember) a statement by its SQL text"""
+        with self._statement_lock:
+            info = self._statement_cache.get(query)
+            if info is not None:
+                self._statement_cache.move_to_end(query)
+                return info
+        
+        # Check for dangerous SQL keywords
+        info = _StatementInfo()
+        query_upper = query.upper()
+        for keyword in self.DANGEROUS_KEYWORDS:
+            if keyword in query_upper and not query_upper.strip().startswith('SELECT'):
+                info.error = f"Query contains dangerous keyword: {keyword}"
+                break
+        
+        with self._statement_lock:
+            self._statement_cache[query] = info
+            while len(self._statement_cache) > self.statement_cache_size:
+                self._statement_cache.popitem(last=False)
+        return info
+    
+    def clear_statement_cache(self):
+        """Forget cached statement shapes, e.g. after a schema migration"""
+        with self._statement_lock:
+            self._statement_cache.clear()
+    
     def execute_query(self, query: str, params: Union[tuple, dict] = None, 
-                     validate_table: str = None) -> QueryResult:
-        """Execute a SELECT query with security validation"""
+                     validate_table: str = None,
+                     row_type: Type[Union[dict, CatalogRow]] = dict,
+                     order_by: Optional[Sequence[str]] = None, limit: Optional[int] = None,
+                     descending: bool = False, shard_key_value: Any = None) -> QueryResult:
+        """Execute a SELECT query with security validation
+        
+        ``row_type=CatalogRow`` returns read-only tuple-backed rows instead of
+        dicts, for hot callers that do not modify the results.
+        
+        On a sharded catalog the query runs on every shard in parallel, or only
+        on the shard owning ``shard_key_value`` when given. Pass the query's
+        ORDER BY columns as ``order_by`` (all ascending, or all ``descending``)
+        and its LIMIT as ``limit`` to have the shard results merge-sorted and
+        cut to the same rows one database would return; otherwise shard results
+        are concatenated.
+        """
         start_time = time.time()
         
         # Basic SQL injection protection
         if validate_table:
             self._validate_query_params(validate_table)
         
-        # Check for dangerous SQL keywords
-        dangerous_keywords = ['DROP', 'DELETE', 'TRUNCATE', 'ALTER', 'CREATE', 'INSERT', 'UPDATE']
-        query_upper = query.upper()
-        for keyword in dangerous_keywords:
-            if keyword in query_upper and not query_upper.strip().startswith('SELECT'):
-                raise ValueError(f"Query contains dangerous keyword: {keyword}")
+        statement = self._get_statement(query)
+        if statement.error:
+            raise ValueError(statement.error)
+        
+        if not self.is_sharded or shard_key_value is not None:
+            shard = self.shard_for(shard_key_value)
+            with self._pooled_connection(self._read_pool(shard)) as conn:
+                rows = self._fetch_rows(conn, query, params, statement, row_type)
+        else:
+            rows = self._scatter(query, params, statement, row_type, order_by, limit, descending)
+        
+        execution_time = time.time() - start_time
         
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
+        return QueryResult(
+            rows=rows,
+            row_count=len(rows),
+            execution_time=execution_time
+        )
+    
+    def _fetch_rows(self, conn: sqlite3.Connection, query: str, params: Union[tuple, dict],
+                    statement: _StatementInfo,
+                    row_type: Type[Union[dict, CatalogRow]]) -> List[Union[Dict[str, Any], CatalogRow]]:
+        cursor = conn.cursor()
+        # Plain tuples, labelled with a column index shared by every row
+        cursor.row_factory = None
+        
+        try:
+            if params:
+                cursor.execute(query, params)
+            else:
+                cursor.execute(query)
             
-            try:
-                if params:
-                    cursor.execute(query, params)
-                else:
-                    cursor.execute(query)
-                
-                # Convert rows to dictionaries
-                columns = [description[0] for description in cursor.description] if cursor.description else []
-                rows = []
-                for row in cursor.fetchall():
-                    rows.append(dict(zip(columns, row)))
-                
-                execution_time = time.time() - start_time
-                
-                return QueryResult(
-                    rows=rows,
-                    row_count=len(rows),
-                    execution_time=execution_time
-                )
-                
-            except sqlite3.Error as e:
-                logger.error(f"SQL error: {e}, Query: {query[:100]}...")
-                raise
+            description = cursor.description
+            columns = tuple(d[0] for d in description) if description else ()
+            layout = statement.layout
+            if layout is None or layout[0] != columns:
+                # First execution, or another column order: a table rebuilt under
+                # SELECT *, or a shard/replica whose columns are laid out differently
+                layout = (columns, {name: i for i, name in enumerate(columns)})
+                statement.layout = layout
+            
+            if row_type is CatalogRow:
+                column_index = layout[1]
+                return [CatalogRow(row, column_index) for row in cursor.fetchall()]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+            
+        except sqlite3.Error as e:
+            logger.error(f"SQL error: {e}, Query: {query[:100]}...")
+            raise
+    
+    def _fetch_from_shard(self, shard: int, handle: Optional[_QueryHandle], query: str,
+                          params: Union[tuple, dict], statement: _StatementInfo,
+                          row_type: Type[Union[dict, CatalogRow]]) -> List[Union[Dict[str, Any], CatalogRow]]:
+        """Scatter worker entry point; registers its connection with the caller's handle"""
+        self._local.query_handle = handle
+        try:
+            with self._pooled_connection(self._read_pool(shard)) as conn:
+                return self._fetch_rows(conn, query, params, statement, row_type)
+        finally:
+            self._local.query_handle = None
+    
+    def _scatter(self, query: str, params: Union[tuple, dict], statement: _StatementInfo,
+                 row_type: Type[Union[dict, CatalogRow]], order_by: Optional[Sequence[str]],
+                 limit: Optional[int], descending: bool) -> List[Union[Dict[str, Any], CatalogRow]]:
+        """Run a query on every shard in parallel and merge the results"""
+        handle: Optional[_QueryHandle] = getattr(self._local, 'query_handle', None)
+        executor = self._get_scatter_executor()
+        futures = [
+            executor.submit(self._fetch_from_shard, shard, handle, query, params, statement, row_type)
+            for shard in range(len(self._shard_pools))
+        ]
+        shard_rows = [future.result() for future in futures]
+        return merge_sorted_rows(shard_rows, order_by, limit, descending)
+    
+    @property
+    def has_trigram_index(self) -> bool:
+        """Whether the 001_fts5_search_index migration (parts_search_trigram) is applied
+        
+        On a sharded catalog every shard must have it, since queries using it
+        run on all of them.
+        """
+        if self._has_trigram_index is None:
+            applied = True
+            for shard in range(len(self._shard_pools)):
+                with self.get_connection(shard) as conn:
+                    row = conn.execute(
+                        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'parts_search_trigram'"
+                    ).fetchone()
+                applied = applied and row is not None
+            self._has_trigram_index = applied
+        return self._has_trigram_index
+    
+    def use_trigram_index(self, search_term: str) -> bool:
+        """Whether a substring search for ``search_term`` can use the trigram index"""
+        return len(search_term) >= self.MIN_TRIGRAM_LENGTH and self.has_trigram_index
+    
+    def refresh_schema_info(self):
+        """Re-detect optional schema features, e.g. after running migrations"""
+        self._has_trigram_index = None
+        self.clear_statement_cache()
+    
+    @staticmethod
+    def fts_match_expression(search_term: str, prefix: bool = True) -> Optional[str]:
+        """Build an FTS5 MATCH expression that can never be parsed as query syntax
+        
+        Every word becomes a quoted term (optionally a prefix query, served by the
+        parts_search prefix indexes); all terms must match. Returns None when the
+        input has no searchable words.
+        """
+        terms = re.findall(r'\w+', search_term)
+        if not terms:
+            return None
+        suffix = '*' if prefix else ''
+        return ' '.join(f'"{term}"{suffix}' for term in terms)
     
     def execute_safe_search(self, search_term: str, table: str = 'parts_catalog', 
                            columns: List[str] = None, limit: int = 50) -> QueryResult:
@@ -167,6 +761,23 @@ class SecureDatabaseManager:
         if len(search_term) > 200:
             raise ValueError("Search term too long")
         
+        search_param = f"%{search_term}%"
+        
+        if table == 'parts_catalog' and self.use_trigram_index(search_term):
+            # Substring match served by the trigram index instead of a full scan;
+            # CROSS JOIN keeps the FTS table as the outer loop
+            select_cols = ', '.join(f'p.{col}' for col in columns) if columns else 'p.*'
+            query = f"""
+            SELECT {select_cols}
+            FROM parts_search_trigram t
+            CROSS JOIN parts_catalog p ON p.id = t.rowid
+            WHERE t.description LIKE ? AND p.active = 1
+            ORDER BY p.list_price ASC
+            LIMIT ?
+            """
+            return self.execute_query(query, (search_param, limit), validate_table=table,
+                                      **self._price_order(columns, limit))
+        
         # Build safe query
         select_cols = ', '.join(columns) if columns else '*'
         query = f"""
@@ -177,8 +788,15 @@ class SecureDatabaseManager:
         LIMIT ?
         """
         
-        search_param = f"%{search_term}%"
-        return self.execute_query(query, (search_param, limit), validate_table=table)
+        return self.execute_query(query, (search_param, limit), validate_table=table,
+                                  **self._price_order(columns, limit))
+    
+    @staticmethod
+    def _price_order(columns: Optional[List[str]], limit: int) -> Dict[str, Any]:
+        """Shard merge options for ``ORDER BY list_price LIMIT n`` (if list_price is selected)"""
+        if columns and 'list_price' not in columns:
+            return {}
+        return {'order_by': ('list_price',), 'limit': limit}
     
     def get_part_by_number_safe(self, part_number: str) -> Optional[Dict[str, Any]]:
         """Safely get a part by part number"""
@@ -189,7 +807,10 @@ class SecureDatabaseManager:
         safe_part_number = ''.join(c for c in part_number if c.isalnum() or c in '-_.')
         
         query = "SELECT * FROM parts_catalog WHERE part_number = ? AND active = 1"
-        result = self.execute_query(query, (safe_part_number,), validate_table='parts_catalog')
+        # Hash-partitioned by part number: only one shard can hold it
+        shard_key_value = safe_part_number if self.shard_key == 'part_number' else None
+        result = self.execute_query(query, (safe_part_number,), validate_table='parts_catalog',
+                                    shard_key_value=shard_key_value)
         
         return result.rows[0] if result.rows else None
     
@@ -198,18 +819,81 @@ class SecureDatabaseManager:
         if not isinstance(search_term, str) or len(search_term) > 200:
             raise ValueError("Invalid search term")
         
-        # Escape FTS special characters
-        safe_term = search_term.replace('"', '""').replace("'", "''")
+        match_expression = self.fts_match_expression(search_term)
+        if match_expression is None:
+            return QueryResult(rows=[], row_count=0, execution_time=0.0)
         
-        query = """
-        SELECT p.* FROM parts_catalog p
-        JOIN parts_search s ON p.part_number = s.part_number
-        WHERE parts_search MATCH ?
-        ORDER BY rank
-        LIMIT ?
+        # parts_search rowids are parts_catalog ids; rank is bm25 with the
+        # column weights configured by the search index migration. Shards
+        # return it so their results can be merged by relevance.
+        rank_column = ', s.rank AS search_rank' if self.is_sharded else ''
+        query = f"""
+        SELECT p.*{rank_column} FROM (
+            SELECT rowid, rank FROM parts_search
+            WHERE parts_search MATCH ?
+            ORDER BY rank
+            LIMIT ?
+        ) s
+        JOIN parts_catalog p ON p.id = s.rowid
+        ORDER BY s.rank
         """
         
-        return self.execute_query(query, (safe_term, limit), validate_table='parts_catalog')
+        return self.execute_query(query, (match_expression, limit), validate_table='parts_catalog',
+                                  order_by=('search_rank',), limit=limit)
+    
+    def _get_stats_snapshot(self) -> CatalogStatsSnapshot:
+        return CatalogStatsSnapshot.merge([cache.get_snapshot() for cache in self._stats_caches])
+    
+    def _cached_catalog_version(self) -> Optional[CatalogVersion]:
+        cached = self._catalog_version
+        if cached is not None and time.monotonic() < cached[1]:
+            return cached[0]
+        return None
+    
+    def get_catalog_version(self) -> CatalogVersion:
+        """Value that changes whenever the data served to reads changes
+        
+        Each shard's SQLite data_version counter, then the file identity of
+        each read replica: replica pools only serve from the file currently at
+        their path, so replacing a replica changes the version. Costs one
+        PRAGMA per shard and one stat per replica, and a value is reused for
+        ``version_check_interval`` seconds. Callers read it before querying, so
+        a change racing the query can only make its results look older than
+        they are.
+        """
+        version = self._cached_catalog_version()
+        if version is not None:
+            return version
+        expires = time.monotonic() + self.version_check_interval
+        versions = [watcher.data_version() for watcher in self._version_watchers]
+        for pool in self._replica_pools:
+            versions.extend(pool.file_identity())
+        version = tuple(versions)
+        self._catalog_version = (version, expires)
+        return version
+    
+    async def fetch_catalog_version(self) -> CatalogVersion:
+        """get_catalog_version, reading the databases on the query thread pool"""
+        version = self._cached_catalog_version()
+        if version is not None:
+            return version
+        return await self.run_async(self.get_catalog_version)
+    
+    def get_database_stats(self) -> Dict[str, Any]:
+        """Catalog totals, availability, pricing and category counts
+        
+        Served from a snapshot that is recomputed only when the database's
+        data_version changes.
+        """
+        return self._get_stats_snapshot().to_stats()
+    
+    def get_categories(self) -> List[Dict[str, Any]]:
+        """Get all categories with part counts"""
+        return [dict(row) for row in self._get_stats_snapshot().categories]
+    
+    def get_materials(self) -> List[str]:
+        """Get all unique materials"""
+        return list(self._get_stats_snapshot().materials)
     
     def get_database_health(self) -> Dict[str, Any]:
         """Get database health and performance metrics"""
@@ -222,21 +906,22 @@ class SecureDatabaseManager:
             
             # Database size
             size_result = self.execute_query("SELECT page_count * page_size as size FROM pragma_page_count(), pragma_page_size()")
-            health['database_size_bytes'] = size_result.rows[0]['size'] if size_result.rows else 0
+            health['database_size_bytes'] = sum(row['size'] for row in size_result.rows)
             
-            # Table counts
+            # Table counts (every shard has the same tables)
             tables_result = self.execute_query("SELECT name FROM sqlite_master WHERE type='table'")
-            health['table_count'] = len(tables_result.rows)
+            health['table_count'] = len({row['name'] for row in tables_result.rows})
             
-            # Parts count
-            parts_result = self.execute_query("SELECT COUNT(*) as count FROM parts_catalog WHERE active = 1")
-            health['active_parts_count'] = parts_result.rows[0]['count'] if parts_result.rows else 0
+            # Parts count (materialized; only recounted after the catalog changes)
+            health['active_parts_count'] = self._get_stats_snapshot().total_parts
             
             # Performance check
             start_time = time.time()
             self.execute_query("SELECT * FROM parts_catalog LIMIT 1")
             health['query_response_time_ms'] = (time.time() - start_time) * 1000
             
+            health['connection_pool'] = self.get_pool_stats()
+            
             health['status'] = 'healthy'
             
         except Exception as e:
@@ -246,8 +931,13 @@ class SecureDatabaseManager:
         return health
 
 
-# Global secure database manager instance
-secure_db_manager = SecureDatabaseManager()
+# Global secure database manager instance; CATALOG_DB_SHARDS / CATALOG_DB_REPLICAS
+# take comma-separated database paths
+secure_db_manager = SecureDatabaseManager(
+    shard_paths=paths_from_env("CATALOG_DB_SHARDS"),
+    shard_key=os.getenv("CATALOG_SHARD_KEY", "part_number"),
+    replica_paths=paths_from_env("CATALOG_DB_REPLICAS")
+)
 
 def get_secure_db_manager() -> SecureDatabaseManager:
     """Get the global secure database manager instance"""
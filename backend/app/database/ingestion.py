@@ -0,0 +1,534 @@
+"""
+Streaming bulk ingestion into the parts catalog database
+Reads CSV, JSON or JSON Lines files record by record and upserts them in large
+executemany batches, optionally with secondary indexes and FTS sync deferred
+until the load is finished
+"""
+
+import csv
+import json
+import sqlite3
+import time
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from typing import AbstractSet, Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .migrations import (
+    apply_migrations,
+    create_search_triggers,
+    drop_search_triggers,
+    rebuild_search_index,
+)
+from .sharding import shard_index
+
+logger = logging.getLogger(__name__)
+
+# Table layout documented in archived/documentation/DATABASE_README.md
+CATALOG_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS parts_catalog (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    part_number VARCHAR(50) UNIQUE NOT NULL,
+    description TEXT NOT NULL,
+    category VARCHAR(100) NOT NULL,
+    subcategory VARCHAR(100),
+    material VARCHAR(100),
+    material_grade VARCHAR(50),
+    form_factor VARCHAR(50),
+    dimensions VARCHAR(200),
+    weight_lbs DECIMAL(10,4),
+    unit_of_measure VARCHAR(20) DEFAULT 'EA',
+    list_price DECIMAL(12,2),
+    cost DECIMAL(12,2),
+    availability_status VARCHAR(20) DEFAULT 'IN_STOCK',
+    quantity_on_hand INTEGER DEFAULT 0,
+    minimum_order_quantity INTEGER DEFAULT 1,
+    lead_time_days INTEGER DEFAULT 0,
+    supplier_id VARCHAR(50),
+    supplier_name VARCHAR(200),
+    manufacturer VARCHAR(200),
+    manufacturer_part_number VARCHAR(100),
+    diameter_inches DECIMAL(8,4),
+    length_inches DECIMAL(8,4),
+    width_inches DECIMAL(8,4),
+    height_inches DECIMAL(8,4),
+    thickness_inches DECIMAL(8,4),
+    thread_pitch VARCHAR(20),
+    surface_finish VARCHAR(100),
+    hardness VARCHAR(50),
+    tensile_strength_psi INTEGER,
+    keywords TEXT,
+    specifications TEXT,
+    applications TEXT,
+    notes TEXT,
+    created_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    active BOOLEAN DEFAULT 1
+)
+"""
+
+# LargePartsGenerator field names -> parts_catalog columns
+FIELD_ALIASES = {
+    'unit_price': 'list_price',
+    'price': 'list_price',
+    'availability': 'quantity_on_hand',
+    'stock_quantity': 'quantity_on_hand',
+    'supplier': 'supplier_name',
+    'weight_per_unit': 'weight_lbs',
+    'weight': 'weight_lbs',
+    'minimum_order': 'minimum_order_quantity',
+}
+
+# Specification fields also copied into their own columns
+SPEC_COLUMNS = {
+    'grade': 'material_grade',
+    'diameter': 'diameter_inches',
+    'outer_diameter': 'diameter_inches',
+    'length': 'length_inches',
+    'width': 'width_inches',
+    'height': 'height_inches',
+    'thickness': 'thickness_inches',
+}
+
+# Below this many units on hand a part is reported as LIMITED
+LIMITED_STOCK_THRESHOLD = 50
+
+JSON_READ_SIZE = 1 << 20
+
+
+@dataclass
+class IngestStats:
+    """Outcome of one ingestion run"""
+    rows_read: int = 0
+    inserted: int = 0
+    updated: int = 0
+    skipped: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows_read / self.elapsed if self.elapsed else 0.0
+
+
+def iter_csv_records(path: str) -> Iterator[Dict[str, Any]]:
+    """Rows of a CSV file with a header line; empty cells are treated as absent"""
+    with open(path, newline='', encoding='utf-8') as csvfile:
+        for row in csv.DictReader(csvfile):
+            yield {key: value for key, value in row.items() if key and value not in ('', None)}
+
+
+def iter_json_records(path: str) -> Iterator[Dict[str, Any]]:
+    """Objects of a top-level JSON array (as written by save_to_json), decoded incrementally"""
+    decoder = json.JSONDecoder()
+    separators = ' \t\r\n,'
+    with open(path, encoding='utf-8') as jsonfile:
+        buffer = jsonfile.read(JSON_READ_SIZE).lstrip()
+        if not buffer.startswith('['):
+            raise ValueError(f"{path}: expected a JSON array of parts")
+        pos = 1
+        eof = False
+
+        while True:
+            while pos < len(buffer) and buffer[pos] in separators:
+                pos += 1
+            if pos < len(buffer) and buffer[pos] == ']':
+                return
+            try:
+                record, pos = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                # Object cut off at the end of the buffer: read more and retry
+                if eof:
+                    raise
+                chunk = jsonfile.read(JSON_READ_SIZE)
+                eof = not chunk
+                buffer = buffer[pos:] + chunk
+                pos = 0
+                continue
+            yield record
+
+
+def iter_json_lines_records(path: str) -> Iterator[Dict[str, Any]]:
+    """One JSON object per line"""
+    with open(path, encoding='utf-8') as jsonfile:
+        for line in jsonfile:
+            if line.strip():
+                yield json.loads(line)
+
+
+def iter_records(path: str) -> Iterator[Dict[str, Any]]:
+    """Records from a .csv, .json or .jsonl/.ndjson file"""
+    suffix = Path(path).suffix.lower()
+    if suffix == '.csv':
+        return iter_csv_records(path)
+    if suffix == '.json':
+        return iter_json_records(path)
+    if suffix in ('.jsonl', '.ndjson'):
+        return iter_json_lines_records(path)
+    raise ValueError(f"Unsupported catalog file type: {path}")
+
+
+# Values a parts_catalog column can hold
+COLUMN_TYPES = (str, int, float, bool)
+
+# Specification fields that look numeric but are identifiers (e.g. grade "6061")
+TEXT_SPEC_FIELDS = {'grade'}
+
+
+def _coerce_number(value: Any) -> Any:
+    """CSV cells arrive as text; keep numbers numeric inside the specifications JSON"""
+    if not isinstance(value, str):
+        return value
+    try:
+        number = float(value)
+    except ValueError:
+        return value
+    return int(number) if number.is_integer() and '.' not in value else number
+
+
+def normalize_record(record: Dict[str, Any], columns: AbstractSet[str]) -> Dict[str, Any]:
+    """Map a generator/export record onto parts_catalog columns
+
+    Only fields present in the record are returned, so an upsert of a partial
+    record (e.g. part_number and list_price) leaves the other columns alone.
+    Fields that are not catalog columns - including the flattened
+    specification columns of save_to_csv - are collected into specifications.
+    Raises ValueError for a record that cannot be stored.
+    """
+    if not isinstance(record, dict):
+        raise ValueError(f"expected an object, got {type(record).__name__}")
+
+    row: Dict[str, Any] = {}
+    specifications: Dict[str, Any] = {}
+
+    for key, value in record.items():
+        if value is None:
+            continue
+        column = FIELD_ALIASES.get(key, key)
+        if key != 'specifications' and column in columns and not isinstance(value, COLUMN_TYPES):
+            raise ValueError(f"{key} is a {type(value).__name__}, not a single value")
+        if key == 'specifications':
+            if isinstance(value, str):
+                value = json.loads(value) if value.startswith('{') else {'text': value}
+            specifications.update(value)
+        elif column in columns and column != 'id':
+            row.setdefault(column, value)
+        else:
+            specifications[key] = value if key in TEXT_SPEC_FIELDS else _coerce_number(value)
+
+    if specifications:
+        row['specifications'] = json.dumps(specifications, sort_keys=True)
+        for field, column in SPEC_COLUMNS.items():
+            # Wire and foil lengths are in feet, not inches
+            if field == 'length' and specifications.get('units') not in (None, 'inches'):
+                continue
+            if field in specifications and column in columns and column not in row:
+                row[column] = specifications[field]
+
+    if 'quantity_on_hand' in row and 'availability_status' not in row:
+        try:
+            quantity = int(float(row['quantity_on_hand']))
+        except (TypeError, ValueError, OverflowError):
+            raise ValueError(f"quantity_on_hand is not a number: {row['quantity_on_hand']!r}")
+        row['availability_status'] = (
+            'BACKORDER' if quantity <= 0
+            else 'LIMITED' if quantity < LIMITED_STOCK_THRESHOLD
+            else 'IN_STOCK'
+        )
+
+    return row
+
+
+def ensure_catalog_schema(conn: sqlite3.Connection):
+    """Create parts_catalog if needed and apply pending migrations (FTS tables, indexes)"""
+    conn.execute(CATALOG_TABLE_SQL)
+    apply_migrations(conn)
+
+
+def catalog_columns(conn: sqlite3.Connection) -> Tuple[List[str], set]:
+    """All parts_catalog columns, and those that must be provided on insert"""
+    info = conn.execute("PRAGMA table_info(parts_catalog)").fetchall()
+    columns = [row[1] for row in info]
+    required = {row[1] for row in info if row[3] and row[4] is None and not row[5]}
+    return columns, required
+
+
+def _deferrable_indexes(conn: sqlite3.Connection) -> List[Tuple[str, str]]:
+    """Explicitly created parts_catalog indexes (UNIQUE constraints stay: upserts need them)"""
+    return conn.execute(
+        "SELECT name, sql FROM sqlite_master WHERE type = 'index' AND tbl_name = 'parts_catalog' "
+        "AND sql IS NOT NULL"
+    ).fetchall()
+
+
+class CatalogLoader:
+    """Upserts normalized records into one catalog database
+
+    Rows are buffered per column layout and written with ``executemany``;
+    every ``transaction_size`` rows are committed as one transaction. With
+    ``defer_indexes`` the secondary indexes and FTS sync triggers are dropped
+    for the load and rebuilt once at the end, which is far cheaper than
+    maintaining them row by row.
+    """
+
+    def __init__(self, conn: sqlite3.Connection, batch_size: int = 10000,
+                 transaction_size: int = 100000, defer_indexes: bool = True):
+        self.conn = conn
+        self.batch_size = batch_size
+        self.transaction_size = transaction_size
+        self.defer_indexes = defer_indexes
+        self.columns, self.required = catalog_columns(conn)
+        self.stats = IngestStats()
+
+        self._buffers: Dict[Tuple[str, ...], List[tuple]] = {}
+        self._statements: Dict[Tuple[str, ...], str] = {}
+        self._uncommitted = 0
+        # Queued (not yet written) rows per part number
+        self._pending: Dict[str, int] = {}
+        self._deferred_indexes: List[Tuple[str, str]] = []
+        self._initial_count = 0
+
+    def __enter__(self) -> "CatalogLoader":
+        self._initial_count = self._count()
+        # Bulk-load settings: WAL makes synchronous=OFF safe against corruption
+        # (a crash can only lose the last transactions)
+        self.conn.execute("PRAGMA synchronous = OFF")
+        self.conn.execute("PRAGMA cache_size = -256000")
+        self.conn.execute("PRAGMA temp_store = MEMORY")
+
+        if self.defer_indexes:
+            self.conn.execute("BEGIN")
+            try:
+                self._deferred_indexes = _deferrable_indexes(self.conn)
+                for name, _ in self._deferred_indexes:
+                    self.conn.execute(f'DROP INDEX IF EXISTS "{name}"')
+                drop_search_triggers(self.conn)
+                self.conn.execute("COMMIT")
+            except BaseException:
+                # DDL is transactional: nothing was dropped
+                self.conn.execute("ROLLBACK")
+                raise
+            logger.info(f"Deferred {len(self._deferred_indexes)} indexes and FTS sync for bulk load")
+
+        self.conn.execute("BEGIN")
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if exc_type is None:
+                self.flush()
+                self.conn.execute("COMMIT")
+        finally:
+            # A failed load (or final flush) leaves its last batch uncommitted
+            if self.conn.in_transaction:
+                self.conn.execute("ROLLBACK")
+            # Restore indexes and FTS even if the load failed part-way, so
+            # committed batches are searchable and the schema is intact
+            if self.defer_indexes:
+                self._restore_indexes()
+            self.conn.execute("PRAGMA synchronous = NORMAL")
+
+        self.stats.inserted = self._count() - self._initial_count
+        self.stats.updated = self.stats.rows_read - self.stats.skipped - self.stats.inserted
+        return False
+
+    def _count(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM parts_catalog").fetchone()[0]
+
+    def _statement(self, layout: Tuple[str, ...]) -> str:
+        statement = self._statements.get(layout)
+        if statement is None:
+            updates = [column for column in layout if column != 'part_number']
+            assignments = ', '.join(f"{column} = excluded.{column}" for column in updates)
+            if self.required.issubset(layout):
+                statement = (
+                    f"INSERT INTO parts_catalog ({', '.join(layout)}) "
+                    f"VALUES ({', '.join('?' for _ in layout)}) "
+                    f"ON CONFLICT(part_number) DO UPDATE SET {assignments}, "
+                    f"updated_date = CURRENT_TIMESTAMP"
+                )
+            else:
+                # Partial record (e.g. a price or stock delta): NOT NULL columns
+                # are checked before the conflict, so it can only update
+                statement = (
+                    f"UPDATE parts_catalog SET "
+                    f"{', '.join(f'{column} = ?' for column in updates)}, "
+                    f"updated_date = CURRENT_TIMESTAMP WHERE part_number = ?"
+                )
+            self._statements[layout] = statement
+        return statement
+
+    def add(self, row: Dict[str, Any]):
+        """Queue one normalized record"""
+        self.stats.rows_read += 1
+        if not row.get('part_number') or len(row) == 1:
+            self.stats.skipped += 1
+            return
+
+        layout = tuple(sorted(row))
+        if self.required.issubset(layout):
+            values = tuple(row[column] for column in layout)
+        else:
+            values = tuple(row[column] for column in layout if column != 'part_number') + (row['part_number'],)
+
+        buffer = self._buffers.setdefault(layout, [])
+        buffer.append(values)
+        self._pending[row['part_number']] = self._pending.get(row['part_number'], 0) + 1
+        if len(buffer) >= self.batch_size:
+            self._write(layout)
+
+    def has_part(self, part_number: str) -> bool:
+        """Whether the part is stored in this database or queued for it"""
+        if part_number in self._pending:
+            return True
+        return self.conn.execute(
+            "SELECT 1 FROM parts_catalog WHERE part_number = ?", (part_number,)
+        ).fetchone() is not None
+
+    def take(self, part_number: str) -> Dict[str, Any]:
+        """Delete a part (after writing anything queued for it) and return its columns"""
+        if part_number in self._pending:
+            self.flush()
+        cursor = self.conn.execute("SELECT * FROM parts_catalog WHERE part_number = ?", (part_number,))
+        values = cursor.fetchone()
+        if values is None:
+            return {}
+        self.conn.execute("DELETE FROM parts_catalog WHERE part_number = ?", (part_number,))
+        names = [column[0] for column in cursor.description]
+        return {
+            name: value for name, value in zip(names, values)
+            if value is not None and name not in ('id', 'updated_date')
+        }
+
+    def _write(self, layout: Tuple[str, ...]):
+        rows = self._buffers.pop(layout, [])
+        if not rows:
+            return
+        part_number_index = layout.index('part_number') if self.required.issubset(layout) else -1
+        for values in rows:
+            part_number = values[part_number_index]
+            if self._pending[part_number] > 1:
+                self._pending[part_number] -= 1
+            else:
+                del self._pending[part_number]
+        cursor = self.conn.executemany(self._statement(layout), rows)
+        if not self.required.issubset(layout):
+            # UPDATEs of unknown part numbers change nothing
+            self.stats.skipped += len(rows) - cursor.rowcount
+
+        self._uncommitted += len(rows)
+        if self._uncommitted >= self.transaction_size:
+            self.conn.execute("COMMIT")
+            self.conn.execute("BEGIN")
+            self._uncommitted = 0
+
+    def flush(self):
+        for layout in list(self._buffers):
+            self._write(layout)
+
+    def _restore_indexes(self):
+        start = time.time()
+        self.conn.execute("BEGIN")
+        try:
+            for _, sql in self._deferred_indexes:
+                self.conn.execute(sql)
+            rebuild_search_index(self.conn)
+            create_search_triggers(self.conn)
+            self.conn.execute("ANALYZE parts_catalog")
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+        logger.info(f"Rebuilt indexes and full-text search in {time.time() - start:.1f}s")
+
+
+def _finish_loaders(loaders: List[CatalogLoader], error: Optional[BaseException]):
+    """Exit every loader, so each restores its indexes even if another one failed
+
+    Once a loader fails to commit, the remaining ones roll back. A failure
+    is re-raised unless the load had already failed with ``error``.
+    """
+    failure: Optional[BaseException] = None
+    for loader in loaders:
+        current = error or failure
+        try:
+            if current is None:
+                loader.__exit__(None, None, None)
+            else:
+                loader.__exit__(type(current), current, current.__traceback__)
+        except BaseException as e:
+            logger.error(f"Finishing the load failed: {e}")
+            failure = failure or e
+    if failure is not None and error is None:
+        raise failure
+
+
+def _route_by_category(loaders: List[CatalogLoader],
+                       row: Dict[str, Any]) -> Tuple[CatalogLoader, Dict[str, Any]]:
+    """Loader and row for a record of a catalog sharded by category
+
+    A part's shard follows its category, which a record may leave out or
+    change, so the shard already holding the part is looked up first: a
+    record without a category (e.g. a price or stock delta) updates the part
+    there, and a part whose category changed is moved to its new shard.
+    """
+    part_number = row.get('part_number')
+    owner = next((loader for loader in loaders if part_number and loader.has_part(part_number)), None)
+    if 'category' not in row:
+        # An unknown part's update matches nothing and is counted as skipped
+        return owner or loaders[0], row
+
+    target = loaders[shard_index(row['category'], len(loaders))]
+    if owner is not None and owner is not target:
+        row = {**owner.take(part_number), **row}
+    return target, row
+
+
+def load_catalog(conns: List[sqlite3.Connection], records: Iterable[Dict[str, Any]],
+                 shard_key: str = 'part_number', batch_size: int = 10000,
+                 transaction_size: int = 100000, defer_indexes: bool = True) -> IngestStats:
+    """Stream records into one catalog database, or route them across shards
+
+    With several connections each record goes to ``shard_index(record[shard_key])``,
+    matching how SecureDatabaseManager locates parts. Sharded by category, a
+    record goes to the shard holding the part, if any (see _route_by_category),
+    which costs a part number lookup per shard.
+    """
+    start = time.time()
+    loaders = [
+        CatalogLoader(conn, batch_size, transaction_size, defer_indexes) for conn in conns
+    ]
+    columns = set(loaders[0].columns)
+
+    entered: List[CatalogLoader] = []
+    invalid = 0
+    try:
+        for loader in loaders:
+            entered.append(loader.__enter__())
+
+        for count, record in enumerate(records, 1):
+            try:
+                row = normalize_record(record, columns)
+            except ValueError as e:
+                invalid += 1
+                logger.warning(f"Skipping record {count}: {e}")
+                continue
+            if shard_key == 'category' and len(loaders) > 1:
+                loader, row = _route_by_category(loaders, row)
+            else:
+                loader = loaders[shard_index(row.get(shard_key), len(loaders))]
+            loader.add(row)
+            if count % 100000 == 0:
+                logger.info(f"Ingested {count} records ({count / (time.time() - start):.0f}/s)")
+    except BaseException as e:
+        _finish_loaders(entered, e)
+        raise
+    else:
+        _finish_loaders(entered, None)
+
+    total = IngestStats(rows_read=invalid, skipped=invalid, elapsed=time.time() - start)
+    for loader in loaders:
+        total.rows_read += loader.stats.rows_read
+        total.inserted += loader.stats.inserted
+        total.updated += loader.stats.updated
+        total.skipped += loader.stats.skipped
+    return total
@@ -0,0 +1,188 @@
+"""
+Schema migrations for the local parts catalog database
+Migrations are applied in order and recorded in the schema_migrations table
+"""
+
+import sqlite3
+import logging
+from datetime import datetime
+from typing import Callable, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Columns indexed by parts_search, with their bm25() weights (higher = more important)
+SEARCH_COLUMNS: List[Tuple[str, float]] = [
+    ('part_number', 10.0),
+    ('description', 4.0),
+    ('material', 3.0),
+    ('keywords', 2.0),
+    ('specifications', 1.0),
+]
+
+# Columns indexed by the trigram table used for substring (LIKE '%term%') lookups
+TRIGRAM_COLUMNS = ['part_number', 'description']
+
+SEARCH_TRIGGERS = ('parts_catalog_search_ai', 'parts_catalog_search_ad', 'parts_catalog_search_au')
+
+
+def _search_trigger_sql() -> List[str]:
+    """Triggers keeping both external-content FTS tables in sync with parts_catalog"""
+    search_cols = ', '.join(name for name, _ in SEARCH_COLUMNS)
+    new_search = ', '.join(f'new.{name}' for name, _ in SEARCH_COLUMNS)
+    old_search = ', '.join(f'old.{name}' for name, _ in SEARCH_COLUMNS)
+    trigram_cols = ', '.join(TRIGRAM_COLUMNS)
+    new_trigram = ', '.join(f'new.{name}' for name in TRIGRAM_COLUMNS)
+    old_trigram = ', '.join(f'old.{name}' for name in TRIGRAM_COLUMNS)
+
+    insert_new = f"""
+        INSERT INTO parts_search(rowid, {search_cols}) VALUES (new.id, {new_search});
+        INSERT INTO parts_search_trigram(rowid, {trigram_cols}) VALUES (new.id, {new_trigram});"""
+    delete_old = f"""
+        INSERT INTO parts_search(parts_search, rowid, {search_cols}) VALUES ('delete', old.id, {old_search});
+        INSERT INTO parts_search_trigram(parts_search_trigram, rowid, {trigram_cols}) VALUES ('delete', old.id, {old_trigram});"""
+
+    return [
+        f"CREATE TRIGGER parts_catalog_search_ai AFTER INSERT ON parts_catalog BEGIN{insert_new}\n    END",
+        f"CREATE TRIGGER parts_catalog_search_ad AFTER DELETE ON parts_catalog BEGIN{delete_old}\n    END",
+        f"CREATE TRIGGER parts_catalog_search_au AFTER UPDATE ON parts_catalog BEGIN{delete_old}{insert_new}\n    END",
+    ]
+
+
+def drop_search_triggers(conn: sqlite3.Connection):
+    """Drop the FTS sync triggers (and any legacy trigger writing to parts_search)"""
+    legacy = conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'parts_catalog' "
+        "AND sql LIKE '%parts_search%'"
+    ).fetchall()
+    for name in set(SEARCH_TRIGGERS) | {row[0] for row in legacy}:
+        conn.execute(f'DROP TRIGGER IF EXISTS "{name}"')
+
+
+def create_search_triggers(conn: sqlite3.Connection):
+    for sql in _search_trigger_sql():
+        conn.execute(sql)
+
+
+def rebuild_search_index(conn: sqlite3.Connection, optimize: bool = True):
+    """Repopulate both FTS tables from parts_catalog (e.g. after a bulk load)"""
+    conn.execute("INSERT INTO parts_search(parts_search) VALUES ('rebuild')")
+    conn.execute("INSERT INTO parts_search_trigram(parts_search_trigram) VALUES ('rebuild')")
+    if optimize:
+        conn.execute("INSERT INTO parts_search(parts_search) VALUES ('optimize')")
+        conn.execute("INSERT INTO parts_search_trigram(parts_search_trigram) VALUES ('optimize')")
+
+
+def _migrate_fts5_search_index(conn: sqlite3.Connection):
+    """Rebuild parts_search with prefix indexes and bm25 weights, add a trigram table"""
+
+    drop_search_triggers(conn)
+    conn.execute("DROP TABLE IF EXISTS parts_search")
+    conn.execute("DROP TABLE IF EXISTS parts_search_trigram")
+
+    search_cols = ', '.join(name for name, _ in SEARCH_COLUMNS)
+    conn.execute(f"""
+        CREATE VIRTUAL TABLE parts_search USING fts5(
+            {search_cols},
+            content='parts_catalog',
+            content_rowid='id',
+            prefix='2 3 4'
+        )
+    """)
+    conn.execute(f"""
+        CREATE VIRTUAL TABLE parts_search_trigram USING fts5(
+            {', '.join(TRIGRAM_COLUMNS)},
+            content='parts_catalog',
+            content_rowid='id',
+            tokenize='trigram'
+        )
+    """)
+
+    # Persistent default ranking, so plain ``ORDER BY rank`` uses the column weights
+    weights = ', '.join(str(weight) for _, weight in SEARCH_COLUMNS)
+    conn.execute("INSERT INTO parts_search(parts_search, rank) VALUES ('rank', ?)", (f"bm25({weights})",))
+
+    rebuild_search_index(conn)
+    create_search_triggers(conn)
+
+
+# Composite indexes for the catalog's filter/sort access paths (see query_plans.py)
+CATALOG_INDEXES: List[Tuple[str, str]] = [
+    # get_categories / get_database_stats: covering GROUP BY and counts over active parts
+    ('idx_parts_active_category', 'active, category'),
+    ('idx_parts_active_availability', 'active, availability_status'),
+    ('idx_parts_active_price', 'active, list_price'),
+    # get_parts_by_category: equality filters then ORDER BY part_number without a sort
+    ('idx_parts_category_active_part', 'category, active, part_number'),
+    ('idx_parts_category_sub_active_part', 'category, subcategory, active, part_number'),
+    # Filtered search: equality filters then ORDER BY list_price LIMIT n
+    ('idx_parts_category_active_price', 'category, active, list_price'),
+    ('idx_parts_availability_active_price', 'availability_status, active, list_price'),
+    # get_materials: DISTINCT material straight from the index
+    ('idx_parts_material_active', 'material, active'),
+]
+
+
+def _migrate_catalog_covering_indexes(conn: sqlite3.Connection):
+    """Create composite indexes for the canonical catalog queries and refresh planner stats"""
+    for name, columns in CATALOG_INDEXES:
+        conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON parts_catalog ({columns})")
+    conn.execute("ANALYZE parts_catalog")
+
+
+# (version, migration) pairs in the order they must be applied
+MIGRATIONS: List[Tuple[str, Callable[[sqlite3.Connection], None]]] = [
+    ('001_fts5_search_index', _migrate_fts5_search_index),
+    ('002_catalog_covering_indexes', _migrate_catalog_covering_indexes),
+]
+
+
+def _ensure_migrations_table(conn: sqlite3.Connection):
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version TEXT PRIMARY KEY,
+            applied_at TEXT NOT NULL
+        )
+    """)
+
+
+def get_applied_migrations(conn: sqlite3.Connection) -> List[str]:
+    _ensure_migrations_table(conn)
+    return [row[0] for row in conn.execute("SELECT version FROM schema_migrations ORDER BY version")]
+
+
+def get_pending_migrations(conn: sqlite3.Connection) -> List[str]:
+    applied = set(get_applied_migrations(conn))
+    return [version for version, _ in MIGRATIONS if version not in applied]
+
+
+def apply_migrations(conn: sqlite3.Connection) -> List[str]:
+    """Apply pending migrations, each in its own transaction; returns the versions applied"""
+
+    applied = []
+    for version, migrate in MIGRATIONS:
+        if version not in get_applied_migrations(conn):
+            logger.info(f"Applying migration {version}")
+            # Explicit transaction: FTS rebuilds and triggers must land together
+            conn.execute("BEGIN")
+            try:
+                migrate(conn)
+                conn.execute(
+                    "INSERT INTO schema_migrations (version, applied_at) VALUES (?, ?)",
+                    (version, datetime.now().isoformat())
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                logger.error(f"Migration {version} failed")
+                raise
+            applied.append(version)
+
+    return applied
+
+
+def connect_for_migration(db_path: str) -> sqlite3.Connection:
+    """Writable connection with autocommit, so migrations control their own transactions"""
+    conn = sqlite3.connect(db_path, timeout=30.0, isolation_level=None)
+    conn.execute("PRAGMA foreign_keys = ON")
+    conn.execute("PRAGMA journal_mode = WAL")
+    return conn
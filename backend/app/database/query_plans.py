@@ -0,0 +1,225 @@
+"""
+Query-plan regression checks for the parts catalog
+Runs EXPLAIN QUERY PLAN over the catalog's canonical queries and reports any
+that fall back to a full table scan
+"""
+
+import re
+import sqlite3
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+QueryParams = Union[Sequence[Any], Mapping[str, Any]]
+
+# Fixed-text access paths: name -> (sql, params). Keep these in step with the
+# queries in connection.py and connection_pool.py; the search service's
+# candidate queries are generated by candidate_queries() instead.
+CANONICAL_QUERIES: Dict[str, Tuple[str, QueryParams]] = {
+    'part_by_number': (
+        "SELECT * FROM parts_catalog WHERE part_number = ? AND active = 1",
+        ('BOL-000001',)
+    ),
+    'parts_by_category': (
+        "SELECT * FROM parts_catalog WHERE category = ? AND active = 1 ORDER BY part_number LIMIT ?",
+        ('Fasteners', 100)
+    ),
+    'parts_by_subcategory': (
+        "SELECT * FROM parts_catalog WHERE category = ? AND subcategory = ? AND active = 1 "
+        "ORDER BY part_number LIMIT ?",
+        ('Fasteners', 'Bolts', 100)
+    ),
+    'filtered_search_by_category': (
+        "SELECT * FROM parts_catalog WHERE active = 1 AND category = ? AND material LIKE ? "
+        "AND description LIKE ? ORDER BY list_price ASC LIMIT ?",
+        ('Fasteners', '%Steel%', '%bolt%', 50)
+    ),
+    'filtered_search_by_availability': (
+        "SELECT * FROM parts_catalog WHERE active = 1 AND availability_status = ? "
+        "AND list_price <= ? ORDER BY list_price ASC LIMIT ?",
+        ('IN_STOCK', 100.0, 50)
+    ),
+    'filtered_search_by_material': (
+        "SELECT * FROM parts_catalog WHERE active = 1 AND material LIKE ? "
+        "ORDER BY list_price ASC LIMIT ?",
+        ('%Brass%', 50)
+    ),
+    'categories': (
+        "SELECT category, COUNT(*) as part_count FROM parts_catalog WHERE active = 1 "
+        "GROUP BY category ORDER BY category",
+        ()
+    ),
+    'materials': (
+        "SELECT DISTINCT material FROM parts_catalog WHERE material IS NOT NULL ORDER BY material",
+        ()
+    ),
+    'stats_total': (
+        "SELECT COUNT(*) as total FROM parts_catalog WHERE active = 1",
+        ()
+    ),
+    'stats_availability': (
+        "SELECT availability_status, COUNT(*) as count FROM parts_catalog WHERE active = 1 "
+        "GROUP BY availability_status ORDER BY count DESC",
+        ()
+    ),
+    'stats_pricing': (
+        "SELECT MIN(list_price) as min_price, MAX(list_price) as max_price, "
+        "AVG(list_price) as avg_price, COUNT(*) as total_with_price "
+        "FROM parts_catalog WHERE active = 1 AND list_price > 0",
+        ()
+    ),
+    'full_text_search': (
+        "SELECT p.* FROM (SELECT rowid, rank FROM parts_search WHERE parts_search MATCH ? "
+        "ORDER BY rank LIMIT ?) s JOIN parts_catalog p ON p.id = s.rowid ORDER BY s.rank",
+        ('"stainless"* "bolt"*', 50)
+    ),
+    'substring_description_search': (
+        "SELECT p.* FROM parts_search_trigram t CROSS JOIN parts_catalog p ON p.id = t.rowid "
+        "WHERE t.description LIKE ? AND p.active = 1 ORDER BY p.list_price ASC LIMIT ?",
+        ('%hex bolt%', 50)
+    ),
+}
+
+# Representative LocalPartsCatalogService.build_candidate_query calls:
+# name -> (queries, filters, sharded)
+CANDIDATE_QUERY_CASES: Dict[str, Tuple[List[str], Optional[Dict[str, Any]], bool]] = {
+    'candidates_part_number': (['BOL-000001'], None, False),
+    'candidates_text': (['stainless hex bolt'], None, False),
+    'candidates_short_term': (['m6'], None, False),
+    'candidates_filtered': (
+        ['bolt'],
+        {'category': 'Fasteners', 'material': 'Steel', 'availability_status': 'IN_STOCK',
+         'price_range': {'min': 1, 'max': 100}},
+        False
+    ),
+    'candidates_batch': (['hex bolt', 'flat washer', 'm6'], None, False),
+    'candidates_sharded': (['stainless hex bolt'], None, True),
+}
+CANDIDATE_QUERY_LIMIT = 50
+
+# Full scans a query is known and accepted to make: name -> plan steps
+ALLOWED_SCANS: Dict[str, Tuple[str, ...]] = {
+    # Terms shorter than the trigram index's minimum fall back to LIKE, which
+    # reads every part number from the narrowest covering index
+    'candidates_short_term': ('SCAN p USING COVERING INDEX idx_parts_category_active_part',),
+    'candidates_batch': ('SCAN p USING COVERING INDEX idx_parts_category_active_part',),
+}
+
+_SCAN_PATTERN = re.compile(r'^SCAN (\S+)(.*)$')
+# "FROM table [AS] alias" / "JOIN table [AS] alias"
+_TABLE_REFERENCE_PATTERN = re.compile(r'\b(?:FROM|JOIN)\s+(\w+)(?:\s+(?:AS\s+)?(\w+))?', re.IGNORECASE)
+_SQL_KEYWORDS = {
+    'where', 'on', 'join', 'cross', 'inner', 'left', 'natural', 'order', 'group', 'limit',
+    'union', 'using', 'window', 'having', 'as',
+}
+
+
+@dataclass
+class QueryPlanReport:
+    """EXPLAIN QUERY PLAN outcome for one canonical query"""
+    name: str
+    plan: List[str]
+    full_scans: List[str] = field(default_factory=list)
+    allowed_scans: List[str] = field(default_factory=list)
+    temp_sorts: List[str] = field(default_factory=list)
+    error: str = ''
+
+    @property
+    def ok(self) -> bool:
+        return not self.full_scans and not self.error
+
+
+def explain(conn: sqlite3.Connection, sql: str, params: QueryParams = ()) -> List[str]:
+    """Plan steps for a query, indented by depth"""
+    if not isinstance(params, Mapping):
+        params = tuple(params)
+    rows = conn.execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()
+    depth = {0: -1}
+    lines = []
+    for node_id, parent_id, _, detail in rows:
+        depth[node_id] = depth.get(parent_id, -1) + 1
+        lines.append('  ' * depth[node_id] + detail)
+    return lines
+
+
+def _has_table(conn: sqlite3.Connection, name: str) -> bool:
+    row = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,)).fetchone()
+    return row is not None
+
+
+def candidate_queries(conn: sqlite3.Connection) -> Dict[str, Tuple[str, QueryParams]]:
+    """The search service's candidate queries for CANDIDATE_QUERY_CASES
+
+    Built by the service's own query builder, for the optional search tables
+    this catalog actually has.
+    """
+    # Imported here: the service layer depends on this package, not the other way round
+    from ..services.local_parts_catalog import LocalPartsCatalogService
+
+    trigram_index = _has_table(conn, 'parts_search_trigram')
+    full_text = _has_table(conn, 'parts_search')
+    return {
+        name: LocalPartsCatalogService.build_candidate_query(
+            queries, filters, CANDIDATE_QUERY_LIMIT, trigram_index, full_text, sharded
+        )
+        for name, (queries, filters, sharded) in CANDIDATE_QUERY_CASES.items()
+    }
+
+
+def canonical_queries(conn: sqlite3.Connection) -> Dict[str, Tuple[str, QueryParams]]:
+    """CANONICAL_QUERIES plus the generated candidate queries"""
+    return {**CANONICAL_QUERIES, **candidate_queries(conn)}
+
+
+def _stored_table_names(conn: sqlite3.Connection, sql: str) -> set:
+    """Names and aliases under which ``sql`` reads ordinary tables
+
+    Plans show tables by alias, and CTEs and subqueries under their own names
+    (or an alias of those), so only references to real tables count.
+    """
+    tables = {
+        name.lower() for (name,) in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND sql NOT LIKE 'CREATE VIRTUAL TABLE%'"
+        )
+    }
+    names = set()
+    for table, alias in _TABLE_REFERENCE_PATTERN.findall(sql):
+        if table.lower() in tables:
+            names.add(table.lower())
+            if alias and alias.lower() not in _SQL_KEYWORDS:
+                names.add(alias.lower())
+    return names
+
+
+def check_query_plans(conn: sqlite3.Connection,
+                      queries: Dict[str, Tuple[str, QueryParams]] = None) -> List[QueryPlanReport]:
+    """Explain every canonical query and flag full scans of ordinary tables
+
+    FTS virtual tables are exempt: their scans are driven by the FTS index.
+    Scans listed in ALLOWED_SCANS are reported separately instead of failing.
+    """
+
+    reports = []
+
+    for name, (sql, params) in (queries or canonical_queries(conn)).items():
+        try:
+            plan = explain(conn, sql, params)
+        except sqlite3.Error as e:
+            reports.append(QueryPlanReport(name=name, plan=[], error=str(e)))
+            continue
+
+        report = QueryPlanReport(name=name, plan=plan)
+        stored = _stored_table_names(conn, sql)
+        allowed = ALLOWED_SCANS.get(name, ())
+        for step in (line.strip() for line in plan):
+            match = _SCAN_PATTERN.match(step)
+            if match and match.group(1).lower() in stored and 'VIRTUAL TABLE' not in match.group(2):
+                # "SCAN t USING COVERING INDEX" still visits every index entry
+                if step in allowed:
+                    report.allowed_scans.append(step)
+                else:
+                    report.full_scans.append(step)
+            elif step.startswith('USE TEMP B-TREE'):
+                report.temp_sorts.append(step)
+        reports.append(report)
+
+    return reports
@@ -0,0 +1,60 @@
+"""
+Partitioning helpers for a parts catalog split across several SQLite files
+Every shard has the full schema; each part lives in exactly one shard, chosen by
+a stable hash of its shard key (part_number by default, or category)
+"""
+
+import heapq
+import os
+import zlib
+from typing import Any, Iterable, List, Mapping, Optional, Sequence
+
+SHARD_KEYS = ('part_number', 'category')
+
+
+def shard_index(key_value: Any, shard_count: int) -> int:
+    """Shard owning a row whose shard key is ``key_value``
+
+    CRC32 rather than hash(): the assignment must be identical across processes
+    and Python versions, since loaders and readers compute it independently.
+    """
+    if shard_count <= 1:
+        return 0
+    key = '' if key_value is None else str(key_value)
+    return zlib.crc32(key.encode('utf-8')) % shard_count
+
+
+def _sort_key(order_by: Sequence[str]):
+    # SQLite sorts NULL before any value in ascending order
+    def key(row: Mapping[str, Any]):
+        return tuple((row[column] is not None, row[column]) for column in order_by)
+    return key
+
+
+def merge_sorted_rows(shard_rows: Iterable[List[Mapping[str, Any]]],
+                      order_by: Optional[Sequence[str]] = None,
+                      limit: Optional[int] = None,
+                      descending: bool = False) -> List[Mapping[str, Any]]:
+    """Combine per-shard results into one result set
+
+    With ``order_by``, each shard's rows must already be sorted on those
+    columns (the same ORDER BY ran on every shard) and are k-way merged. If each
+    shard also applied ``LIMIT n``, merging and keeping the first ``n`` rows
+    gives exactly the single-database answer. Without ``order_by`` the shards'
+    rows are concatenated in shard order.
+    """
+    if order_by:
+        merged = heapq.merge(*shard_rows, key=_sort_key(order_by), reverse=descending)
+    else:
+        merged = (row for rows in shard_rows for row in rows)
+
+    if limit is None:
+        return list(merged)
+    return [row for _, row in zip(range(limit), merged)]
+
+
+def paths_from_env(name: str) -> Optional[List[str]]:
+    """Comma-separated database paths from an environment variable, or None if unset"""
+    value = os.getenv(name, '')
+    paths = [path.strip() for path in value.split(',') if path.strip()]
+    return paths or None
@@ -10,7 +10,7 @@ import time
 from .api import health, orders, upload
 from .services.websocket_manager import WebSocketManager
 from .core.logging import setup_logging, get_logger
-from .core.monitoring import performance_monitor, health_monitor
+from .core.monitoring import performance_monitor, health_monitor, metrics_collector
 from .core.config import settings
 from .middleware.logging import (
     LoggingMiddleware, 
@@ -47,6 +47,10 @@ async def lifespan(app: FastAPI):
     health_monitor.register_health_check("database", database_health)
     health_monitor.register_health_check("external_services", external_services_health)
     
+    # Report catalog search cache hit rates alongside the other app metrics
+    from .services.search_result_cache import get_search_result_cache
+    get_search_result_cache().metrics = metrics_collector
+    
     yield
     
     # Shutdown
@@ -5,14 +5,16 @@ Provides comprehensive search capabilities for intelligent agent-driven parts lo
 
 import asyncio
 import re
-from typing import List, Dict, Any, Optional, Union
+from typing import List, Dict, Any, Optional, Sequence, Union
 from dataclasses import dataclass
 import structlog
-from fuzzywuzzy import fuzz, process
 import pandas as pd
 import numpy as np
 
 from ..services.parts_catalog import PartsCatalogService
+from ..services.catalog_snapshot import get_catalog_snapshot_service
+from ..services.fuzzy_index import FuzzyMatch, FuzzyTextIndex
+from ..services.dimension_index import DimensionIndex, DimensionMatch, normalized_dimensions, usable_targets
 from ..models.line_item_schemas import LineItem, SearchResult, MatchConfidence
 
 logger = structlog.get_logger()
@@ -31,6 +33,8 @@ class AgenticSearchTools:
     def __init__(self, catalog_service: PartsCatalogService):
         self.catalog_service = catalog_service
         self.search_strategies = self._initialize_search_strategies()
+        # name -> (parts, index) for the mock catalog; snapshot indexes live on the snapshot
+        self._parts_indexes: Dict[str, Any] = {}
         
     def _initialize_search_strategies(self) -> Dict[str, SearchStrategy]:
         """Initialize available search strategies with metadata"""
@@ -152,48 +156,28 @@ class AgenticSearchTools:
                 logger.warning("No parts found in catalog for fuzzy search")
                 return []
             
-            fuzzy_matches = []
-            
-            for part in all_parts:
-                # Create searchable text from part
-                searchable_text = self._create_searchable_text(part)
-                
-                # Apply material filter if specified
-                if material_type and not self._material_matches(part, material_type):
-                    continue
-                
-                # Calculate fuzzy match scores for each term
-                best_score = 0
-                matched_term = ""
-                
-                for term in terms:
-                    score = fuzz.partial_ratio(term.lower(), searchable_text.lower())
-                    if score > best_score:
-                        best_score = score
-                        matched_term = term
-                
-                # Include if above threshold
-                if best_score >= fuzzy_threshold:
-                    search_result = SearchResult(
-                        rank=0,  # Will be reranked
-                        part_number=part["part_number"],
-                        description=part["description"],
-                        similarity_score=best_score / 100.0,  # Normalize to 0-1
-                        spec_match={"overall": "fuzzy_text_match", "matched_term": matched_term},
-                        availability=part.get("availability"),
-                        unit_price=part.get("unit_price"),
-                        supplier=part.get("supplier"),
-                        match_confidence=self._score_to_confidence(best_score / 100.0),
-                        notes=[f"Fuzzy match for '{matched_term}' (score: {best_score})"]
-                    )
-                    fuzzy_matches.append((best_score, search_result))
+            # Index lookup and scoring are CPU-bound; keep them off the event loop
+            matches = await asyncio.get_running_loop().run_in_executor(
+                None, self._fuzzy_search_parts, all_parts, terms, material_type, fuzzy_threshold
+            )
             
-            # Sort by score and assign ranks
-            fuzzy_matches.sort(key=lambda x: x[0], reverse=True)
             search_results = []
-            for i, (score, result) in enumerate(fuzzy_matches[:20]):  # Limit to top 20
-                result.rank = i + 1
-                search_results.append(result)
+            for i, match in enumerate(matches):
+                part = all_parts[match.row]
+                best_score = match.score
+                matched_term = terms[match.term_index] if best_score > 0 else ""
+                search_results.append(SearchResult(
+                    rank=i + 1,
+                    part_number=part["part_number"],
+                    description=part["description"],
+                    similarity_score=best_score / 100.0,  # Normalize to 0-1
+                    spec_match={"overall": "fuzzy_text_match", "matched_term": matched_term},
+                    availability=part.get("availability"),
+                    unit_price=part.get("unit_price"),
+                    supplier=part.get("supplier"),
+                    match_confidence=self._score_to_confidence(best_score / 100.0),
+                    notes=[f"Fuzzy match for '{matched_term}' (score: {best_score})"]
+                ))
             
             logger.info("✅ Fuzzy text search completed", 
                        results_found=len(search_results), terms=terms)
@@ -298,7 +282,7 @@ class AgenticSearchTools:
         MCP Tool: Find parts within dimensional tolerances
         
         Args:
-            target_dims: Target dimensions (e.g., {"diameter": 6.25, "length": 20})
+            target_dims: Target dimensions in inches (e.g., {"diameter": 6.25, "length": 20})
             tolerance: Tolerance as fraction (e.g., 0.2 = 20%)
             
         Returns:
@@ -308,37 +292,37 @@ class AgenticSearchTools:
                    target_dims=target_dims, tolerance=tolerance)
         
         try:
-            all_parts = await self._get_all_catalog_parts()
-            dimensional_matches = []
+            targets = usable_targets(target_dims)
+            if len(targets) < len(target_dims):
+                logger.warning("Ignoring non-numeric or non-positive target dimensions",
+                               ignored=sorted(set(target_dims) - set(targets)))
+            if not targets:
+                return []
             
-            for part in all_parts:
-                specs = part.get("specifications", {})
-                if not specs:
-                    continue
-                
-                # Check dimensional matches
-                match_score = self._calculate_dimensional_match(specs, target_dims, tolerance)
-                if match_score > 0:
-                    search_result = SearchResult(
-                        rank=0,  # Will be reranked
-                        part_number=part["part_number"],
-                        description=part["description"],
-                        similarity_score=match_score,
-                        spec_match=self._analyze_dimensional_match(specs, target_dims),
-                        availability=part.get("availability"),
-                        unit_price=part.get("unit_price"),
-                        supplier=part.get("supplier"),
-                        match_confidence=self._score_to_confidence(match_score),
-                        notes=[f"Dimensional match within {tolerance*100:.1f}% tolerance"]
-                    )
-                    dimensional_matches.append((match_score, search_result))
+            all_parts = await self._get_all_catalog_parts()
+            if not all_parts:
+                return []
+            # Building the index on first use is CPU-bound; keep it off the event loop
+            matches = await asyncio.get_running_loop().run_in_executor(
+                None, self._dimensional_search_parts, all_parts, targets, tolerance
+            )
             
-            # Sort by match score and assign ranks
-            dimensional_matches.sort(key=lambda x: x[0], reverse=True)
             search_results = []
-            for i, (score, result) in enumerate(dimensional_matches[:15]):
-                result.rank = i + 1
-                search_results.append(result)
+            for i, match in enumerate(matches):
+                part = all_parts[match.row]
+                dimensions = normalized_dimensions(part.get("specifications") or {})
+                search_results.append(SearchResult(
+                    rank=i + 1,
+                    part_number=part["part_number"],
+                    description=part["description"],
+                    similarity_score=match.score,
+                    spec_match=self._analyze_dimensional_match(dimensions, targets),
+                    availability=part.get("availability"),
+                    unit_price=part.get("unit_price"),
+                    supplier=part.get("supplier"),
+                    match_confidence=self._score_to_confidence(match.score),
+                    notes=[f"Dimensional match within {tolerance*100:.1f}% tolerance"]
+                ))
             
             logger.info("✅ Dimensional search completed", 
                        results_found=len(search_results), target_dims=target_dims)
@@ -508,21 +492,21 @@ class AgenticSearchTools:
     
     # Helper methods
     
-    async def _get_all_catalog_parts(self) -> List[Dict[str, Any]]:
-        """Get all parts from catalog for processing"""
+    async def _get_all_catalog_parts(self) -> Sequence[Dict[str, Any]]:
+        """Get all parts from catalog for processing
+        
+        Served from the process-wide catalog snapshot, which is loaded once and
+        only reloaded when the catalog changes; the parts are shared, read-only.
+        """
         try:
-            # First try to get parts from vector store (which has CSV data)
-            from ..services.local_vector_store import LocalPartsCatalogVectorStore
-            vector_store = LocalPartsCatalogVectorStore()
-            
+            # First try the vector store parts (which have the CSV data)
             try:
-                # Get all parts from vector store
-                all_vector_parts = await vector_store.get_all_parts()
-                if all_vector_parts and len(all_vector_parts) > len(self.catalog_service.mock_parts):
-                    logger.info(f"Using vector store parts: {len(all_vector_parts)} parts")
-                    return all_vector_parts
+                snapshot = await get_catalog_snapshot_service().get_snapshot()
+                if len(snapshot.parts) > len(self.catalog_service.mock_parts):
+                    logger.debug(f"Using catalog snapshot: {len(snapshot.parts)} parts")
+                    return snapshot.parts
             except Exception as e:
-                logger.warning("Could not get parts from vector store", error=str(e))
+                logger.warning("Could not get parts from catalog snapshot", error=str(e))
             
             # Fallback to mock parts
             logger.info(f"Using mock parts: {len(self.catalog_service.mock_parts)} parts")
@@ -532,6 +516,40 @@ class AgenticSearchTools:
             logger.error("Failed to get catalog parts", error=str(e))
             return []
     
+    def _fuzzy_search_parts(self, parts: Sequence[Dict[str, Any]], terms: List[str],
+                            material_type: Optional[str], fuzzy_threshold: int) -> List[FuzzyMatch]:
+        """Top 20 parts by best partial_ratio over ``terms``, via the parts' trigram index"""
+        row_filter = None
+        if material_type:
+            row_filter = lambda row: self._material_matches(parts[row], material_type)
+        return self._get_fuzzy_index(parts).search(terms, fuzzy_threshold, limit=20,
+                                                   row_filter=row_filter)
+    
+    def _dimensional_search_parts(self, parts: Sequence[Dict[str, Any]], targets: Dict[str, float],
+                                  tolerance: float) -> List[DimensionMatch]:
+        """Top 15 parts within ``tolerance`` of every target dimension"""
+        return self._get_parts_index(parts, "dimensions", DimensionIndex).search(
+            targets, tolerance, limit=15
+        )
+    
+    def _get_fuzzy_index(self, parts: Sequence[Dict[str, Any]]) -> FuzzyTextIndex:
+        """Fuzzy index over the parts' searchable text"""
+        return self._get_parts_index(
+            parts, "fuzzy_text",
+            lambda parts_to_index: FuzzyTextIndex([self._create_searchable_text(part) for part in parts_to_index])
+        )
+    
+    def _get_parts_index(self, parts: Sequence[Dict[str, Any]], name: str, build):
+        """Index ``name`` over ``parts``, built once per catalog snapshot (or mock catalog)"""
+        snapshot = get_catalog_snapshot_service().snapshot
+        if snapshot is not None and snapshot.parts is parts:
+            return snapshot.derived(name, build)
+        
+        cached = self._parts_indexes.get(name)
+        if cached is None or cached[0] is not parts:
+            cached = self._parts_indexes[name] = (parts, build(parts))
+        return cached[1]
+    
     def _create_searchable_text(self, part: Dict[str, Any]) -> str:
         """Create searchable text from part data"""
         searchable_parts = [
@@ -611,26 +629,6 @@ class AgenticSearchTools:
         
         return spec_match
     
-    def _calculate_dimensional_match(self, specs: Dict, target_dims: Dict, 
-                                   tolerance: float) -> float:
-        """Calculate dimensional match score"""
-        if not specs or not target_dims:
-            return 0.0
-        
-        matches = 0
-        total = 0
-        
-        for dim_name, target_value in target_dims.items():
-            if dim_name in specs:
-                spec_value = specs[dim_name]
-                if isinstance(spec_value, (int, float)) and isinstance(target_value, (int, float)):
-                    total += 1
-                    deviation = abs(spec_value - target_value) / target_value
-                    if deviation <= tolerance:
-                        matches += 1
-        
-        return matches / total if total > 0 else 0.0
-    
     def _analyze_dimensional_match(self, specs: Dict, target_dims: Dict) -> Dict[str, str]:
         """Analyze dimensional matching details"""
         spec_match = {"overall": "dimensional_analysis"}
@@ -0,0 +1,197 @@
+"""
+Shared in-memory snapshot of the parts catalog
+Loads the catalog's parts once per process and swaps in a fresh snapshot when
+the vector store files or the catalog database change
+"""
+
+import asyncio
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+import structlog
+
+from .local_vector_store import LocalPartsCatalogVectorStore
+
+logger = structlog.get_logger()
+
+# (mtime_ns, size) per collection file, plus the catalog database version
+Fingerprint = Tuple[Any, ...]
+
+
+@dataclass(frozen=True)
+class CatalogSnapshot:
+    """Parts as of one catalog version; shared by every caller, so treat as read-only"""
+    parts: Tuple[Dict[str, Any], ...]
+    fingerprint: Fingerprint
+    loaded_at: float = field(default_factory=time.time)
+    load_time: float = 0.0
+    _derived: Dict[str, Any] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _derived_lock: Any = field(default_factory=threading.Lock, init=False, repr=False, compare=False)
+
+    def __len__(self) -> int:
+        return len(self.parts)
+
+    def derived(self, name: str, factory: Callable[[Tuple[Dict[str, Any], ...]], Any]) -> Any:
+        """A structure built from ``parts`` (e.g. a search index), built once per snapshot
+
+        Dropped together with the snapshot, so it never outlives the catalog
+        version it was built from.
+        """
+        value = self._derived.get(name)
+        if value is None:
+            with self._derived_lock:
+                value = self._derived.get(name)
+                if value is None:
+                    start = time.time()
+                    value = factory(self.parts)
+                    self._derived[name] = value
+                    logger.info("Built catalog snapshot index", index=name, parts=len(self.parts),
+                                build_time_ms=round((time.time() - start) * 1000, 1))
+        return value
+
+
+class CatalogSnapshotService:
+    """Process-wide owner of the current CatalogSnapshot
+
+    ``get_snapshot`` returns the current snapshot without any I/O unless
+    ``check_interval`` seconds have passed since the last check; then a
+    worker thread compares a cheap fingerprint (file stats and the
+    database's catalog version) and, if it changed, loads a new snapshot.
+    Only the first load is waited for: while a check or reload runs, callers
+    keep getting the old snapshot until the new one is swapped in with a
+    single reference assignment.
+    """
+
+    def __init__(self, storage_dir: str = "data/vectors", check_interval: float = 2.0,
+                 catalog_version: Optional[Callable[[], Hashable]] = None):
+        self.vector_store = LocalPartsCatalogVectorStore(storage_dir)
+        self.check_interval = check_interval
+        self.catalog_version = catalog_version
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._next_check = 0.0
+        self._load_lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._refreshing = False
+        self.reload_count = 0
+
+    @property
+    def snapshot(self) -> Optional[CatalogSnapshot]:
+        """The snapshot most recently loaded, without checking for changes"""
+        return self._snapshot
+
+    def fingerprint(self) -> Fingerprint:
+        stats = []
+        for path in self.vector_store.collection_files(self.vector_store.collection_name):
+            try:
+                stat = os.stat(path)
+                stats.append((stat.st_mtime_ns, stat.st_size))
+            except FileNotFoundError:
+                stats.append(None)
+
+        if self.catalog_version is not None:
+            try:
+                stats.append(self.catalog_version())
+            except Exception as e:
+                logger.warning("Could not read catalog database version", error=str(e))
+                stats.append(None)
+        return tuple(stats)
+
+    def _is_current(self, snapshot: Optional[CatalogSnapshot]) -> bool:
+        if snapshot is None:
+            return False
+        if time.monotonic() < self._next_check:
+            return True
+        current = snapshot.fingerprint == self.fingerprint()
+        if current:
+            self._next_check = time.monotonic() + self.check_interval
+        return current
+
+    def refresh(self) -> CatalogSnapshot:
+        """Load a new snapshot if the catalog changed (blocking; one loader at a time)"""
+        with self._load_lock:
+            # Another caller may have reloaded while we waited
+            if self._is_current(self._snapshot):
+                return self._snapshot
+
+            start = time.time()
+            fingerprint = self.fingerprint()
+            parts = tuple(self.vector_store.read_all_parts())
+            snapshot = CatalogSnapshot(parts=parts, fingerprint=fingerprint,
+                                       load_time=time.time() - start)
+
+            self._snapshot = snapshot
+            self._next_check = time.monotonic() + self.check_interval
+            self.reload_count += 1
+            logger.info("Loaded catalog snapshot",
+                        parts=len(parts),
+                        load_time_ms=round(snapshot.load_time * 1000, 1))
+            return snapshot
+
+    def _background_refresh(self):
+        try:
+            self.refresh()
+        except Exception as e:
+            # Keep serving the old snapshot; retry after the next interval
+            self._next_check = time.monotonic() + self.check_interval
+            logger.error("Catalog snapshot reload failed", error=str(e))
+        finally:
+            self._refreshing = False
+
+    def _start_refresh(self, loop: asyncio.AbstractEventLoop):
+        """Start one background check (and reload if changed), unless one is already running"""
+        with self._refresh_lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        loop.run_in_executor(None, self._background_refresh)
+
+    async def get_snapshot(self) -> CatalogSnapshot:
+        """The current snapshot; a changed catalog is reloaded in the background
+
+        Waits for a load only when there is no snapshot yet.
+        """
+        snapshot = self._snapshot
+        loop = asyncio.get_running_loop()
+        if snapshot is None:
+            return await loop.run_in_executor(None, self.refresh)
+        if self._refreshing or time.monotonic() < self._next_check:
+            return snapshot
+        # The fingerprint stats files and queries the database: check off the loop
+        self._start_refresh(loop)
+        return snapshot
+
+    def get_stats(self) -> Dict[str, Any]:
+        snapshot = self._snapshot
+        return {
+            "parts": len(snapshot) if snapshot else 0,
+            "loaded_at": snapshot.loaded_at if snapshot else None,
+            "load_time": snapshot.load_time if snapshot else None,
+            "reload_count": self.reload_count,
+        }
+
+
+# Process-wide snapshot shared by every AgenticSearchTools instance
+_catalog_snapshot_service: Optional[CatalogSnapshotService] = None
+_catalog_snapshot_lock = threading.Lock()
+
+
+def _database_catalog_version() -> Hashable:
+    from ..database.connection_pool import get_secure_db_manager
+    return get_secure_db_manager().get_catalog_version()
+
+
+def get_catalog_snapshot_service() -> CatalogSnapshotService:
+    """Get the global catalog snapshot service, configured from CATALOG_SNAPSHOT_* env vars"""
+    global _catalog_snapshot_service
+    if _catalog_snapshot_service is None:
+        with _catalog_snapshot_lock:
+            if _catalog_snapshot_service is None:
+                _catalog_snapshot_service = CatalogSnapshotService(
+                    storage_dir=os.getenv("CATALOG_SNAPSHOT_VECTOR_DIR", "data/vectors"),
+                    check_interval=float(os.getenv("CATALOG_SNAPSHOT_CHECK_INTERVAL", "2.0")),
+                    catalog_version=_database_catalog_version
+                )
+    return _catalog_snapshot_service
@@ -0,0 +1,107 @@
+"""
+Numeric dimension index for tolerance searches
+Keeps each numeric specification (diameter, length, thickness, ...) as a sorted
+array of values with their part rows, so a tolerance window is a binary search
+instead of a pass over every part's specifications
+"""
+
+import math
+from dataclasses import dataclass
+from typing import Any, Dict, List, Mapping, Sequence
+
+import numpy as np
+
+# Specifications give these dimensions in the part's "units"; everything else is inches
+UNIT_DIMENSIONS = ("length",)
+INCHES_PER_UNIT = {"inches": 1.0, "feet": 12.0}
+
+
+def normalized_dimensions(specs: Mapping[str, Any]) -> Dict[str, float]:
+    """Numeric specifications of a part, with unit-bearing dimensions in inches"""
+    scale = INCHES_PER_UNIT.get(specs.get("units"), 1.0)
+    dimensions = {}
+    for name, value in specs.items():
+        if isinstance(value, (int, float)):
+            dimensions[name] = value * scale if name in UNIT_DIMENSIONS else value
+    return dimensions
+
+
+def usable_targets(target_dims: Mapping[str, Any]) -> Dict[str, float]:
+    """Targets a relative tolerance can be applied to (positive, finite numbers)"""
+    return {
+        name: value for name, value in target_dims.items()
+        if isinstance(value, (int, float)) and math.isfinite(value) and value > 0
+    }
+
+
+@dataclass
+class DimensionMatch:
+    """A part row with at least one target dimension within tolerance"""
+    row: int
+    score: float
+
+
+class DimensionIndex:
+    """Per-dimension sorted values over a parts sequence
+
+    A part's score is the fraction of the target dimensions it specifies that
+    fall within ``tolerance`` (relative to the target). Only parts inside at
+    least one dimension's window can score above zero, so those windows are
+    the only rows looked at; the rows found in every window are the ones
+    matching on all dimensions.
+    """
+
+    def __init__(self, parts: Sequence[Mapping[str, Any]]):
+        self.size = len(parts)
+        columns: Dict[str, List[float]] = {}
+        column_rows: Dict[str, List[int]] = {}
+        for row, part in enumerate(parts):
+            for name, value in normalized_dimensions(part.get("specifications") or {}).items():
+                columns.setdefault(name, []).append(value)
+                column_rows.setdefault(name, []).append(row)
+
+        self._values: Dict[str, np.ndarray] = {}
+        self._rows: Dict[str, np.ndarray] = {}
+        self._present: Dict[str, np.ndarray] = {}
+        for name, values in columns.items():
+            values = np.asarray(values, dtype=np.float64)
+            rows = np.asarray(column_rows[name], dtype=np.int64)
+            order = np.argsort(values, kind="stable")
+            self._values[name] = values[order]
+            self._rows[name] = rows[order]
+            present = np.zeros(self.size, dtype=bool)
+            present[rows] = True
+            self._present[name] = present
+
+    def window(self, name: str, target: float, tolerance: float) -> np.ndarray:
+        """Rows whose ``name`` is within ``tolerance`` of a positive ``target``"""
+        values = self._values.get(name)
+        if values is None:
+            return np.empty(0, dtype=np.int64)
+
+        # Widen the binary search slightly, then apply the exact deviation test
+        slack = target * 1e-9
+        lo = np.searchsorted(values, target - target * tolerance - slack, side="left")
+        hi = np.searchsorted(values, target + target * tolerance + slack, side="right")
+        in_tolerance = np.abs(values[lo:hi] - target) / target <= tolerance
+        return self._rows[name][lo:hi][in_tolerance]
+
+    def search(self, target_dims: Mapping[str, float], tolerance: float, limit: int) -> List[DimensionMatch]:
+        """Best ``limit`` rows by match score, ties in row order
+
+        ``target_dims`` should be positive numbers (see usable_targets).
+        """
+        windows = [self.window(name, target, tolerance) for name, target in target_dims.items()]
+        if not any(len(rows) for rows in windows):
+            return []
+
+        rows, matched = np.unique(np.concatenate(windows), return_counts=True)
+        specified = np.zeros(len(rows), dtype=np.int64)
+        for name in target_dims:
+            present = self._present.get(name)
+            if present is not None:
+                specified += present[rows]
+
+        scores = matched / specified
+        order = np.lexsort((rows, -scores))[:limit]
+        return [DimensionMatch(int(rows[i]), float(scores[i])) for i in order]
@@ -0,0 +1,183 @@
+"""
+Content-addressed embedding cache
+Keeps embeddings keyed by (model_name, dimensions, sha256(text)) in an
+in-process LRU backed by a local SQLite file
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import structlog
+
+logger = structlog.get_logger()
+
+CacheKey = Tuple[str, int, str]
+
+
+class EmbeddingCache:
+    """Two-tier embedding cache: in-memory LRU in front of an on-disk SQLite store"""
+
+    # SQLite limits the number of host parameters per statement
+    _LOOKUP_CHUNK = 500
+
+    def __init__(self, db_path: Optional[str] = "data/embedding_cache.db", max_memory_entries: int = 2048):
+        self.db_path = db_path
+        self.max_memory_entries = max_memory_entries
+        self._memory: "OrderedDict[CacheKey, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "writes": 0}
+
+        if db_path:
+            self._init_disk_store()
+
+    def _init_disk_store(self):
+        """Open the SQLite store, disabling the disk tier if it cannot be used"""
+        try:
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode = WAL")
+            self._conn.execute("PRAGMA synchronous = NORMAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS embedding_cache (
+                    model_name TEXT NOT NULL,
+                    dimensions INTEGER NOT NULL,
+                    text_hash TEXT NOT NULL,
+                    vector BLOB NOT NULL,
+                    created_at TEXT NOT NULL,
+                    PRIMARY KEY (model_name, dimensions, text_hash)
+                ) WITHOUT ROWID
+            """)
+            self._conn.commit()
+            logger.info("Initialized embedding cache", path=self.db_path)
+        except sqlite3.Error as e:
+            logger.warning("Embedding cache disk store unavailable, using memory only",
+                         path=self.db_path, error=str(e))
+            self._conn = None
+
+    @staticmethod
+    def text_hash(text: str) -> str:
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def get_many(self, model_name: str, dimensions: int,
+                 texts: List[str]) -> Dict[str, List[float]]:
+        """Return cached embeddings for the texts that have one, keyed by text"""
+
+        found: Dict[str, List[float]] = {}
+        disk_lookups: Dict[str, List[str]] = {}
+
+        with self._lock:
+            for text in texts:
+                if text in found:
+                    continue
+                key = (model_name, dimensions, self.text_hash(text))
+                vector = self._memory.get(key)
+                if vector is not None:
+                    self._memory.move_to_end(key)
+                    found[text] = vector.tolist()
+                    self._stats["memory_hits"] += 1
+                else:
+                    disk_lookups.setdefault(key[2], []).append(text)
+
+            if disk_lookups and self._conn is not None:
+                for digest, vector in self._read_disk(model_name, dimensions, list(disk_lookups)):
+                    self._remember((model_name, dimensions, digest), vector)
+                    for text in disk_lookups.pop(digest):
+                        found[text] = vector.tolist()
+                        self._stats["disk_hits"] += 1
+
+            self._stats["misses"] += sum(len(pending) for pending in disk_lookups.values())
+
+        return found
+
+    def put_many(self, model_name: str, dimensions: int,
+                 texts: List[str], vectors: List[List[float]]):
+        """Store embeddings for texts in both tiers"""
+
+        rows = []
+        created_at = datetime.now().isoformat()
+
+        with self._lock:
+            for text, vector in zip(texts, vectors):
+                array = np.asarray(vector, dtype=np.float32)
+                digest = self.text_hash(text)
+                self._remember((model_name, dimensions, digest), array)
+                rows.append((model_name, dimensions, digest, array.tobytes(), created_at))
+
+            if rows and self._conn is not None:
+                try:
+                    self._conn.executemany(
+                        "INSERT OR REPLACE INTO embedding_cache "
+                        "(model_name, dimensions, text_hash, vector, created_at) VALUES (?, ?, ?, ?, ?)",
+                        rows
+                    )
+                    self._conn.commit()
+                except sqlite3.Error as e:
+                    logger.warning("Failed to persist embeddings to cache", error=str(e))
+
+            self._stats["writes"] += len(rows)
+
+    def _read_disk(self, model_name: str, dimensions: int, digests: List[str]):
+        """Yield (digest, vector) pairs found in the SQLite store"""
+        try:
+            for i in range(0, len(digests), self._LOOKUP_CHUNK):
+                chunk = digests[i:i + self._LOOKUP_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                cursor = self._conn.execute(
+                    f"SELECT text_hash, vector FROM embedding_cache "
+                    f"WHERE model_name = ? AND dimensions = ? AND text_hash IN ({placeholders})",
+                    (model_name, dimensions, *chunk)
+                )
+                for digest, blob in cursor:
+                    yield digest, np.frombuffer(blob, dtype=np.float32)
+        except sqlite3.Error as e:
+            logger.warning("Embedding cache lookup failed", error=str(e))
+
+    def _remember(self, key: CacheKey, vector: np.ndarray):
+        """Insert into the LRU tier, evicting the least recently used entry when full"""
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def get_stats(self) -> Dict[str, float]:
+        """Hit/miss counters for the cache"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["memory_entries"] = len(self._memory)
+        lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_rate"] = (stats["memory_hits"] + stats["disk_hits"]) / lookups if lookups else 0.0
+        return stats
+
+    def clear_memory(self):
+        """Drop the in-memory tier; the disk store is left intact"""
+        with self._lock:
+            self._memory.clear()
+
+
+# Process-wide cache shared by every EmbeddingService instance
+_embedding_cache: Optional[EmbeddingCache] = None
+_embedding_cache_lock = threading.Lock()
+
+
+def get_embedding_cache() -> EmbeddingCache:
+    """Get the global embedding cache, configured from EMBEDDING_CACHE_* env vars
+
+    Set EMBEDDING_CACHE_PATH to an empty string to keep the cache in memory only.
+    """
+    global _embedding_cache
+    if _embedding_cache is None:
+        with _embedding_cache_lock:
+            if _embedding_cache is None:
+                _embedding_cache = EmbeddingCache(
+                    db_path=os.getenv("EMBEDDING_CACHE_PATH", "data/embedding_cache.db") or None,
+                    max_memory_entries=int(os.getenv("EMBEDDING_CACHE_MEMORY_ENTRIES", "2048"))
+                )
+    return _embedding_cache
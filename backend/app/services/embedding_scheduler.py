@@ -0,0 +1,162 @@
+"""
+Rate-limit-aware scheduler for embedding API batches
+Runs several batches concurrently under request-per-minute and
+token-per-minute budgets, retrying failed batches with jittered
+exponential backoff
+"""
+
+import asyncio
+import os
+import random
+import time
+from typing import Any, Awaitable, Callable, List, Optional
+
+import structlog
+
+logger = structlog.get_logger()
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at ``rate_per_minute``
+
+    Callers run on one event loop, so check-and-take happens without
+    awaiting and needs no lock.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None):
+        self.rate_per_second = rate_per_minute / 60.0
+        self.capacity = capacity or rate_per_minute
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate_per_second)
+        self._updated = now
+
+    async def acquire(self, amount: float = 1.0):
+        """Wait until ``amount`` tokens are available and take them"""
+        # A single request larger than the bucket would otherwise wait forever
+        amount = min(amount, self.capacity)
+        while True:
+            self._refill()
+            if self._tokens >= amount:
+                self._tokens -= amount
+                return
+            await asyncio.sleep((amount - self._tokens) / self.rate_per_second)
+
+
+class EmbeddingBatchError(Exception):
+    """Raised when a batch still fails after all retries"""
+
+
+class EmbeddingBatchScheduler:
+    """Runs embedding batches concurrently within the provider's rate limits"""
+
+    def __init__(self, max_concurrency: int = 4,
+                 requests_per_minute: float = 3000,
+                 tokens_per_minute: float = 1_000_000,
+                 max_retries: int = 5,
+                 base_delay: float = 0.5,
+                 max_delay: float = 30.0):
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.request_bucket = TokenBucket(requests_per_minute)
+        self.token_bucket = TokenBucket(tokens_per_minute)
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @staticmethod
+    def estimate_tokens(texts: List[str]) -> int:
+        """Rough token count (~4 characters per token) without a tokenizer dependency"""
+        return sum(len(text) // 4 + 1 for text in texts)
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        # Semaphores bind to an event loop; rebuild if a new loop is running (CLI, tests)
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._loop = loop
+        return self._semaphore
+
+    async def run(self, batches: List[List[str]],
+                  call: Callable[[List[str]], Awaitable[List[Any]]],
+                  is_retryable: Callable[[Exception], bool] = lambda e: True) -> List[List[Any]]:
+        """Run ``call`` for every batch and return the results in batch order
+
+        If any batch exhausts its retries the remaining batches are
+        cancelled and EmbeddingBatchError is raised, so callers never get a
+        partial result.
+        """
+        semaphore = self._get_semaphore()
+        tasks = [
+            asyncio.create_task(self._run_batch(batch_num, batch, call, is_retryable, semaphore))
+            for batch_num, batch in enumerate(batches)
+        ]
+
+        try:
+            return await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+    async def _run_batch(self, batch_num: int, batch: List[str],
+                         call: Callable[[List[str]], Awaitable[List[Any]]],
+                         is_retryable: Callable[[Exception], bool],
+                         semaphore: asyncio.Semaphore) -> List[Any]:
+        estimated_tokens = self.estimate_tokens(batch)
+
+        for attempt in range(self.max_retries + 1):
+            await self.request_bucket.acquire(1)
+            await self.token_bucket.acquire(estimated_tokens)
+
+            try:
+                async with semaphore:
+                    result = await call(batch)
+
+                logger.debug("Embedding batch completed",
+                           batch_num=batch_num + 1,
+                           batch_size=len(batch),
+                           attempt=attempt + 1)
+                return result
+
+            except Exception as e:
+                if attempt >= self.max_retries or not is_retryable(e):
+                    logger.error("Embedding batch failed",
+                               batch_num=batch_num + 1,
+                               batch_size=len(batch),
+                               attempts=attempt + 1,
+                               error=str(e))
+                    raise EmbeddingBatchError(
+                        f"Batch {batch_num + 1} failed after {attempt + 1} attempts: {e}"
+                    ) from e
+
+                # Full jitter: sleep uniformly in [0, min(cap, base * 2^attempt)]
+                delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+                logger.warning("Embedding batch failed, retrying",
+                             batch_num=batch_num + 1,
+                             attempt=attempt + 1,
+                             retry_in=round(delay, 2),
+                             error=str(e))
+                await asyncio.sleep(delay)
+
+
+# Process-wide scheduler so every EmbeddingService shares one rate budget
+_embedding_scheduler: Optional[EmbeddingBatchScheduler] = None
+
+
+def get_embedding_scheduler() -> EmbeddingBatchScheduler:
+    """Get the global embedding scheduler, configured from EMBEDDING_* env vars"""
+    global _embedding_scheduler
+    if _embedding_scheduler is None:
+        _embedding_scheduler = EmbeddingBatchScheduler(
+            max_concurrency=int(os.getenv("EMBEDDING_MAX_CONCURRENCY", "4")),
+            requests_per_minute=float(os.getenv("EMBEDDING_REQUESTS_PER_MINUTE", "3000")),
+            tokens_per_minute=float(os.getenv("EMBEDDING_TOKENS_PER_MINUTE", "1000000")),
+            max_retries=int(os.getenv("EMBEDDING_MAX_RETRIES", "5"))
+        )
+    return _embedding_scheduler
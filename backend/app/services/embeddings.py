@@ -1,4 +1,5 @@
 import os
+import hashlib
 from typing import List, Dict, Any, Optional
 import asyncio
 import structlog
@@ -6,13 +7,20 @@ import numpy as np
 import openai
 from openai import AsyncOpenAI
 
+from .embedding_cache import EmbeddingCache, get_embedding_cache
+from .vector_math import MatrixLike, cosine_similarity_matrix, top_k_indices, top_k_indices_2d
+from .embedding_scheduler import EmbeddingBatchError, EmbeddingBatchScheduler, get_embedding_scheduler
+
 logger = structlog.get_logger()
 
 class EmbeddingService:
     """Service for generating vector embeddings using multiple providers"""
     
-    def __init__(self):
+    def __init__(self, cache: Optional[EmbeddingCache] = None,
+                 scheduler: Optional[EmbeddingBatchScheduler] = None):
         self.provider = os.getenv('EMBEDDING_PROVIDER', 'openai').lower()
+        self.cache = cache or get_embedding_cache()
+        self.scheduler = scheduler or get_embedding_scheduler()
         
         if self.provider == 'vertex':
             self._init_vertex_ai()
@@ -35,8 +43,10 @@ class EmbeddingService:
             raise ValueError("GOOGLE_CLOUD_PROJECT environment variable required for Vertex AI")
         
         aiplatform.init(project=project_id, location=location)
+        self._vertex_model = None
         self.model_name = "textembedding-gecko@003"
         self.dimensions = 768
+        self.max_batch_size = 250  # Vertex AI instances per request
         
         logger.info("Initialized Vertex AI embeddings", model=self.model_name)
     
@@ -53,125 +63,128 @@ class EmbeddingService:
             self.model_name = "text-embedding-3-large"  # Keep using the embedding model
             self.dimensions = 3072
             logger.info("Initialized OpenAI embeddings", model=self.model_name)
+        
+        self.max_batch_size = 2048  # OpenAI inputs per embeddings request
     
     async def generate_embeddings(self, texts: List[str], 
                                  batch_size: int = 100) -> List[List[float]]:
-        """Generate embeddings for a list of texts"""
+        """Generate embeddings for a list of texts, serving repeats from the cache"""
         
         if not texts:
             return []
         
+        if self._uses_mock_embeddings():
+            logger.warning("Using fallback embeddings - no OpenAI API key")
+            return self._generate_mock_embeddings(texts)
+        
+        cached = self.cache.get_many(self.model_name, self.dimensions, texts)
+        missing = list(dict.fromkeys(text for text in texts if text not in cached))
+        
         logger.info("Generating embeddings", 
                    count=len(texts), 
+                   cache_hits=len(texts) - sum(1 for text in texts if text not in cached),
+                   to_generate=len(missing),
                    provider=self.provider,
                    model=self.model_name)
         
-        try:
-            if self.provider == 'vertex':
-                return await self._generate_vertex_embeddings(texts, batch_size)
-            elif self.provider == 'openai':
-                return await self._generate_openai_embeddings(texts, batch_size)
-        except Exception as e:
-            logger.error("Failed to generate embeddings", error=str(e))
-            raise
-    
-    async def _generate_vertex_embeddings(self, texts: List[str], 
-                                        batch_size: int) -> List[List[float]]:
-        """Generate embeddings using Vertex AI"""
+        if missing:
+            batches = [missing[i:i + batch_size] for i in range(0, len(missing), batch_size)]
+            try:
+                results = await self.scheduler.run(
+                    batches, self._embed_and_cache_batch, self._is_retryable
+                )
+            except EmbeddingBatchError as e:
+                # Never substitute mock vectors for real ones: the caller gets an error instead
+                logger.error("Failed to generate embeddings", error=str(e))
+                raise
+            
+            for batch, vectors in zip(batches, results):
+                cached.update(zip(batch, vectors))
         
-        from vertexai.language_models import TextEmbeddingModel
+        return [cached[text] for text in texts]
+    
+    def _uses_mock_embeddings(self) -> bool:
+        return self.provider == 'openai' and self.client is None
+    
+    def cache_stats(self) -> Dict[str, float]:
+        """Hit/miss counters for the shared embedding cache"""
+        return self.cache.get_stats()
+    
+    def _is_retryable(self, error: Exception) -> bool:
+        """Client errors (bad input, auth) will not succeed on retry"""
+        non_retryable = (
+            openai.BadRequestError,
+            openai.AuthenticationError,
+            openai.PermissionDeniedError,
+            openai.NotFoundError,
+        )
+        return not isinstance(error, non_retryable)
+    
+    async def _embed_and_cache_batch(self, batch: List[str]) -> List[List[float]]:
+        """Embed one batch with the configured provider and cache it as soon as it lands"""
         
-        model = TextEmbeddingModel.from_pretrained(self.model_name)
-        all_embeddings = []
+        if self.provider == 'vertex':
+            vectors = await self._embed_vertex_batch(batch)
+        else:
+            vectors = await self._embed_openai_batch(batch)
         
-        # Process in batches
-        for i in range(0, len(texts), batch_size):
-            batch = texts[i:i + batch_size]
-            
-            try:
-                # Vertex AI batch embedding
-                embeddings = model.get_embeddings(batch)
-                batch_vectors = [emb.values for emb in embeddings]
-                all_embeddings.extend(batch_vectors)
-                
-                logger.debug("Generated Vertex AI batch", 
-                           batch_size=len(batch),
-                           batch_num=i//batch_size + 1)
-                
-                # Rate limiting
-                await asyncio.sleep(0.1)
-                
-            except Exception as e:
-                logger.error("Vertex AI batch failed", 
-                           batch_start=i, 
-                           batch_size=len(batch),
-                           error=str(e))
-                raise
+        if len(vectors) != len(batch):
+            raise ValueError(f"Provider returned {len(vectors)} embeddings for {len(batch)} texts")
         
-        return all_embeddings
+        self.cache.put_many(self.model_name, self.dimensions, batch, vectors)
+        return vectors
     
-    async def _generate_openai_embeddings(self, texts: List[str], 
-                                        batch_size: int) -> List[List[float]]:
-        """Generate embeddings using OpenAI"""
+    async def _embed_vertex_batch(self, batch: List[str]) -> List[List[float]]:
+        """Generate one batch of embeddings using Vertex AI"""
         
-        # Fallback to mock embeddings if no API key
-        if self.client is None:
-            logger.warning("Using fallback embeddings - no OpenAI API key")
-            return self._generate_mock_embeddings(texts)
+        from vertexai.language_models import TextEmbeddingModel
         
-        all_embeddings = []
+        if self._vertex_model is None:
+            self._vertex_model = TextEmbeddingModel.from_pretrained(self.model_name)
         
-        # Process in batches
-        for i in range(0, len(texts), batch_size):
-            batch = texts[i:i + batch_size]
-            
-            try:
-                response = await self.client.embeddings.create(
-                    model=self.model_name,
-                    input=batch,
-                    encoding_format="float"
-                )
-                
-                batch_vectors = [data.embedding for data in response.data]
-                all_embeddings.extend(batch_vectors)
-                
-                logger.debug("Generated OpenAI batch", 
-                           batch_size=len(batch),
-                           batch_num=i//batch_size + 1)
-                
-                # Rate limiting
-                await asyncio.sleep(0.1)
-                
-            except Exception as e:
-                logger.error("OpenAI batch failed", 
-                           batch_start=i, 
-                           batch_size=len(batch),
-                           error=str(e))
-                # Fallback to mock embeddings on error
-                logger.warning("Falling back to mock embeddings due to API error")
-                return self._generate_mock_embeddings(texts)
-        
-        return all_embeddings
+        # The Vertex SDK call is blocking; keep it off the event loop
+        embeddings = await asyncio.to_thread(self._vertex_model.get_embeddings, batch)
+        return [emb.values for emb in embeddings]
+    
+    async def _embed_openai_batch(self, batch: List[str]) -> List[List[float]]:
+        """Generate one batch of embeddings using OpenAI"""
+        
+        response = await self.client.embeddings.create(
+            model=self.model_name,
+            input=batch,
+            encoding_format="float"
+        )
+        
+        # The API documents order preservation; sort by index to be safe
+        return [data.embedding for data in sorted(response.data, key=lambda d: d.index)]
     
     def _generate_mock_embeddings(self, texts: List[str]) -> List[List[float]]:
         """Generate mock embeddings when API is unavailable"""
-        import hashlib
-        import random
-        
-        embeddings = []
         
-        for text in texts:
-            # Generate deterministic "embedding" based on text hash
-            text_hash = hashlib.md5(text.encode()).hexdigest()
-            random.seed(int(text_hash[:8], 16))  # Use first 8 chars as seed
-            
-            # Generate random vector with consistent seed
-            embedding = [random.uniform(-1, 1) for _ in range(self.dimensions)]
-            embeddings.append(embedding)
+        embeddings = self.generate_mock_embedding_matrix(texts).tolist()
         
         logger.debug("Generated mock embeddings", count=len(texts))
         return embeddings
     
+    def generate_mock_embedding_matrix(self, texts: List[str]) -> np.ndarray:
+        """Deterministic mock embeddings as an (n, dimensions) float32 matrix
+        
+        Each row comes from its own ``np.random.Generator`` seeded from the
+        text's hash, so a text always maps to the same vector regardless of
+        batch composition, and Python's global ``random`` state is untouched.
+        """
+        
+        matrix = np.empty((len(texts), self.dimensions), dtype=np.float32)
+        
+        for row, text in enumerate(texts):
+            seed = int.from_bytes(hashlib.md5(text.encode()).digest(), "little")
+            np.random.default_rng(seed).random(dtype=np.float32, out=matrix[row])
+        
+        # Scale [0, 1) to [-1, 1) for the whole batch at once
+        matrix *= 2.0
+        matrix -= 1.0
+        return matrix
+    
     async def generate_single_embedding(self, text: str) -> List[float]:
         """Generate embedding for a single text"""
         embeddings = await self.generate_embeddings([text])
@@ -193,23 +206,53 @@ class EmbeddingService:
         return float(np.dot(v1, v2) / (norm1 * norm2))
     
     def find_most_similar(self, query_embedding: List[float], 
-                         candidate_embeddings: List[List[float]], 
+                         candidate_embeddings: MatrixLike, 
                          top_k: int = 5) -> List[Dict[str, Any]]:
-        """Find most similar embeddings to query"""
+        """Find most similar embeddings to query
         
-        similarities = []
+        Scores the query against the whole (N, D) candidate matrix in one
+        product and selects the top_k with argpartition.
+        """
         
-        for i, candidate in enumerate(candidate_embeddings):
-            similarity = self.cosine_similarity(query_embedding, candidate)
-            similarities.append({
-                'index': i,
-                'similarity': similarity
-            })
+        if len(candidate_embeddings) == 0:
+            return []
         
-        # Sort by similarity (descending)
-        similarities.sort(key=lambda x: x['similarity'], reverse=True)
+        similarities = cosine_similarity_matrix(query_embedding, candidate_embeddings)[0]
         
-        return similarities[:top_k]
+        return [
+            {'index': int(i), 'similarity': float(similarities[i])}
+            for i in top_k_indices(similarities, top_k)
+        ]
+    
+    def find_most_similar_batch(self, query_embeddings: MatrixLike,
+                                candidate_embeddings: MatrixLike,
+                                top_k: int = 5) -> List[List[Dict[str, Any]]]:
+        """Top_k most similar candidates for each of M queries in a single GEMM
+        
+        Returns one ranked list per query, in query order, using the same
+        ``{'index', 'similarity'}`` entries as ``find_most_similar``.
+        """
+        
+        if len(query_embeddings) == 0:
+            return []
+        if len(candidate_embeddings) == 0:
+            return [[] for _ in range(len(query_embeddings))]
+        
+        similarities = cosine_similarity_matrix(query_embeddings, candidate_embeddings)
+        top_indices = top_k_indices_2d(similarities, top_k)
+        
+        return [
+            [
+                {'index': int(i), 'similarity': float(row_scores[i])}
+                for i in row_indices
+            ]
+            for row_scores, row_indices in zip(similarities, top_indices)
+        ]
+    
+    def cosine_similarity_matrix(self, query_embeddings: MatrixLike,
+                                 candidate_embeddings: MatrixLike) -> np.ndarray:
+        """(M, N) cosine similarity matrix between queries and candidates"""
+        return cosine_similarity_matrix(query_embeddings, candidate_embeddings)
 
 
 class PartEmbeddingService:
@@ -218,8 +261,8 @@ class PartEmbeddingService:
     def __init__(self):
         self.embedding_service = EmbeddingService()
     
-    async def create_part_embedding(self, part_data: Dict[str, Any]) -> List[float]:
-        """Create embedding for a part using multiple fields"""
+    def build_part_text(self, part_data: Dict[str, Any]) -> str:
+        """Combine multiple part fields into the text that gets embedded"""
         
         # Combine multiple fields for richer embedding
         text_components = []
@@ -247,10 +290,24 @@ class PartEmbeddingService:
             text_components.append(f"Category: {part_data['category']}")
         
         # Combine all components
-        combined_text = " | ".join(text_components)
+        return " | ".join(text_components)
+    
+    async def create_part_embedding(self, part_data: Dict[str, Any]) -> List[float]:
+        """Create embedding for a part using multiple fields"""
+        
+        combined_text = self.build_part_text(part_data)
         
         return await self.embedding_service.generate_single_embedding(combined_text)
     
+    async def create_part_embeddings(self, parts: List[Dict[str, Any]]) -> List[List[float]]:
+        """Create embeddings for many parts in provider-sized batches"""
+        
+        texts = [self.build_part_text(part) for part in parts]
+        
+        return await self.embedding_service.generate_embeddings(
+            texts, batch_size=self.embedding_service.max_batch_size
+        )
+    
     async def create_query_embedding(self, query_text: str, 
                                    context: Optional[Dict[str, Any]] = None) -> List[float]:
         """Create embedding for search query with optional context"""
@@ -0,0 +1,189 @@
+"""
+Trigram-indexed fuzzy text search
+Scores fuzzywuzzy's ``partial_ratio(term, text)`` like a full scan, but visits
+candidates in order of a trigram-derived upper bound on their score and stops
+once no remaining candidate can reach the top results
+"""
+
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from difflib import SequenceMatcher
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+try:
+    from fuzzywuzzy import fuzz as fuzzywuzzy_fuzz
+    FUZZYWUZZY_AVAILABLE = True
+except ImportError:
+    fuzzywuzzy_fuzz = None
+    FUZZYWUZZY_AVAILABLE = False
+
+try:
+    from rapidfuzz import fuzz as rapidfuzz_fuzz, process
+    RAPIDFUZZ_AVAILABLE = True
+except ImportError:
+    rapidfuzz_fuzz = process = None
+    RAPIDFUZZ_AVAILABLE = False
+
+GRAM = 3
+
+# rapidfuzz aligns terms up to this long optimally (longer ones use a heuristic)
+RAPIDFUZZ_EXACT_LENGTH = 64
+
+
+def partial_ratio(term: str, text: str) -> int:
+    """fuzzywuzzy's partial_ratio, the score fuzzy search has always used
+
+    Without fuzzywuzzy this is its difflib implementation, line for line.
+    """
+    if FUZZYWUZZY_AVAILABLE:
+        return fuzzywuzzy_fuzz.partial_ratio(term, text)
+
+    if term == text:
+        return 100
+    if not term or not text:
+        return 0
+    shorter, longer = (term, text) if len(term) <= len(text) else (text, term)
+
+    scores = []
+    for short_start, long_start, _ in SequenceMatcher(None, shorter, longer).get_matching_blocks():
+        start = max(long_start - short_start, 0)
+        ratio = SequenceMatcher(None, shorter, longer[start:start + len(shorter)]).ratio()
+        if ratio > .995:
+            return 100
+        scores.append(ratio)
+    return int(round(100 * max(scores)))
+
+
+@dataclass
+class FuzzyMatch:
+    """A row scoring at least the threshold, with the first term reaching its best score"""
+    row: int
+    score: int
+    term_index: int
+
+
+def _trigrams(text: str) -> List[str]:
+    return [text[i:i + GRAM] for i in range(len(text) - GRAM + 1)]
+
+
+class FuzzyTextIndex:
+    """Lower-cased texts plus trigram postings for fuzzy search
+
+    Bound: in any alignment of a term of length m against a text window, a
+    term trigram lying inside one matching block also occurs in the text.
+    Every unmatched term character breaks at most 3 trigrams and every gap
+    in the window at most 2, and there are at most m - M of each (M matched
+    characters), so a text sharing s of the term's m - 2 trigram positions
+    has M <= m - ceil((m - 2 - s) / 5). As partial_ratio is 200 * M / (m + w)
+    for a window of w >= M characters, that caps the row's score whatever
+    window and matching blocks the scorer picks.
+
+    rapidfuzz's partial_ratio (for terms up to RAPIDFUZZ_EXACT_LENGTH) is the
+    same ratio over the best window and an optimal alignment, so it is never
+    below partial_ratio's; it only shortlists the rows worth scoring.
+    """
+
+    def __init__(self, texts: Sequence[str]):
+        self.texts = [text.lower() for text in texts]
+        self.lengths = np.fromiter((len(text) for text in self.texts), dtype=np.int64,
+                                   count=len(self.texts))
+
+        postings: Dict[str, List[int]] = defaultdict(list)
+        for row, text in enumerate(self.texts):
+            for gram in set(_trigrams(text)):
+                postings[gram].append(row)
+        self._postings = {gram: np.asarray(rows, dtype=np.int64) for gram, rows in postings.items()}
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def upper_bounds(self, term: str) -> np.ndarray:
+        """Highest (rounded) partial_ratio each row could score for ``term``"""
+        m = len(term)
+        bounds = np.full(len(self.texts), 100.0)
+        if m < GRAM:
+            return bounds
+
+        shared = np.zeros(len(self.texts), dtype=np.int64)
+        for gram, count in Counter(_trigrams(term)).items():
+            rows = self._postings.get(gram)
+            if rows is not None:
+                shared[rows] += count
+
+        lost = np.maximum(0, (m - GRAM + 1) - shared)
+        matched = m - np.ceil(lost / 5.0)
+        # ceil rather than round: a score equal to the bound may differ in the last bit
+        bounds = np.ceil(200.0 * matched / (m + matched))
+        # partial_ratio aligns the shorter string inside the longer one
+        bounds[self.lengths < m] = 100.0
+        return bounds
+
+    def _score(self, terms: List[str], rows: np.ndarray, threshold: int) -> np.ndarray:
+        """(len(terms), len(rows)) partial_ratio scores; 0 where a score is certainly below threshold"""
+        scores = np.zeros((len(terms), len(rows)), dtype=np.int64)
+        choices = [self.texts[row] for row in rows]
+        for term_index, term in enumerate(terms):
+            if RAPIDFUZZ_AVAILABLE and len(term) <= RAPIDFUZZ_EXACT_LENGTH:
+                # partial_ratio rounds half to even, so 69.5 can still score 70
+                bounds = process.cdist([term], choices, scorer=rapidfuzz_fuzz.partial_ratio,
+                                       score_cutoff=max(threshold - 0.5 - 1e-6, 0), workers=-1)[0]
+                candidates = np.flatnonzero(bounds > 0) if threshold > 0 else range(len(choices))
+            else:
+                candidates = range(len(choices))
+            for column in candidates:
+                scores[term_index, column] = partial_ratio(term, choices[column])
+        return scores
+
+    def search(self, terms: Sequence[str], threshold: int, limit: int,
+               row_filter: Optional[Callable[[int], bool]] = None) -> List[FuzzyMatch]:
+        """Best ``limit`` rows whose best term score is >= threshold
+
+        Same result as scoring every (allowed) row and stable-sorting by score:
+        ties keep row order, and a row's term is the first reaching its score.
+        """
+        terms = [term.lower() for term in terms]
+        if not terms or not self.texts:
+            return []
+
+        bounds = np.max([self.upper_bounds(term) for term in terms], axis=0)
+        candidates = np.flatnonzero(bounds >= threshold)
+        # Highest bound first; rows with equal bounds are scored together
+        candidates = candidates[np.argsort(-bounds[candidates], kind='stable')]
+        candidate_bounds = bounds[candidates]
+
+        # Best ``limit`` (row, score, term) so far, ordered by (-score, row)
+        top_rows = np.empty(0, dtype=np.int64)
+        top_scores = np.empty(0, dtype=np.int64)
+        top_terms = np.empty(0, dtype=np.int64)
+
+        start = 0
+        while start < len(candidates):
+            bound = candidate_bounds[start]
+            # Nothing left can beat (or tie with) the current last place
+            if len(top_rows) >= limit and bound < top_scores[-1]:
+                break
+
+            end = start + int(np.searchsorted(-candidate_bounds[start:], -bound, side='right'))
+            rows = candidates[start:end]
+            start = end
+
+            if row_filter is not None:
+                rows = rows[np.fromiter((row_filter(int(row)) for row in rows), dtype=bool, count=len(rows))]
+                if rows.size == 0:
+                    continue
+
+            scores = self._score(terms, rows, threshold)
+            best_terms = np.argmax(scores, axis=0)
+            best_scores = scores[best_terms, np.arange(len(rows))]
+            keep = best_scores >= threshold
+
+            top_rows = np.concatenate([top_rows, rows[keep]])
+            top_scores = np.concatenate([top_scores, best_scores[keep]])
+            top_terms = np.concatenate([top_terms, best_terms[keep]])
+            order = np.lexsort((top_rows, -top_scores))[:limit]
+            top_rows, top_scores, top_terms = top_rows[order], top_scores[order], top_terms[order]
+
+        return [FuzzyMatch(int(row), int(score), int(term_index))
+                for row, score, term_index in zip(top_rows, top_scores, top_terms)]
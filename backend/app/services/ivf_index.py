@@ -0,0 +1,212 @@
+"""
+Inverted-file (IVF) approximate nearest-neighbour index in pure NumPy
+Rows are clustered with spherical k-means; a query scores only the rows in
+the ``n_probe`` clusters whose centroids are closest to it
+"""
+
+from pathlib import Path
+from typing import Optional, Tuple
+
+import numpy as np
+import structlog
+
+from .vector_math import as_normalized_matrix, normalize_rows, top_k_indices
+
+logger = structlog.get_logger()
+
+
+class IVFIndex:
+    """IVF index over an externally owned, L2-normalized row matrix
+
+    The index stores only centroids and one list assignment per row; the
+    vectors themselves stay in the collection matrix (often memory-mapped).
+
+    Recall/latency knobs:
+        n_lists: number of k-means clusters (default ~4 * sqrt(rows))
+        n_probe: clusters scanned per query; higher means better recall
+    """
+
+    # Rows scored per GEMM when assigning large matrices to lists
+    _ASSIGN_CHUNK = 65536
+
+    def __init__(self, n_lists: Optional[int] = None, n_probe: int = 8,
+                 kmeans_iterations: int = 20, max_training_points_per_list: int = 256,
+                 seed: int = 0):
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+        self.kmeans_iterations = kmeans_iterations
+        self.max_training_points_per_list = max_training_points_per_list
+        self.seed = seed
+
+        self.centroids: Optional[np.ndarray] = None
+        self._assignments = np.empty(0, dtype=np.int32)
+        self._size = 0
+
+        # Inverted lists derived from assignments, rebuilt lazily after inserts
+        self._list_rows: Optional[np.ndarray] = None
+        self._list_offsets: Optional[np.ndarray] = None
+
+    @property
+    def size(self) -> int:
+        """Number of collection rows covered by the index"""
+        return self._size
+
+    @property
+    def is_trained(self) -> bool:
+        return self.centroids is not None
+
+    @property
+    def dimensions(self) -> int:
+        return int(self.centroids.shape[1]) if self.centroids is not None else 0
+
+    def expected_scan_size(self, n_probe: Optional[int] = None) -> float:
+        """Average number of rows a query scores at the given ``n_probe``"""
+        if not self.n_lists:
+            return float(self._size)
+        return self._size * min(n_probe or self.n_probe, self.n_lists) / self.n_lists
+
+    def train(self, matrix: np.ndarray):
+        """Learn centroids with spherical k-means and assign every row"""
+
+        rows = matrix.shape[0]
+        if rows == 0:
+            raise ValueError("Cannot train an IVF index on an empty matrix")
+
+        n_lists = min(self.n_lists or max(1, int(4 * np.sqrt(rows))), rows)
+        rng = np.random.default_rng(self.seed)
+
+        sample_size = min(rows, n_lists * self.max_training_points_per_list)
+        sample_rows = np.sort(rng.choice(rows, size=sample_size, replace=False))
+        sample = np.asarray(matrix[sample_rows], dtype=np.float32)
+
+        centroids = sample[rng.choice(sample_size, size=n_lists, replace=False)].copy()
+
+        for _ in range(self.kmeans_iterations):
+            assignments = np.argmax(sample @ centroids.T, axis=1)
+            counts = np.bincount(assignments, minlength=n_lists)
+
+            order = np.argsort(assignments, kind="stable")
+            starts = np.searchsorted(assignments[order], np.arange(n_lists))
+            non_empty = counts > 0
+            sums = np.zeros_like(centroids)
+            sums[non_empty] = np.add.reduceat(sample[order], starts[non_empty], axis=0)
+
+            # Reseed empty clusters from random sample points
+            empty = np.flatnonzero(~non_empty)
+            if empty.size:
+                sums[empty] = sample[rng.choice(sample_size, size=empty.size, replace=False)]
+
+            centroids = normalize_rows(sums)
+
+        self.n_lists = n_lists
+        self.centroids = centroids
+        self.reassign(matrix)
+
+        logger.info("Trained IVF index",
+                   rows=rows,
+                   n_lists=n_lists,
+                   training_points=sample_size)
+
+    def assign_rows(self, matrix: np.ndarray, rows: np.ndarray):
+        """Incrementally (re)assign the given rows of ``matrix`` to their nearest list"""
+
+        if not self.is_trained:
+            raise ValueError("IVF index must be trained before rows can be added")
+
+        rows = np.asarray(rows, dtype=np.int64)
+        if rows.size == 0:
+            return
+
+        new_size = max(self._size, int(rows.max()) + 1)
+        if new_size > self._assignments.shape[0]:
+            grown = np.full(max(new_size, 2 * self._assignments.shape[0]), -1, dtype=np.int32)
+            grown[:self._size] = self._assignments[:self._size]
+            self._assignments = grown
+
+        for i in range(0, rows.size, self._ASSIGN_CHUNK):
+            chunk = rows[i:i + self._ASSIGN_CHUNK]
+            vectors = np.asarray(matrix[chunk], dtype=np.float32)
+            self._assignments[chunk] = np.argmax(vectors @ self.centroids.T, axis=1)
+
+        self._size = new_size
+        self._list_rows = None
+        self._list_offsets = None
+
+    def reassign(self, matrix: np.ndarray):
+        """Reassign every row of a rewritten matrix, keeping the trained centroids"""
+        self._assignments = np.empty(0, dtype=np.int32)
+        self._size = 0
+        self.assign_rows(matrix, np.arange(matrix.shape[0]))
+
+    def sync(self, matrix: np.ndarray):
+        """Assign any rows appended to ``matrix`` since the index last saw it"""
+        if matrix.shape[0] > self._size:
+            self.assign_rows(matrix, np.arange(self._size, matrix.shape[0]))
+
+    def _build_lists(self):
+        assignments = self._assignments[:self._size]
+        self._list_rows = np.argsort(assignments, kind="stable")
+        self._list_offsets = np.searchsorted(
+            assignments[self._list_rows], np.arange(self.n_lists + 1)
+        )
+
+    def candidate_rows(self, query: np.ndarray, n_probe: Optional[int] = None) -> np.ndarray:
+        """Sorted row ids in the ``n_probe`` lists closest to a normalized query"""
+
+        if self._list_rows is None:
+            self._build_lists()
+
+        probe_lists = top_k_indices(self.centroids @ query, n_probe or self.n_probe)
+        rows = np.concatenate([
+            self._list_rows[self._list_offsets[lst]:self._list_offsets[lst + 1]]
+            for lst in probe_lists
+        ]) if probe_lists.size else np.empty(0, dtype=np.int64)
+
+        # Ascending row order keeps reads from a memory-mapped matrix sequential
+        rows.sort()
+        return rows
+
+    def search(self, matrix: np.ndarray, query: np.ndarray, top_k: int,
+               n_probe: Optional[int] = None,
+               row_mask: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Approximate top_k rows and their cosine similarities for a normalized query
+
+        ``row_mask`` (boolean, one entry per row) restricts the candidates
+        before they are scored.
+        """
+
+        rows = self.candidate_rows(query, n_probe)
+        if row_mask is not None:
+            rows = rows[row_mask[rows]]
+        scores = np.asarray(matrix[rows], dtype=np.float32) @ query
+        best = top_k_indices(scores, top_k)
+        return rows[best], scores[best]
+
+    def save(self, path: Path):
+        """Persist centroids and assignments (written atomically)"""
+
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, 'wb') as f:
+            np.savez(
+                f,
+                centroids=self.centroids,
+                assignments=self._assignments[:self._size],
+                n_probe=np.int64(self.n_probe),
+                kmeans_iterations=np.int64(self.kmeans_iterations),
+                seed=np.int64(self.seed)
+            )
+        tmp_path.replace(path)
+
+    @classmethod
+    def load(cls, path: Path) -> "IVFIndex":
+        with np.load(path) as data:
+            index = cls(
+                n_lists=int(data["centroids"].shape[0]),
+                n_probe=int(data["n_probe"]),
+                kmeans_iterations=int(data["kmeans_iterations"]),
+                seed=int(data["seed"])
+            )
+            index.centroids = as_normalized_matrix(data["centroids"])
+            index._assignments = data["assignments"].astype(np.int32)
+            index._size = int(index._assignments.shape[0])
+        return index
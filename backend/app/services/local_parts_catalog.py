@@ -4,13 +4,15 @@ Uses SQLite database for parts catalog operations
 """
 
 import asyncio
+import sqlite3
 import structlog
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 import re
 
-from ..database.connection_pool import get_secure_db_manager, SecureDatabaseManager
+from ..database.connection_pool import CatalogVersion, get_secure_db_manager, SecureDatabaseManager
 from .embeddings import PartEmbeddingService
+from .search_result_cache import SearchResultCache, copy_results, get_search_result_cache, normalize_query
 
 logger = structlog.get_logger()
 
@@ -20,43 +22,36 @@ class LocalPartsCatalogService:
     def __init__(self):
         self.db_manager: SecureDatabaseManager = get_secure_db_manager()
         self.embedding_service = PartEmbeddingService()
+        self.result_cache: SearchResultCache = get_search_result_cache()
+        self._fts_available = True
     
     async def search_parts(self, query: str, 
                           filters: Optional[Dict[str, Any]] = None,
                           top_k: int = 50) -> List[Dict[str, Any]]:
         """Search for parts using multiple strategies"""
         
+        query = normalize_query(query)
+        version = await self._cache_version()
+        cache_key = self.result_cache.make_key(query, filters, top_k)
+        if version is not None:
+            cached = self.result_cache.get(cache_key, version)
+            if cached is not None:
+                logger.debug("Parts search served from cache", query=query, top_k=top_k)
+                return cached
+        
         try:
             logger.info("Searching parts", 
                        query=query, 
                        filters=filters,
                        top_k=top_k)
             
-            # Strategy 1: Direct part number search
-            direct_matches = self._search_by_part_number(query)
-            
-            # Strategy 2: Full-text search
-            fts_matches = self._search_full_text(query, top_k)
-            
-            # Strategy 3: Description-based search
-            desc_matches = self._search_by_description(query, top_k)
-            
-            # Strategy 4: Category/material filtering
-            filtered_matches = self._search_with_filters(query, filters, top_k)
-            
-            # Combine and score results
-            all_matches = self._combine_and_score_results(
-                query, direct_matches, fts_matches, desc_matches, filtered_matches
-            )
-            
-            # Apply additional filters
-            if filters:
-                all_matches = self._apply_filters(all_matches, filters)
+            # Every strategy runs as one branch of a single query; the database
+            # tags, deduplicates and counts the sources of each candidate
+            candidates = (await self._retrieve_candidates([query], filters, top_k))[0]
+            final_results = self._rank_candidates(query, candidates, filters, top_k)
             
-            # Sort by combined score and limit results
-            all_matches.sort(key=lambda x: x.get("scores", {}).get("combined_score", 0), reverse=True)
-            
-            final_results = all_matches[:top_k]
+            if version is not None:
+                self.result_cache.put(cache_key, version, final_results)
             
             logger.info("Parts search completed", 
                        query=query,
@@ -68,163 +63,409 @@ class LocalPartsCatalogService:
             logger.error("Parts search failed", query=query, error=str(e))
             return []
     
-    def _search_by_part_number(self, query: str) -> List[Dict[str, Any]]:
-        """Search for exact or partial part number matches"""
-        try:
-            # Try exact match first using secure method
-            exact_match = self.db_manager.get_part_by_number_safe(query.strip())
-            if exact_match:
-                exact_match["match_type"] = "exact_part_number"
-                exact_match["base_score"] = 1.0
-                return [exact_match]
-            
-            # Try partial matches
-            search_query = """
-            SELECT * FROM parts_catalog 
-            WHERE part_number LIKE ? AND active = 1
-            ORDER BY 
-                CASE 
-                    WHEN part_number = ? THEN 1
-                    WHEN part_number LIKE ? THEN 2
-                    ELSE 3
-                END,
-                part_number ASC
-            LIMIT 20
-            """
-            
-            partial_term = f"%{query.strip()}%"
-            exact_term = query.strip()
-            starts_with = f"{query.strip()}%"
-            
-            result = self.db_manager.execute_query(
-                search_query, (partial_term, exact_term, starts_with), validate_table='parts_catalog'
-            )
-            results = result.rows
-            
-            for result in results:
-                result["match_type"] = "partial_part_number"
-                result["base_score"] = 0.8
-            
-            return results
-            
-        except Exception as e:
-            logger.warning("Part number search failed", error=str(e))
-            return []
+    async def search_parts_batch(self, queries: List[str],
+                                 filters: Optional[Dict[str, Any]] = None,
+                                 top_k: int = 50) -> List[List[Dict[str, Any]]]:
+        """Run several searches at once, returning each query's results in input order
+        
+        Gives the same results as calling search_parts per query, but the
+        candidates of every query not already cached are retrieved together,
+        in one database round-trip per MAX_BATCH_QUERIES queries.
+        """
+        
+        normalized = [normalize_query(query) for query in queries]
+        version = await self._cache_version()
+        results: Dict[str, List[Dict[str, Any]]] = {}
+        pending: List[str] = []
+        
+        for query in dict.fromkeys(normalized):
+            cached = None
+            if version is not None:
+                cached = self.result_cache.get(self.result_cache.make_key(query, filters, top_k), version)
+            if cached is not None:
+                results[query] = cached
+            else:
+                pending.append(query)
+        
+        if pending:
+            logger.info("Searching parts in batch",
+                       queries=len(pending),
+                       cached=len(results),
+                       filters=filters,
+                       top_k=top_k)
+            try:
+                for start in range(0, len(pending), self.MAX_BATCH_QUERIES):
+                    chunk = pending[start:start + self.MAX_BATCH_QUERIES]
+                    candidate_lists = await self._retrieve_candidates(chunk, filters, top_k)
+                    for query, candidates in zip(chunk, candidate_lists):
+                        results[query] = self._rank_candidates(query, candidates, filters, top_k)
+                        if version is not None:
+                            self.result_cache.put(self.result_cache.make_key(query, filters, top_k),
+                                                  version, results[query])
+            except Exception as e:
+                logger.error("Batch parts search failed", queries=len(pending), error=str(e))
+                for query in pending:
+                    results.setdefault(query, [])
+        
+        # A repeated query gets its own copy, as from separate search_parts calls
+        batch_results = []
+        seen = set()
+        for query in normalized:
+            batch_results.append(copy_results(results[query]) if query in seen else results[query])
+            seen.add(query)
+        return batch_results
     
-    def _search_full_text(self, query: str, limit: int) -> List[Dict[str, Any]]:
-        """Search using SQLite FTS (Full-Text Search)"""
+    async def _cache_version(self) -> Optional[CatalogVersion]:
+        """Catalog version to cache results under, or None when caching is off or unavailable"""
+        if self.result_cache.max_entries <= 0:
+            return None
         try:
-            # Use secure full-text search
-            result = self.db_manager.search_parts_full_text_safe(query, limit)
-            results = result.rows
-            
-            for result in results:
-                result["match_type"] = "full_text"
-                result["base_score"] = 0.7
-            
-            return results
-            
+            return await self.db_manager.fetch_catalog_version()
         except Exception as e:
-            logger.warning("Full-text search failed", error=str(e))
-            return []
+            logger.warning("Search result cache unavailable", error=str(e))
+            return None
     
-    def _search_by_description(self, query: str, limit: int) -> List[Dict[str, Any]]:
-        """Search by description using LIKE queries"""
-        try:
-            result = self.db_manager.execute_safe_search(query, 'parts_catalog', limit=limit)
-            results = result.rows
-            
-            for result in results:
-                result["match_type"] = "description"
-                result["base_score"] = 0.6
-            
-            return results
-            
-        except Exception as e:
-            logger.warning("Description search failed", error=str(e))
-            return []
+    # Score given to candidates from each retrieval branch, in priority order
+    # (a part found by several branches keeps the first branch's tag)
+    CANDIDATE_SOURCES = (
+        ("exact_part_number", 1.0),
+        ("partial_part_number", 0.8),
+        ("full_text", 0.7),
+        ("description", 0.6),
+        ("filtered", 0.5),
+    )
     
-    def _search_with_filters(self, query: str, filters: Optional[Dict[str, Any]], limit: int) -> List[Dict[str, Any]]:
-        """Search with category, material, or other filters"""
-        try:
-            if not filters:
-                return []
-            
+    # Added to the combined score for every extra branch that found a part
+    MULTI_SOURCE_BOOST = 0.1
+    
+    # Queries per batched retrieval statement (SQLite allows 500 compound SELECT terms)
+    MAX_BATCH_QUERIES = 50
+    
+    # Row cap of the partial part number branch (the others are capped at top_k)
+    PARTIAL_PART_NUMBER_LIMIT = 20
+    
+    # Bookkeeping columns of the per-shard candidate rows, dropped after merging
+    SHARD_CANDIDATE_COLUMNS = frozenset((
+        "query_index", "source_order", "match_type", "base_score",
+        "candidate_sort_key", "candidate_tiebreak",
+    ))
+    
+    @classmethod
+    def _build_candidate_branches(cls, query: str, filters: Optional[Dict[str, Any]],
+                                  trigram_index: bool, full_text: bool, prefix: str = "",
+                                  sharded: bool = False) -> Tuple[List[Tuple[str, str]], Dict[str, Any]]:
+        """Build the (name, SQL) retrieval branch of every applicable strategy
+        
+        ``trigram_index`` and ``full_text`` say whether the catalog has the
+        parts_search_trigram and parts_search tables. CTE references and
+        parameter names carry ``prefix`` so the branches of several queries can
+        share one statement; ``:limit`` is bound by the caller.
+        
+        ``sharded`` leaves out what only holds for the whole catalog - the
+        exact-hit guard and dropping inactive full-text hits after the cut -
+        for _merge_shard_candidates to apply once the shards are combined.
+        """
+        
+        term = query.strip()
+        params: Dict[str, Any] = {}
+        branches: List[Tuple[str, str]] = []
+        
+        # Each branch yields (id, sort_key, tiebreak) in its own ranking order
+        
+        # Strategy 1: exact part number (same sanitizing as get_part_by_number_safe)
+        if len(term) <= 50:
+            params[f"{prefix}part_number"] = ''.join(c for c in term if c.isalnum() or c in '-_.')
+            branches.append(("exact_part_number", f"""
+            SELECT id, 0 AS sort_key, part_number AS tiebreak FROM parts_catalog
+            WHERE part_number = :{prefix}part_number AND active = 1"""))
+        
+        # Substring branches read the trigram index when the term is long enough,
+        # otherwise they fall back to scanning parts_catalog with LIKE
+        use_trigram = trigram_index and len(term) >= SecureDatabaseManager.MIN_TRIGRAM_LENGTH
+        substring_source = (
+            # CROSS JOIN pins the trigram table as the outer loop of the join
+            "parts_search_trigram t CROSS JOIN parts_catalog p ON p.id = t.rowid" if use_trigram
+            else "parts_catalog p"
+        )
+        substring_table = "t" if use_trigram else "p"
+        
+        # Strategy 1b: partial part number, only consulted when there is no exact hit
+        params.update({
+            f"{prefix}partial_term": f"%{term}%",
+            f"{prefix}exact_term": term,
+            f"{prefix}starts_with": f"{term}%",
+        })
+        exact_guard = (
+            f"AND NOT EXISTS (SELECT 1 FROM {prefix}exact_part_number)"
+            if f"{prefix}part_number" in params and not sharded else ""
+        )
+        branches.append(("partial_part_number", f"""
+            SELECT p.id,
+                CASE
+                    WHEN p.part_number = :{prefix}exact_term THEN 1
+                    WHEN p.part_number LIKE :{prefix}starts_with THEN 2
+                    ELSE 3
+                END AS sort_key,
+                p.part_number AS tiebreak
+            FROM {substring_source}
+            WHERE {substring_table}.part_number LIKE :{prefix}partial_term AND p.active = 1 {exact_guard}
+            ORDER BY sort_key, tiebreak
+            LIMIT {cls.PARTIAL_PART_NUMBER_LIMIT}"""))
+        
+        # Strategy 2: full-text search (bm25-ranked, prefix terms)
+        fts_expression = SecureDatabaseManager.fts_match_expression(term) if len(term) <= 200 else None
+        if fts_expression and full_text:
+            params[f"{prefix}fts_expression"] = fts_expression
+            # Cut on (rank, part_number) so equal ranks don't fall back to row order
+            active_filter = "" if sharded else "\n            WHERE active = 1"
+            branches.append(("full_text", f"""
+            SELECT id, sort_key, tiebreak FROM (
+                SELECT p.id, p.active, f.rank AS sort_key, p.part_number AS tiebreak
+                FROM parts_search f
+                JOIN parts_catalog p ON p.id = f.rowid
+                WHERE parts_search MATCH :{prefix}fts_expression
+                ORDER BY sort_key, tiebreak
+                LIMIT :limit
+            ){active_filter}"""))
+        
+        # Strategy 3: description LIKE (same length limit as execute_safe_search)
+        if len(term) <= 200:
+            params[f"{prefix}description_term"] = f"%{term}%"
+            branches.append(("description", f"""
+            SELECT p.id, p.list_price AS sort_key, p.part_number AS tiebreak
+            FROM {substring_source}
+            WHERE {substring_table}.description LIKE :{prefix}description_term AND p.active = 1
+            ORDER BY sort_key, tiebreak
+            LIMIT :limit"""))
+        
+        # Strategy 4: category/material/availability/price filters
+        if filters:
             conditions = ["active = 1"]
-            params = []
             
-            # Build WHERE conditions based on filters
             if filters.get("category"):
-                conditions.append("category = ?")
-                params.append(filters["category"])
+                conditions.append(f"category = :{prefix}filter_category")
+                params[f"{prefix}filter_category"] = filters["category"]
             
             if filters.get("material"):
-                conditions.append("material LIKE ?")
-                params.append(f"%{filters['material']}%")
+                conditions.append(f"material LIKE :{prefix}filter_material")
+                params[f"{prefix}filter_material"] = f"%{filters['material']}%"
             
             if filters.get("availability_status"):
-                conditions.append("availability_status = ?")
-                params.append(filters["availability_status"])
+                conditions.append(f"availability_status = :{prefix}filter_availability")
+                params[f"{prefix}filter_availability"] = filters["availability_status"]
             
             if filters.get("price_range"):
                 price_range = filters["price_range"]
                 if price_range.get("min"):
-                    conditions.append("list_price >= ?")
-                    params.append(price_range["min"])
+                    conditions.append(f"list_price >= :{prefix}filter_min_price")
+                    params[f"{prefix}filter_min_price"] = price_range["min"]
                 if price_range.get("max"):
-                    conditions.append("list_price <= ?")
-                    params.append(price_range["max"])
+                    conditions.append(f"list_price <= :{prefix}filter_max_price")
+                    params[f"{prefix}filter_max_price"] = price_range["max"]
             
             # Add query terms to description search
-            if query.strip():
-                conditions.append("description LIKE ?")
-                params.append(f"%{query.strip()}%")
+            if term:
+                conditions.append(f"description LIKE :{prefix}filter_description")
+                params[f"{prefix}filter_description"] = f"%{term}%"
             
-            search_query = f"""
-            SELECT * FROM parts_catalog 
+            branches.append(("filtered", f"""
+            SELECT id, list_price AS sort_key, part_number AS tiebreak
+            FROM parts_catalog
             WHERE {' AND '.join(conditions)}
-            ORDER BY list_price ASC
-            LIMIT ?
-            """
-            params.append(limit)
-            
-            results = self.db_manager.execute_query(search_query, tuple(params))
-            
-            for result in results:
-                result["match_type"] = "filtered"
-                result["base_score"] = 0.5
-            
-            return results
-            
-        except Exception as e:
-            logger.warning("Filtered search failed", error=str(e))
-            return []
+            ORDER BY sort_key, tiebreak
+            LIMIT :limit"""))
+        
+        return branches, params
     
-    def _combine_and_score_results(self, query: str, *result_sets) -> List[Dict[str, Any]]:
-        """Combine results from different search strategies and calculate scores"""
+    @classmethod
+    def build_candidate_query(cls, queries: List[str], filters: Optional[Dict[str, Any]], limit: int,
+                              trigram_index: bool, full_text: bool,
+                              sharded: bool = False) -> Tuple[str, Dict[str, Any]]:
+        """Build the UNION ALL retrieval query for every applicable strategy of each query
         
-        # Deduplicate by part number
-        seen_parts = {}
+        Candidates are deduplicated per query; ``query_index`` says which query
+        each row belongs to. The ``sharded`` variant returns every branch's rows
+        as they are, for _merge_shard_candidates.
+        """
         
-        for result_set in result_sets:
-            for part in result_set:
-                part_number = part.get("part_number")
-                if not part_number:
-                    continue
-                
-                if part_number not in seen_parts:
-                    # Calculate comprehensive scores
-                    scores = self._calculate_part_scores(query, part)
-                    part["scores"] = scores
-                    seen_parts[part_number] = part
+        params: Dict[str, Any] = {"limit": limit}
+        ctes: List[str] = []
+        selects: List[str] = []
+        
+        source_order = {name: i for i, (name, _) in enumerate(cls.CANDIDATE_SOURCES)}
+        base_scores = dict(cls.CANDIDATE_SOURCES)
+        
+        for index, query in enumerate(queries):
+            prefix = f"q{index}_" if len(queries) > 1 else ""
+            branches, branch_params = cls._build_candidate_branches(
+                query, filters, trigram_index, full_text, prefix, sharded
+            )
+            params.update(branch_params)
+            for name, sql in branches:
+                ctes.append(f"{prefix}{name} AS ({sql}\n            )")
+                selects.append(
+                    f"            SELECT {index} AS query_index, id, sort_key, tiebreak, "
+                    f"{source_order[name]} AS source_order, "
+                    f"'{name}' AS match_type, {base_scores[name]} AS base_score FROM {prefix}{name}"
+                )
+        
+        ctes_sql = ",\n".join(ctes)
+        union = "\n            UNION ALL\n".join(selects)
+        
+        if sharded:
+            candidate_query = f"""
+        WITH {ctes_sql},
+        candidates AS (
+{union}
+        )
+        SELECT p.*, c.query_index, c.source_order, c.match_type, c.base_score,
+               c.sort_key AS candidate_sort_key, c.tiebreak AS candidate_tiebreak
+        FROM candidates c
+        JOIN parts_catalog p ON p.id = c.id
+        """
+            return candidate_query, params
+        
+        candidate_query = f"""
+        WITH {ctes_sql},
+        candidates AS (
+{union}
+        ),
+        ranked AS (
+            SELECT query_index, id, sort_key, tiebreak, source_order, match_type, base_score,
+                   COUNT(*) OVER (PARTITION BY query_index, id) AS source_count,
+                   ROW_NUMBER() OVER (
+                       PARTITION BY query_index, id ORDER BY source_order, sort_key, tiebreak
+                   ) AS source_rank
+            FROM candidates
+        )
+        SELECT p.*, r.match_type, r.base_score, r.source_count, r.query_index
+        FROM ranked r
+        JOIN parts_catalog p ON p.id = r.id
+        WHERE r.source_rank = 1
+        ORDER BY r.query_index, r.source_order, r.sort_key, r.tiebreak
+        """
+        
+        return candidate_query, params
+    
+    async def _retrieve_candidates(self, queries: List[str], filters: Optional[Dict[str, Any]],
+                                   limit: int) -> List[List[Dict[str, Any]]]:
+        """Gather candidates from all strategies of each query in one database round-trip"""
+        
+        sharded = self.db_manager.is_sharded
+        candidate_query, params = self.build_candidate_query(
+            queries, filters, limit, self.db_manager.has_trigram_index, self._fts_available, sharded
+        )
+        
+        try:
+            rows = await self.db_manager.fetch_all(candidate_query, params, validate_table='parts_catalog')
+        
+        except sqlite3.OperationalError as e:
+            if "parts_search" not in str(e) or not self._fts_available:
+                raise
+            # Catalog built without the FTS table: drop that branch from now on
+            logger.warning("Full-text index unavailable, retrieving without it", error=str(e))
+            self._fts_available = False
+            candidate_query, params = self.build_candidate_query(
+                queries, filters, limit, self.db_manager.has_trigram_index, self._fts_available, sharded
+            )
+            rows = await self.db_manager.fetch_all(candidate_query, params, validate_table='parts_catalog')
+        
+        if sharded:
+            return self._merge_shard_candidates(rows, len(queries), limit)
+        
+        candidates: List[List[Dict[str, Any]]] = [[] for _ in queries]
+        for row in rows:
+            candidates[row.pop("query_index")].append(row)
+        return candidates
+    
+    def _merge_shard_candidates(self, rows: List[Dict[str, Any]], query_count: int,
+                                limit: int) -> List[List[Dict[str, Any]]]:
+        """Apply the single-database candidate logic to every shard's branch rows
+        
+        Each shard cut its branches to their limits on its own, so here every
+        branch is cut again across all shards, partial part number hits are
+        dropped when any shard had an exact hit, and only then are candidates
+        deduplicated and their sources counted. Parts are identified by
+        part_number, as row ids are only unique within a shard. Full-text
+        ranks still come from each shard's own bm25 statistics.
+        """
+        
+        source_order = {name: i for i, (name, _) in enumerate(self.CANDIDATE_SOURCES)}
+        branch_limits = {
+            source_order["exact_part_number"]: None,
+            source_order["partial_part_number"]: self.PARTIAL_PART_NUMBER_LIMIT,
+        }
+        
+        def branch_order(row: Dict[str, Any]) -> Tuple:
+            # SQLite sorts NULL before any value
+            return tuple((value is not None, value)
+                         for value in (row["candidate_sort_key"], row["candidate_tiebreak"]))
+        
+        branches: Dict[Tuple[int, int], List[Dict[str, Any]]] = {}
+        for row in rows:
+            branches.setdefault((row["query_index"], row["source_order"]), []).append(row)
+        
+        query_rows: List[List[Dict[str, Any]]] = [[] for _ in range(query_count)]
+        for (query_index, order), branch_rows in branches.items():
+            if (order == source_order["partial_part_number"]
+                    and (query_index, source_order["exact_part_number"]) in branches):
+                continue
+            
+            branch_rows.sort(key=branch_order)
+            branch_rows = branch_rows[:branch_limits.get(order, limit)]
+            if order == source_order["full_text"]:
+                # The single-database query cuts full-text hits before dropping inactive parts
+                branch_rows = [row for row in branch_rows if row["active"] == 1]
+            query_rows[query_index].extend(branch_rows)
+        
+        candidates: List[List[Dict[str, Any]]] = []
+        for rows_for_query in query_rows:
+            rows_for_query.sort(key=lambda row: (row["source_order"],) + branch_order(row))
+            
+            # First row per part is its highest-priority source; dicts keep that order
+            sources: Dict[Any, List] = {}
+            for row in rows_for_query:
+                entry = sources.get(row["part_number"])
+                if entry is None:
+                    sources[row["part_number"]] = [row, 1]
                 else:
-                    # Boost score for parts found in multiple strategies
-                    existing_part = seen_parts[part_number]
-                    boost = 0.1
-                    if "scores" in existing_part:
-                        existing_part["scores"]["combined_score"] += boost
+                    entry[1] += 1
+            
+            merged = []
+            for row, source_count in sources.values():
+                part = {key: value for key, value in row.items() if key not in self.SHARD_CANDIDATE_COLUMNS}
+                part.update(match_type=row["match_type"], base_score=row["base_score"],
+                            source_count=source_count)
+                merged.append(part)
+            candidates.append(merged)
+        
+        return candidates
+    
+    def _rank_candidates(self, query: str, candidates: List[Dict[str, Any]],
+                         filters: Optional[Dict[str, Any]], top_k: int) -> List[Dict[str, Any]]:
+        """Score, filter and cut one query's candidates to its final results"""
+        
+        all_matches = self._score_candidates(query, candidates)
+        
+        # Apply additional filters
+        if filters:
+            all_matches = self._apply_filters(all_matches, filters)
+        
+        # Sort by combined score and limit results
+        all_matches.sort(key=lambda x: x.get("scores", {}).get("combined_score", 0), reverse=True)
+        
+        return all_matches[:top_k]
+    
+    def _score_candidates(self, query: str, candidates: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Score deduplicated candidates, boosting parts that several strategies found"""
+        
+        for part in candidates:
+            extra_sources = part.pop("source_count", 1) - 1
+            scores = self._calculate_part_scores(query, part)
+            scores["combined_score"] += self.MULTI_SOURCE_BOOST * extra_sources
+            part["scores"] = scores
         
-        return list(seen_parts.values())
+        return candidates
     
     def _calculate_part_scores(self, query: str, part: Dict[str, Any]) -> Dict[str, float]:
         """Calculate comprehensive scoring for a part"""
@@ -430,7 +671,8 @@ class LocalPartsCatalogService:
         """Get statistics about the parts catalog"""
         
         try:
-            stats = self.db_manager.get_database_stats()
+            stats = await self.db_manager.run_async(self.db_manager.get_database_stats)
+            stats["search_cache"] = self.result_cache.get_stats()
             stats["last_updated"] = datetime.now().isoformat()
             return stats
             
@@ -458,8 +700,8 @@ class LocalPartsCatalogService:
         """Check the health of the parts catalog service"""
         
         try:
-            # Test database connection
-            stats = self.db_manager.get_database_stats()
+            # Test database connection (stats are materialized, so this is cheap)
+            stats = await self.db_manager.run_async(self.db_manager.get_database_stats)
             
             health_status = {
                 "status": "healthy",
@@ -1,58 +1,359 @@
 import os
+import re
 import json
-import pickle
-from typing import List, Dict, Any, Optional
+import time
+import base64
+import threading
+from contextlib import contextmanager
+from typing import List, Dict, Any, Optional, Tuple
 import asyncio
 import structlog
 import numpy as np
+from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
 
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    # Windows: writers are only serialized within one process
+    fcntl = None
+    FCNTL_AVAILABLE = False
+
+from .ivf_index import IVFIndex
+from .metadata_index import MetadataIndex
+from .vector_math import normalize_rows, top_k_indices
+
 logger = structlog.get_logger()
 
+
+@dataclass
+class CollectionMatrix:
+    """Columnar view of a collection: one normalized float32 matrix plus parallel arrays"""
+    ids: List[Any]
+    metadata: List[Dict[str, Any]]
+    matrix: np.ndarray  # shape (n, dims), rows L2-normalized
+    norms: np.ndarray  # original row norms, so raw vectors can be reconstructed
+    created_at: List[Optional[str]]
+    
+    # Writable, over-allocated buffers backing matrix/norms once the collection is mutated
+    _buffer: Optional[np.ndarray] = field(default=None, init=False, repr=False, compare=False)
+    _norm_buffer: Optional[np.ndarray] = field(default=None, init=False, repr=False, compare=False)
+    _id_index: Optional[Dict[Any, int]] = field(default=None, init=False, repr=False, compare=False)
+
+    @property
+    def dimensions(self) -> int:
+        return int(self.matrix.shape[1]) if self.matrix.ndim == 2 else 0
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @classmethod
+    def from_vectors(cls, vectors: List[Dict[str, Any]]) -> "CollectionMatrix":
+        """Build the matrix from stored vector dicts, skipping empty or mis-sized rows"""
+        ids = []
+        metadata = []
+        created_at = []
+        rows = []
+        dims = None
+
+        for vector_data in vectors:
+            stored_vector = vector_data.get("vector", [])
+            if not stored_vector:
+                continue
+            if dims is None:
+                dims = len(stored_vector)
+            elif len(stored_vector) != dims:
+                continue
+            ids.append(vector_data.get("id"))
+            metadata.append(vector_data.get("metadata", {}))
+            created_at.append(vector_data.get("created_at"))
+            rows.append(stored_vector)
+
+        if len(rows) != len(vectors):
+            logger.warning("Skipped vectors without usable embeddings",
+                         skipped=len(vectors) - len(rows))
+
+        matrix = np.asarray(rows, dtype=np.float32).reshape(len(rows), dims or 0)
+        norms = np.linalg.norm(matrix, axis=1).astype(np.float32)
+        return cls(ids=ids, metadata=metadata, matrix=normalize_rows(matrix),
+                   norms=norms, created_at=created_at)
+
+    def row_of(self, vector_id: Any) -> Optional[int]:
+        """Look up the row holding an id via a lazily built hash index"""
+        if self._id_index is None:
+            self._id_index = {vid: row for row, vid in enumerate(self.ids)}
+        return self._id_index.get(vector_id)
+
+    def upsert(self, vector_id: Any, vector: List[float], metadata: Dict[str, Any],
+               created_at: Optional[str] = None) -> int:
+        """Insert or replace a row in place and return its index"""
+        raw = np.asarray(vector, dtype=np.float32).ravel()
+        if raw.size == 0:
+            raise ValueError("Cannot store an empty vector")
+        if not self.ids and raw.size != self.dimensions:
+            # First row of an empty collection defines its dimensionality
+            self.matrix = np.empty((0, raw.size), dtype=np.float32)
+            self._buffer = None
+        elif raw.size != self.dimensions:
+            raise ValueError(
+                f"Vector has {raw.size} dimensions, collection expects {self.dimensions}"
+            )
+
+        norm = float(np.linalg.norm(raw))
+        row = self.row_of(vector_id)
+        if row is None:
+            row = len(self.ids)
+            self._reserve(row + 1)
+            self.ids.append(vector_id)
+            self.metadata.append(metadata)
+            self.created_at.append(created_at)
+            self._id_index[vector_id] = row
+        else:
+            self._reserve(len(self.ids))
+            self.metadata[row] = metadata
+            self.created_at[row] = created_at
+
+        self._buffer[row] = raw / norm if norm > 0 else raw
+        self._norm_buffer[row] = norm
+        self.matrix = self._buffer[:len(self.ids)]
+        self.norms = self._norm_buffer[:len(self.ids)]
+        return row
+
+    def _reserve(self, rows: int):
+        """Ensure writable buffers with room for ``rows`` rows, growing geometrically"""
+        if self._buffer is not None and self._buffer.shape[0] >= rows:
+            return
+        count = len(self.ids)
+        capacity = max(rows, 2 * count, 64)
+        buffer = np.empty((capacity, self.dimensions), dtype=np.float32)
+        buffer[:count] = self.matrix[:count]
+        norm_buffer = np.empty(capacity, dtype=np.float32)
+        norm_buffer[:count] = self.norms[:count]
+        self._buffer = buffer
+        self._norm_buffer = norm_buffer
+
+    def vector_at(self, row: int) -> List[float]:
+        """Reconstruct the original (un-normalized) vector for a row"""
+        return (np.asarray(self.matrix[row], dtype=np.float32) * self.norms[row]).tolist()
+
+    def to_vectors(self) -> List[Dict[str, Any]]:
+        """Materialize the legacy list-of-dicts representation"""
+        return [
+            {
+                "id": self.ids[row],
+                "vector": self.vector_at(row),
+                "metadata": self.metadata[row],
+                "created_at": self.created_at[row]
+            }
+            for row in range(len(self.ids))
+        ]
+
+
 class LocalVectorStore:
-    """Local file-based vector storage for development"""
+    """Local file-based vector storage for development
     
-    def __init__(self, storage_dir: str = "data/vectors"):
+    Collections are stored as a binary pair: ``{collection}.{generation}.npy``
+    holds the L2-normalized float32 matrix and ``{collection}.meta.json`` holds
+    ids, metadata, row norms and the name of its matrix file. The matrix is
+    memory-mapped on load so several worker processes share the OS page cache. Legacy ``{collection}.json``
+    files are still readable and can be converted with
+    ``convert_json_collection``.
+    
+    Single-vector upserts are appended to ``{collection}.wal`` instead of
+    rewriting the base files; the log is replayed on load and folded back
+    into the base by ``compact()``, which also runs automatically once the
+    log outgrows the base collection. Writers hold ``{collection}.lock``;
+    readers never modify the files.
+    
+    An optional IVF approximate-nearest-neighbour index can be built with
+    ``build_ann_index``; it is saved as ``{collection}.ivf.npz``, kept up to
+    date as vectors are added, and used by ``search_similar`` unless
+    ``exact=True`` is passed.
+    """
+    
+    def __init__(self, storage_dir: str = "data/vectors", wal_compact_threshold: int = 10000):
         self.storage_dir = Path(storage_dir)
         self.storage_dir.mkdir(parents=True, exist_ok=True)
+        self.wal_compact_threshold = wal_compact_threshold
         
         # In-memory cache for fast access
         self._vector_cache = {}
+        self._matrix_cache: Dict[str, CollectionMatrix] = {}
+        self._wal_counts: Dict[str, int] = {}
+        self._ann_indexes: Dict[str, Optional[IVFIndex]] = {}
         self._cache_loaded = False
+        self._writer_locks: Dict[str, threading.Lock] = {}
+        self._writer_locks_guard = threading.Lock()
         
         logger.info("Initialized local vector store", storage_dir=str(self.storage_dir))
     
     def _get_collection_path(self, collection_name: str) -> Path:
-        """Get file path for a collection"""
+        """Get file path for a legacy JSON collection"""
         return self.storage_dir / f"{collection_name}.json"
     
+    def _get_matrix_path(self, collection_name: str, generation: Optional[str] = None) -> Path:
+        """Get file path for one generation of a collection's float32 vector matrix
+        
+        Without ``generation``: the single matrix file written before generations.
+        """
+        if generation is None:
+            return self.storage_dir / f"{collection_name}.npy"
+        return self.storage_dir / f"{collection_name}.{generation}.npy"
+    
+    def _get_metadata_path(self, collection_name: str) -> Path:
+        """Get file path for a collection's metadata sidecar"""
+        return self.storage_dir / f"{collection_name}.meta.json"
+    
+    def _get_wal_path(self, collection_name: str) -> Path:
+        """Get file path for a collection's append-only write-ahead log"""
+        return self.storage_dir / f"{collection_name}.wal"
+    
+    def _get_ann_index_path(self, collection_name: str) -> Path:
+        """Get file path for a collection's IVF index"""
+        return self.storage_dir / f"{collection_name}.ivf.npz"
+    
+    def _get_lock_path(self, collection_name: str) -> Path:
+        """Get file path for a collection's writer lock"""
+        return self.storage_dir / f"{collection_name}.lock"
+    
+    @contextmanager
+    def _writer_lock(self, collection_name: str):
+        """Serialize writers of a collection's files across threads and processes"""
+        
+        with self._writer_locks_guard:
+            thread_lock = self._writer_locks.setdefault(collection_name, threading.Lock())
+        
+        with thread_lock, open(self._get_lock_path(collection_name), 'a') as lock_file:
+            if FCNTL_AVAILABLE:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if FCNTL_AVAILABLE:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+    
+    def _sync_storage_dir(self):
+        """Make renames in the storage directory durable (where directories can be fsynced)"""
+        try:
+            fd = os.open(self.storage_dir, os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+    
+    def _write_binary_collection(self, collection_name: str, collection: CollectionMatrix):
+        """Write a new matrix generation and switch to it by replacing the sidecar
+        
+        The sidecar names its matrix file, so replacing it is the one step that
+        publishes the new version: after a crash the old or the new pair is
+        complete, never a mix. Call with the writer lock held.
+        """
+        
+        matrix_path = self._get_matrix_path(collection_name, str(time.time_ns()))
+        metadata_path = self._get_metadata_path(collection_name)
+        
+        with open(matrix_path, 'wb') as f:
+            np.save(f, np.ascontiguousarray(collection.matrix, dtype=np.float32))
+            f.flush()
+            os.fsync(f.fileno())
+        
+        sidecar = {
+            "collection_name": collection_name,
+            "created_at": datetime.now().isoformat(),
+            "count": len(collection),
+            "dimensions": collection.dimensions,
+            "ids": collection.ids,
+            "metadata": collection.metadata,
+            "norms": collection.norms.tolist(),
+            "row_created_at": collection.created_at,
+            "matrix_file": matrix_path.name
+        }
+        tmp_metadata = metadata_path.with_name(metadata_path.name + ".tmp")
+        with open(tmp_metadata, 'w') as f:
+            json.dump(sidecar, f, default=str, separators=(',', ':'))
+            f.flush()
+            os.fsync(f.fileno())
+        
+        os.replace(tmp_metadata, metadata_path)
+        self._sync_storage_dir()
+        self._remove_stale_matrices(collection_name, matrix_path.name)
+    
+    def _remove_stale_matrices(self, collection_name: str, current: str):
+        """Delete matrix files of earlier generations (and of interrupted writes)"""
+        
+        pattern = re.compile(rf"^{re.escape(collection_name)}(\.\d+)?\.npy$")
+        for path in self.storage_dir.iterdir():
+            if path.name != current and pattern.match(path.name):
+                try:
+                    path.unlink()
+                except OSError:
+                    # e.g. still memory-mapped by a reader on Windows; removed next time
+                    pass
+    
+    def _read_binary_collection(self, collection_name: str,
+                                retry: bool = True) -> Optional[CollectionMatrix]:
+        """Memory-map a binary collection, or return None if it does not exist"""
+        
+        metadata_path = self._get_metadata_path(collection_name)
+        if not metadata_path.exists():
+            return None
+        
+        with open(metadata_path, 'r') as f:
+            sidecar = json.load(f)
+        
+        matrix_file = sidecar.get("matrix_file")
+        matrix_path = (self.storage_dir / matrix_file if matrix_file
+                       else self._get_matrix_path(collection_name))
+        try:
+            matrix = np.load(matrix_path, mmap_mode='r')
+        except FileNotFoundError:
+            if matrix_file is None:
+                return None
+            if retry:
+                # A writer published a new generation after we read the sidecar
+                return self._read_binary_collection(collection_name, retry=False)
+            raise
+        if matrix.shape[0] != sidecar.get("count", 0):
+            raise ValueError(
+                f"Vector matrix has {matrix.shape[0]} rows but metadata lists {sidecar.get('count')}"
+            )
+        
+        return CollectionMatrix(
+            ids=sidecar.get("ids", []),
+            metadata=sidecar.get("metadata", []),
+            matrix=matrix,
+            norms=np.asarray(sidecar.get("norms", []), dtype=np.float32),
+            created_at=sidecar.get("row_created_at", [None] * matrix.shape[0])
+        )
+    
     async def store_vectors(self, vectors: List[Dict[str, Any]], 
                            collection_name: str = "parts_catalog") -> bool:
-        """Store vectors with metadata to local file"""
+        """Store vectors with metadata to local binary files"""
         
         try:
-            # Prepare data structure
-            vector_data = {
-                "collection_name": collection_name,
-                "created_at": datetime.now().isoformat(),
-                "count": len(vectors),
-                "vectors": vectors
-            }
-            
-            # Store to local file
-            file_path = self._get_collection_path(collection_name)
-            
-            with open(file_path, 'w') as f:
-                json.dump(vector_data, f, default=str, indent=2)
+            collection = CollectionMatrix.from_vectors(vectors)
+            with self._writer_lock(collection_name):
+                self._write_binary_collection(collection_name, collection)
+                
+                # The rewritten base supersedes any logged upserts
+                self._get_wal_path(collection_name).unlink(missing_ok=True)
+            self._wal_counts[collection_name] = 0
             
             # Update cache
             self._vector_cache[collection_name] = vectors
+            self._matrix_cache[collection_name] = collection
+            self._reindex_ann(collection_name, collection)
             
             logger.info("Stored vectors locally", 
                        collection=collection_name,
-                       count=len(vectors),
-                       file=str(file_path))
+                       count=len(collection),
+                       file=str(self._get_matrix_path(collection_name)))
             
             return True
             
@@ -62,27 +363,32 @@ class LocalVectorStore:
                         error=str(e))
             return False
     
+    def _load_json_vectors(self, collection_name: str) -> Optional[List[Dict[str, Any]]]:
+        """Parse a legacy JSON collection, or return None if it does not exist"""
+        
+        file_path = self._get_collection_path(collection_name)
+        if not file_path.exists():
+            return None
+        
+        with open(file_path, 'r') as f:
+            data = json.load(f)
+        
+        return data.get("vectors", [])
+    
     async def load_vectors(self, collection_name: str = "parts_catalog") -> List[Dict[str, Any]]:
-        """Load vectors from local file with caching"""
+        """Load vectors as a list of dicts with caching
+        
+        Prefer ``get_collection_matrix`` on hot paths; this materializes every
+        vector as a Python list.
+        """
         
         # Check cache first
         if collection_name in self._vector_cache:
             return self._vector_cache[collection_name]
         
         try:
-            file_path = self._get_collection_path(collection_name)
-            
-            if not file_path.exists():
-                logger.warning("Vector collection not found", 
-                             collection=collection_name,
-                             file=str(file_path))
-                return []
-            
-            # Load and parse
-            with open(file_path, 'r') as f:
-                data = json.load(f)
-            
-            vectors = data.get("vectors", [])
+            collection = await self._load_collection_matrix(collection_name)
+            vectors = collection.to_vectors() if collection is not None else []
             
             # Cache the results
             self._vector_cache[collection_name] = vectors
@@ -99,47 +405,398 @@ class LocalVectorStore:
                         error=str(e))
             return []
     
+    def collection_files(self, collection_name: str) -> List[Path]:
+        """Every file a collection's contents are read from"""
+        return [
+            self._get_matrix_path(collection_name),
+            self._get_metadata_path(collection_name),
+            self._get_wal_path(collection_name),
+            self._get_collection_path(collection_name),
+        ]
+    
+    def _read_collection(self, collection_name: str) -> Tuple[Optional[CollectionMatrix], int]:
+        """Read a collection (base files plus WAL) from disk without touching the caches
+        
+        Returns the collection (None if it does not exist) and the number of
+        WAL records replayed onto it.
+        """
+        
+        collection = self._read_binary_collection(collection_name)
+        
+        if collection is None:
+            legacy_vectors = self._load_json_vectors(collection_name)
+            if legacy_vectors is not None:
+                collection = CollectionMatrix.from_vectors(legacy_vectors)
+            elif self._get_wal_path(collection_name).exists():
+                # Not compacted yet: the log alone holds the collection
+                collection = CollectionMatrix.from_vectors([])
+            else:
+                logger.warning("Vector collection not found", 
+                             collection=collection_name,
+                             file=str(self._get_matrix_path(collection_name)))
+                return None, 0
+        
+        return collection, self._replay_wal(collection_name, collection)
+    
+    async def _load_collection_matrix(self, collection_name: str) -> Optional[CollectionMatrix]:
+        """Load a collection's matrix from disk into the cache"""
+        
+        collection, replayed = self._read_collection(collection_name)
+        if collection is None:
+            return None
+        
+        self._wal_counts[collection_name] = replayed
+        self._matrix_cache[collection_name] = collection
+        return collection
+    
+    def _replay_wal(self, collection_name: str, collection: CollectionMatrix) -> int:
+        """Apply logged upserts on top of the base collection, returning the record count
+        
+        Read-only: an incomplete final record (an append in progress, or one a
+        crash interrupted) is skipped here and cut by the next writer.
+        """
+        
+        wal_path = self._get_wal_path(collection_name)
+        try:
+            with open(wal_path, 'rb') as f:
+                content = f.read()
+        except FileNotFoundError:
+            return 0
+        
+        complete_end = content.rfind(b"\n") + 1
+        if complete_end < len(content):
+            logger.debug("Ignoring incomplete final WAL record", 
+                        collection=collection_name,
+                        bytes=len(content) - complete_end)
+        
+        replayed = 0
+        for line_num, line in enumerate(content[:complete_end].splitlines(), 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+                vector = np.frombuffer(base64.b64decode(record["vector"]), dtype=np.float32)
+                collection.upsert(record["id"], vector, record.get("metadata", {}),
+                                  record.get("created_at"))
+                replayed += 1
+            except Exception as e:
+                logger.warning("Skipping unreadable WAL record", 
+                             collection=collection_name,
+                             line=line_num,
+                             error=str(e))
+        
+        logger.info("Replayed vector WAL", 
+                   collection=collection_name,
+                   records=replayed)
+        return replayed
+    
+    def _repair_wal_tail(self, collection_name: str):
+        """Cut a torn final record left by an interrupted append (writer lock held)"""
+        
+        wal_path = self._get_wal_path(collection_name)
+        if not wal_path.exists():
+            return
+        
+        with open(wal_path, 'r+b') as f:
+            end = f.seek(0, os.SEEK_END)
+            complete_end = 0
+            position = end
+            while position > 0:
+                start = max(0, position - 65536)
+                f.seek(start)
+                newline = f.read(position - start).rfind(b"\n")
+                if newline >= 0:
+                    complete_end = start + newline + 1
+                    break
+                position = start
+            
+            if complete_end < end:
+                logger.warning("Truncating torn WAL record", 
+                             collection=collection_name,
+                             bytes=end - complete_end)
+                f.truncate(complete_end)
+    
+    def _append_wal(self, collection_name: str, records: List[Dict[str, Any]]):
+        """Append upsert records to the collection's write-ahead log"""
+        
+        lines = []
+        for record in records:
+            vector = np.asarray(record["vector"], dtype=np.float32)
+            lines.append(json.dumps({
+                "id": record["id"],
+                "vector": base64.b64encode(vector.tobytes()).decode("ascii"),
+                "metadata": record["metadata"],
+                "created_at": record["created_at"]
+            }, default=str, separators=(',', ':')))
+        
+        with self._writer_lock(collection_name):
+            self._repair_wal_tail(collection_name)
+            with open(self._get_wal_path(collection_name), 'a') as f:
+                f.write("\n".join(lines) + "\n")
+                f.flush()
+        
+        self._wal_counts[collection_name] = self._wal_counts.get(collection_name, 0) + len(records)
+    
+    async def compact(self, collection_name: str = "parts_catalog") -> bool:
+        """Fold the write-ahead log into the base binary files and truncate it"""
+        
+        try:
+            with self._writer_lock(collection_name):
+                # From disk, not the cache: the log may hold other processes' upserts
+                collection, _ = self._read_collection(collection_name)
+                if collection is None:
+                    collection = CollectionMatrix.from_vectors([])
+                self._write_binary_collection(collection_name, collection)
+                self._get_wal_path(collection_name).unlink(missing_ok=True)
+            self._wal_counts[collection_name] = 0
+            self._matrix_cache[collection_name] = collection
+            self._vector_cache.pop(collection_name, None)
+            
+            ann_index = self._get_ann_index(collection_name, collection)
+            if ann_index is not None:
+                ann_index.save(self._get_ann_index_path(collection_name))
+            
+            logger.info("Compacted vector collection", 
+                       collection=collection_name,
+                       count=len(collection))
+            return True
+            
+        except Exception as e:
+            logger.error("Failed to compact vector collection", 
+                        collection=collection_name,
+                        error=str(e))
+            return False
+    
+    async def _maybe_compact(self, collection_name: str, collection: CollectionMatrix):
+        """Compact once the log outgrows the base, keeping total rewrite cost linear"""
+        
+        pending = self._wal_counts.get(collection_name, 0)
+        if pending >= max(self.wal_compact_threshold, len(collection) - pending):
+            await self.compact(collection_name)
+    
+    async def get_collection_matrix(self, collection_name: str = "parts_catalog") -> CollectionMatrix:
+        """Get the columnar matrix for a collection, memory-mapping it on first use"""
+        
+        collection = self._matrix_cache.get(collection_name)
+        if collection is None:
+            try:
+                collection = await self._load_collection_matrix(collection_name)
+            except Exception as e:
+                logger.error("Failed to load vector matrix", 
+                            collection=collection_name,
+                            error=str(e))
+                collection = None
+            if collection is None:
+                collection = CollectionMatrix.from_vectors([])
+        return collection
+    
+    async def _get_writable_collection(self, collection_name: str) -> CollectionMatrix:
+        """Like get_collection_matrix, but raises if the collection fails to load
+        
+        Writers must not treat an unreadable collection as empty: compacting
+        or appending to that empty stand-in would replace the data on disk.
+        """
+        
+        collection = self._matrix_cache.get(collection_name)
+        if collection is None:
+            collection = await self._load_collection_matrix(collection_name)
+        if collection is None:
+            collection = CollectionMatrix.from_vectors([])
+        return collection
+    
+    async def convert_json_collection(self, collection_name: str = "parts_catalog") -> int:
+        """One-shot conversion of a legacy ``{collection}.json`` file to the binary format
+        
+        Upserts logged on top of the JSON base are folded in; the log is only
+        removed once the binary files are written. Returns the number of
+        vectors written.
+        """
+        
+        if not self._get_collection_path(collection_name).exists():
+            raise FileNotFoundError(
+                f"No JSON collection found at {self._get_collection_path(collection_name)}"
+            )
+        
+        with self._writer_lock(collection_name):
+            collection, _ = self._read_collection(collection_name)
+            self._write_binary_collection(collection_name, collection)
+            self._get_wal_path(collection_name).unlink(missing_ok=True)
+        
+        self._vector_cache.pop(collection_name, None)
+        self._matrix_cache.pop(collection_name, None)
+        self._wal_counts.pop(collection_name, None)
+        self._reindex_ann(collection_name, collection)
+        
+        logger.info("Converted JSON collection to binary format", 
+                   collection=collection_name,
+                   count=len(collection),
+                   dimensions=collection.dimensions)
+        
+        return len(collection)
+    
+    def _load_ann_index(self, collection_name: str) -> Optional[IVFIndex]:
+        """Read a collection's IVF index from disk, if one has been built"""
+        
+        index_path = self._get_ann_index_path(collection_name)
+        if not index_path.exists():
+            return None
+        
+        try:
+            return IVFIndex.load(index_path)
+        except Exception as e:
+            logger.warning("Failed to load IVF index", 
+                         collection=collection_name,
+                         error=str(e))
+            return None
+    
+    def _get_ann_index(self, collection_name: str,
+                       collection: CollectionMatrix) -> Optional[IVFIndex]:
+        """Get the collection's IVF index, loading it from disk on first use"""
+        
+        if collection_name not in self._ann_indexes:
+            ann_index = self._load_ann_index(collection_name)
+            if ann_index is not None and (ann_index.dimensions != collection.dimensions
+                                          or ann_index.size > len(collection)):
+                logger.warning("IVF index does not match collection, ignoring it", 
+                             collection=collection_name)
+                ann_index = None
+            self._ann_indexes[collection_name] = ann_index
+        
+        ann_index = self._ann_indexes[collection_name]
+        if ann_index is not None:
+            # Cover rows appended since the index was saved (e.g. replayed from the WAL)
+            ann_index.sync(collection.matrix)
+        return ann_index
+    
+    def _reindex_ann(self, collection_name: str, collection: CollectionMatrix):
+        """Reassign every row after the base was rewritten, keeping the trained centroids"""
+        
+        if collection_name in self._ann_indexes:
+            ann_index = self._ann_indexes[collection_name]
+        else:
+            ann_index = self._load_ann_index(collection_name)
+        
+        if ann_index is None:
+            self._ann_indexes[collection_name] = None
+            return
+        
+        if not len(collection) or ann_index.dimensions != collection.dimensions:
+            # Centroids no longer apply; searches fall back to the exact scan
+            self._ann_indexes[collection_name] = None
+            self._get_ann_index_path(collection_name).unlink(missing_ok=True)
+            return
+        
+        ann_index.reassign(collection.matrix)
+        ann_index.save(self._get_ann_index_path(collection_name))
+        self._ann_indexes[collection_name] = ann_index
+    
+    def _rows_changed(self, collection_name: str, collection: CollectionMatrix,
+                      rows: List[int]):
+        """Bring per-collection indexes up to date after rows were inserted or replaced"""
+        
+        ann_index = self._get_ann_index(collection_name, collection)
+        if ann_index is not None:
+            ann_index.assign_rows(collection.matrix, np.asarray(rows))
+    
+    async def build_ann_index(self, collection_name: str = "parts_catalog",
+                             n_lists: Optional[int] = None,
+                             n_probe: int = 8) -> Optional[IVFIndex]:
+        """Train and persist an IVF index for a collection
+        
+        ``n_lists`` defaults to ~4*sqrt(rows); ``n_probe`` is the default number
+        of lists scanned per query and can be overridden per search.
+        """
+        
+        collection = await self.get_collection_matrix(collection_name)
+        if not len(collection):
+            logger.warning("Cannot build IVF index for empty collection", 
+                         collection=collection_name)
+            return None
+        
+        ann_index = IVFIndex(n_lists=n_lists, n_probe=n_probe)
+        ann_index.train(collection.matrix)
+        ann_index.save(self._get_ann_index_path(collection_name))
+        self._ann_indexes[collection_name] = ann_index
+        
+        return ann_index
+    
+    async def drop_ann_index(self, collection_name: str = "parts_catalog"):
+        """Remove a collection's IVF index so searches fall back to the exact scan"""
+        self._get_ann_index_path(collection_name).unlink(missing_ok=True)
+        self._ann_indexes[collection_name] = None
+    
     async def search_similar(self, query_vector: List[float], 
                            collection_name: str = "parts_catalog",
                            top_k: int = 10,
-                           min_similarity: float = 0.5) -> List[Dict[str, Any]]:
-        """Search for similar vectors"""
+                           min_similarity: float = 0.5,
+                           n_probe: Optional[int] = None,
+                           exact: bool = False,
+                           row_mask: Optional[np.ndarray] = None) -> List[Dict[str, Any]]:
+        """Search for similar vectors
         
-        # Load vectors if not cached
-        vectors = await self.load_vectors(collection_name)
+        Uses the collection's IVF index when one exists (scanning ``n_probe``
+        lists) unless ``exact`` is set, otherwise scores every row. A boolean
+        ``row_mask`` restricts scoring to the selected rows.
+        """
         
-        if not vectors:
+        collection = await self.get_collection_matrix(collection_name)
+        
+        if not collection.ids:
             return []
         
         try:
-            results = []
-            query_vec = np.array(query_vector)
+            query_vec = np.asarray(query_vector, dtype=np.float32)
+            if query_vec.shape != (collection.dimensions,):
+                logger.warning("Query vector dimensions do not match collection",
+                             collection=collection_name,
+                             query_dims=query_vec.size,
+                             collection_dims=collection.dimensions)
+                return []
             
-            for vector_data in vectors:
-                stored_vector = vector_data.get("vector", [])
-                if not stored_vector:
-                    continue
-                
-                # Calculate cosine similarity
-                stored_vec = np.array(stored_vector)
-                similarity = self._cosine_similarity(query_vec, stored_vec)
-                
-                if similarity >= min_similarity:
-                    result = {
-                        "similarity": float(similarity),
-                        "metadata": vector_data.get("metadata", {}),
-                        "id": vector_data.get("id")
-                    }
-                    results.append(result)
-            
-            # Sort by similarity (descending) and limit results
-            results.sort(key=lambda x: x["similarity"], reverse=True)
-            results = results[:top_k]
+            query_norm = np.linalg.norm(query_vec)
+            if query_norm > 0:
+                query_vec = query_vec / query_norm
+            
+            selected = np.flatnonzero(row_mask) if row_mask is not None else None
+            ann_index = None if exact else self._get_ann_index(collection_name, collection)
+            
+            if ann_index is not None and selected is not None \
+                    and selected.size <= ann_index.expected_scan_size(n_probe):
+                # Filter is selective enough that scoring its rows beats probing lists
+                ann_index = None
+            
+            rows = None
+            if ann_index is not None:
+                rows, scores = ann_index.search(collection.matrix, query_vec, top_k, n_probe, row_mask)
+                if selected is not None and rows.size < min(top_k, selected.size):
+                    # Probed lists held too few matching rows; score the whole filtered set
+                    rows = None
+            
+            if rows is None:
+                if selected is None:
+                    # One matrix-vector product scores the whole collection
+                    similarities = collection.matrix @ query_vec
+                    rows = top_k_indices(similarities, top_k)
+                    scores = similarities[rows]
+                else:
+                    similarities = np.asarray(collection.matrix[selected], dtype=np.float32) @ query_vec
+                    best = top_k_indices(similarities, top_k)
+                    rows, scores = selected[best], similarities[best]
+            
+            results = [
+                {
+                    "similarity": float(score),
+                    "metadata": collection.metadata[row],
+                    "id": collection.ids[row]
+                }
+                for row, score in zip(rows, scores)
+                if score >= min_similarity
+            ]
             
             logger.debug("Vector search completed", 
                        collection=collection_name,
                        query_dims=len(query_vector),
-                       candidates=len(vectors),
+                       candidates=len(collection.ids) if selected is None else int(selected.size),
                        results=len(results))
             
             return results
@@ -154,14 +811,10 @@ class LocalVectorStore:
         """Get all parts metadata from vector store"""
         
         try:
-            vectors = await self.load_vectors(collection_name)
+            collection = await self.get_collection_matrix(collection_name)
             
             # Extract just the metadata (part information) from each vector
-            parts = []
-            for vector_data in vectors:
-                metadata = vector_data.get("metadata", {})
-                if metadata:
-                    parts.append(metadata)
+            parts = [metadata for metadata in collection.metadata if metadata]
             
             logger.info("Retrieved all parts from vector store", 
                        collection=collection_name,
@@ -192,72 +845,91 @@ class LocalVectorStore:
     
     async def add_vector(self, vector: List[float], metadata: Dict[str, Any],
                         vector_id: str, collection_name: str = "parts_catalog") -> bool:
-        """Add a single vector to the collection"""
+        """Add or replace a single vector, logging it to the collection's WAL"""
+        
+        added = await self.add_vectors(
+            [{"id": vector_id, "vector": vector, "metadata": metadata}], collection_name
+        )
+        return added == 1
+    
+    async def add_vectors(self, records: List[Dict[str, Any]],
+                         collection_name: str = "parts_catalog") -> int:
+        """Add or replace many vectors with a single WAL append
+        
+        Each record needs ``id``, ``vector`` and ``metadata`` keys. Returns the
+        number of records written.
+        """
+        
+        if not records:
+            return 0
         
         try:
-            # Load existing vectors
-            vectors = await self.load_vectors(collection_name)
+            collection = await self._get_writable_collection(collection_name)
+            created_at = datetime.now().isoformat()
             
-            # Create new vector entry
-            new_vector = {
-                "id": vector_id,
-                "vector": vector,
-                "metadata": metadata,
-                "created_at": datetime.now().isoformat()
-            }
+            logged = []
+            changed_rows = []
+            for record in records:
+                entry = {
+                    "id": record["id"],
+                    "vector": record["vector"],
+                    "metadata": record["metadata"],
+                    "created_at": created_at
+                }
+                try:
+                    existed = collection.row_of(entry["id"]) is not None
+                    changed_rows.append(
+                        collection.upsert(entry["id"], entry["vector"], entry["metadata"], created_at)
+                    )
+                except ValueError as e:
+                    logger.warning("Skipping invalid vector", 
+                                 id=entry["id"],
+                                 collection=collection_name,
+                                 error=str(e))
+                    continue
+                logged.append(entry)
+                logger.debug("Updated existing vector" if existed else "Added new vector", 
+                           id=entry["id"])
             
-            # Check for existing vector with same ID
-            existing_index = None
-            for i, vec in enumerate(vectors):
-                if vec.get("id") == vector_id:
-                    existing_index = i
-                    break
+            if logged:
+                self._append_wal(collection_name, logged)
             
-            if existing_index is not None:
-                # Update existing vector
-                vectors[existing_index] = new_vector
-                logger.debug("Updated existing vector", id=vector_id)
-            else:
-                # Add new vector
-                vectors.append(new_vector)
-                logger.debug("Added new vector", id=vector_id)
+            if changed_rows:
+                self._rows_changed(collection_name, collection, changed_rows)
             
-            # Store updated collection
-            return await self.store_vectors(vectors, collection_name)
+            self._matrix_cache[collection_name] = collection
+            self._vector_cache.pop(collection_name, None)
+            
+            await self._maybe_compact(collection_name, collection)
+            return len(logged)
             
         except Exception as e:
-            logger.error("Failed to add vector", 
-                        id=vector_id,
+            logger.error("Failed to add vectors", 
+                        count=len(records),
                         collection=collection_name,
                         error=str(e))
-            return False
+            return 0
     
     async def get_collection_stats(self, collection_name: str = "parts_catalog") -> Dict[str, Any]:
         """Get statistics about a vector collection"""
         
         try:
-            vectors = await self.load_vectors(collection_name)
+            collection = await self.get_collection_matrix(collection_name)
             
-            if not vectors:
+            if not len(collection):
                 return {
                     "collection_name": collection_name,
                     "count": 0,
                     "exists": False
                 }
             
-            # Calculate basic stats
-            vector_dims = len(vectors[0].get("vector", [])) if vectors else 0
-            
             # Get creation dates
-            creation_dates = [
-                v.get("created_at") for v in vectors 
-                if v.get("created_at")
-            ]
+            creation_dates = [created for created in collection.created_at if created]
             
             stats = {
                 "collection_name": collection_name,
-                "count": len(vectors),
-                "vector_dimensions": vector_dims,
+                "count": len(collection),
+                "vector_dimensions": collection.dimensions,
                 "exists": True,
                 "first_created": min(creation_dates) if creation_dates else None,
                 "last_created": max(creation_dates) if creation_dates else None
@@ -279,6 +951,9 @@ class LocalVectorStore:
     async def clear_cache(self):
         """Clear the in-memory vector cache"""
         self._vector_cache.clear()
+        self._matrix_cache.clear()
+        self._wal_counts.clear()
+        self._ann_indexes.clear()
         self._cache_loaded = False
         logger.info("Cleared vector cache")
 
@@ -286,20 +961,30 @@ class LocalVectorStore:
 class LocalPartsCatalogVectorStore(LocalVectorStore):
     """Specialized local vector store for parts catalog"""
     
+    # Metadata fields that get filter indexes
+    CATEGORICAL_FILTER_FIELDS = ("category", "material", "supplier")
+    NUMERIC_FILTER_FIELDS = ("unit_price", "availability")
+    
     def __init__(self, storage_dir: str = "data/vectors"):
         super().__init__(storage_dir)
         self.collection_name = "parts_catalog"
+        self._metadata_index: Optional[MetadataIndex] = None
+        self._metadata_index_source: Optional[CollectionMatrix] = None
     
-    async def index_part(self, part_data: Dict[str, Any], 
-                        vector: List[float]) -> bool:
-        """Index a single part with its vector"""
+    def read_all_parts(self) -> List[Dict[str, Any]]:
+        """Parts metadata read straight from disk, bypassing the caches
         
-        part_id = part_data.get("part_number") or part_data.get("id")
-        if not part_id:
-            logger.error("Part ID required for indexing")
-            return False
+        Synchronous, so it can run on a worker thread (see catalog_snapshot.py).
+        """
+        collection, _ = self._read_collection(self.collection_name)
+        if collection is None:
+            return []
+        return [metadata for metadata in collection.metadata if metadata]
+    
+    def _part_metadata(self, part_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Metadata stored alongside a part's vector"""
         
-        metadata = {
+        return {
             "part_number": part_data.get("part_number"),
             "description": part_data.get("description"),
             "category": part_data.get("category"),
@@ -310,69 +995,126 @@ class LocalPartsCatalogVectorStore(LocalVectorStore):
             "supplier": part_data.get("supplier"),
             "indexed_at": datetime.now().isoformat()
         }
+    
+    async def index_part(self, part_data: Dict[str, Any], 
+                        vector: List[float]) -> bool:
+        """Index a single part with its vector"""
+        
+        part_id = part_data.get("part_number") or part_data.get("id")
+        if not part_id:
+            logger.error("Part ID required for indexing")
+            return False
+        
+        return await self.add_vector(vector, self._part_metadata(part_data), part_id, self.collection_name)
+    
+    async def index_parts(self, parts: List[Dict[str, Any]], 
+                         vectors: List[List[float]]) -> int:
+        """Index many parts with their vectors in one write, returning the number indexed"""
+        
+        records = []
+        for part_data, vector in zip(parts, vectors):
+            part_id = part_data.get("part_number") or part_data.get("id")
+            if not part_id:
+                logger.error("Part ID required for indexing")
+                continue
+            if not vector:
+                logger.warning("Missing embedding for part", part_number=part_id)
+                continue
+            records.append({
+                "id": part_id,
+                "vector": vector,
+                "metadata": self._part_metadata(part_data)
+            })
+        
+        return await self.add_vectors(records, self.collection_name)
+    
+    def _get_metadata_index(self, collection: CollectionMatrix) -> MetadataIndex:
+        """Get the filter index for the current collection, rebuilding it if the collection was replaced"""
+        
+        if self._metadata_index is None or self._metadata_index_source is not collection:
+            self._metadata_index = MetadataIndex.build(
+                collection.metadata, self.CATEGORICAL_FILTER_FIELDS, self.NUMERIC_FILTER_FIELDS
+            )
+            self._metadata_index_source = collection
+        else:
+            self._metadata_index.sync(collection.metadata)
+        return self._metadata_index
+    
+    def _rows_changed(self, collection_name: str, collection: CollectionMatrix,
+                      rows: List[int]):
+        super()._rows_changed(collection_name, collection, rows)
+        if collection_name == self.collection_name and self._metadata_index_source is collection:
+            self._metadata_index.update_rows(collection.metadata, rows)
+    
+    def _filter_mask(self, collection: CollectionMatrix,
+                     filters: Dict[str, Any]) -> Optional[np.ndarray]:
+        """Resolve search filters to a boolean row mask (None when nothing is filtered)
+        
+        As before, a part with no value for a filtered field is not excluded by it.
+        """
+        
+        index = self._get_metadata_index(collection)
+        mask = None
+        
+        def restrict(field_name: str, matches: np.ndarray):
+            nonlocal mask
+            field_mask = matches | index.missing_mask(field_name)
+            mask = field_mask if mask is None else mask & field_mask
         
-        return await self.add_vector(vector, metadata, part_id, self.collection_name)
+        if filters.get("category"):
+            restrict("category", index.equals_mask("category", filters["category"]))
+        
+        if filters.get("material"):
+            restrict("material", index.contains_mask("material", filters["material"]))
+        
+        if filters.get("supplier"):
+            restrict("supplier", index.equals_mask("supplier", filters["supplier"]))
+        
+        if filters.get("max_price"):
+            restrict("unit_price", index.range_mask("unit_price", high=filters["max_price"]))
+        
+        if filters.get("min_availability"):
+            restrict("availability", index.range_mask("availability", low=filters["min_availability"]))
+        
+        return mask
     
     async def search_parts(self, query_vector: List[float], 
                           filters: Optional[Dict[str, Any]] = None,
                           top_k: int = 10,
                           min_similarity: float = 0.5) -> List[Dict[str, Any]]:
-        """Search for parts with optional filtering"""
+        """Search for parts with optional filtering
         
-        # Get initial results from vector search
-        results = await self.search_similar(
-            query_vector, 
-            self.collection_name, 
-            top_k * 2,  # Get more results for filtering
-            min_similarity
-        )
+        Supported filters: category, material (substring), supplier, max_price
+        and min_availability. They are resolved to a row mask before scoring,
+        so up to ``top_k`` matching parts are returned whenever they exist.
+        """
         
-        # Apply filters if provided
+        row_mask = None
         if filters:
-            filtered_results = []
-            
-            for result in results:
-                metadata = result.get("metadata", {})
-                
-                # Apply filters
-                passes_filter = True
-                
-                if filters.get("category") and metadata.get("category"):
-                    if metadata["category"].lower() != filters["category"].lower():
-                        passes_filter = False
-                
-                if filters.get("material") and metadata.get("material"):
-                    if filters["material"].lower() not in metadata["material"].lower():
-                        passes_filter = False
-                
-                if filters.get("max_price") and metadata.get("unit_price"):
-                    if metadata["unit_price"] > filters["max_price"]:
-                        passes_filter = False
-                
-                if filters.get("min_availability") and metadata.get("availability"):
-                    if metadata["availability"] < filters["min_availability"]:
-                        passes_filter = False
-                
-                if passes_filter:
-                    filtered_results.append(result)
-            
-            results = filtered_results
+            collection = await self.get_collection_matrix(self.collection_name)
+            row_mask = self._filter_mask(collection, filters)
+            if row_mask is not None and not row_mask.any():
+                return []
         
-        # Limit to requested number of results
-        return results[:top_k]
+        return await self.search_similar(
+            query_vector, 
+            self.collection_name, 
+            top_k,
+            min_similarity,
+            row_mask=row_mask
+        )
     
     async def get_part_by_number(self, part_number: str) -> Optional[Dict[str, Any]]:
         """Get specific part by part number"""
         
-        vectors = await self.load_vectors(self.collection_name)
+        collection = await self.get_collection_matrix(self.collection_name)
         
-        for vector_data in vectors:
-            metadata = vector_data.get("metadata", {})
+        for row, metadata in enumerate(collection.metadata):
             if metadata.get("part_number") == part_number:
                 return {
-                    "id": vector_data.get("id"),
+                    "id": collection.ids[row],
                     "metadata": metadata,
-                    "vector": vector_data.get("vector")
+                    "vector": collection.vector_at(row)
                 }
         
-        return None
\ No newline at end of file
+        return None
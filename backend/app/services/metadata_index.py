@@ -0,0 +1,152 @@
+"""
+Column indexes over vector metadata for pre-filtered search
+Categorical fields are dictionary-encoded so an equality or substring filter
+becomes a vectorized row bitmap; numeric fields keep a sorted array so range
+filters resolve with a binary search
+"""
+
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+# Code / value used for rows where a field is missing or unusable
+MISSING_CODE = -1
+
+
+class MetadataIndex:
+    """Row-aligned indexes over selected metadata fields of a collection
+
+    Each row keeps one code per categorical field (lower-cased value looked up
+    in a per-field vocabulary) and one float per numeric field. Masks are
+    boolean arrays over collection rows, so several filters combine with ``&``.
+    """
+
+    def __init__(self, categorical_fields: Iterable[str], numeric_fields: Iterable[str]):
+        self.categorical_fields = list(categorical_fields)
+        self.numeric_fields = list(numeric_fields)
+
+        self._vocab: Dict[str, Dict[str, int]] = {name: {} for name in self.categorical_fields}
+        self._codes: Dict[str, np.ndarray] = {
+            name: np.empty(0, dtype=np.int32) for name in self.categorical_fields
+        }
+        self._values: Dict[str, np.ndarray] = {
+            name: np.empty(0, dtype=np.float64) for name in self.numeric_fields
+        }
+        self._size = 0
+        self._capacity = 0
+
+        # Per numeric field: (row order, sorted values) over rows with a value, built lazily
+        self._sorted: Dict[str, Optional[tuple]] = {name: None for name in self.numeric_fields}
+
+    @property
+    def size(self) -> int:
+        """Number of collection rows covered by the index"""
+        return self._size
+
+    @classmethod
+    def build(cls, metadata: List[Dict[str, Any]], categorical_fields: Iterable[str],
+              numeric_fields: Iterable[str]) -> "MetadataIndex":
+        index = cls(categorical_fields, numeric_fields)
+        index.update_rows(metadata, range(len(metadata)))
+        return index
+
+    def sync(self, metadata: List[Dict[str, Any]]):
+        """Index any rows appended to ``metadata`` since the index last saw it"""
+        if len(metadata) > self._size:
+            self.update_rows(metadata, range(self._size, len(metadata)))
+
+    def update_rows(self, metadata: List[Dict[str, Any]], rows: Iterable[int]):
+        """(Re)index the given rows from the collection's metadata list"""
+
+        rows = np.fromiter(rows, dtype=np.int64)
+        if rows.size == 0:
+            return
+
+        self._reserve(max(self._size, int(rows.max()) + 1))
+
+        for name in self.categorical_fields:
+            vocab = self._vocab[name]
+            codes = self._codes[name]
+            for row in rows:
+                value = metadata[row].get(name)
+                if value:
+                    codes[row] = vocab.setdefault(str(value).lower(), len(vocab))
+                else:
+                    codes[row] = MISSING_CODE
+
+        for name in self.numeric_fields:
+            values = self._values[name]
+            for row in rows:
+                values[row] = self._as_number(metadata[row].get(name))
+            self._sorted[name] = None
+
+    def _reserve(self, rows: int):
+        """Grow the per-row arrays geometrically to hold ``rows`` rows"""
+
+        if rows <= self._size:
+            return
+
+        if rows > self._capacity:
+            self._capacity = max(rows, 2 * self._capacity, 64)
+            for name, codes in self._codes.items():
+                grown = np.full(self._capacity, MISSING_CODE, dtype=np.int32)
+                grown[:self._size] = codes[:self._size]
+                self._codes[name] = grown
+            for name, values in self._values.items():
+                grown = np.full(self._capacity, np.nan, dtype=np.float64)
+                grown[:self._size] = values[:self._size]
+                self._values[name] = grown
+
+        self._size = rows
+
+    @staticmethod
+    def _as_number(value: Any) -> float:
+        if isinstance(value, bool) or value is None:
+            return np.nan
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return np.nan
+
+    def missing_mask(self, name: str) -> np.ndarray:
+        """Rows with no usable value for a field"""
+        if name in self._codes:
+            return self._codes[name][:self._size] == MISSING_CODE
+        return np.isnan(self._values[name][:self._size])
+
+    def equals_mask(self, name: str, value: Any) -> np.ndarray:
+        """Rows whose categorical value equals ``value`` (case-insensitive)"""
+        code = self._vocab[name].get(str(value).lower())
+        if code is None:
+            return np.zeros(self._size, dtype=bool)
+        return self._codes[name][:self._size] == code
+
+    def contains_mask(self, name: str, substring: Any) -> np.ndarray:
+        """Rows whose categorical value contains ``substring`` (case-insensitive)"""
+
+        # The vocabulary is small compared to the row count, so scan it rather than the rows
+        needle = str(substring).lower()
+        matching = [code for value, code in self._vocab[name].items() if needle in value]
+        if not matching:
+            return np.zeros(self._size, dtype=bool)
+        return np.isin(self._codes[name][:self._size], matching)
+
+    def range_mask(self, name: str, low: Optional[float] = None,
+                   high: Optional[float] = None) -> np.ndarray:
+        """Rows whose numeric value lies in [low, high]; missing values never match"""
+
+        order, sorted_values = self._sorted_field(name)
+        start = np.searchsorted(sorted_values, low, side="left") if low is not None else 0
+        end = np.searchsorted(sorted_values, high, side="right") if high is not None else sorted_values.size
+
+        mask = np.zeros(self._size, dtype=bool)
+        mask[order[start:end]] = True
+        return mask
+
+    def _sorted_field(self, name: str) -> tuple:
+        if self._sorted[name] is None:
+            values = self._values[name][:self._size]
+            present = np.flatnonzero(~np.isnan(values))
+            order = present[np.argsort(values[present], kind="stable")]
+            self._sorted[name] = (order, values[order])
+        return self._sorted[name]
@@ -192,15 +192,7 @@ class PartsCatalogService:
                 return True
             
             # Index all parts
-            indexed_count = 0
-            
-            for part in self.mock_parts:
-                success = await self.index_part(part)
-                if success:
-                    indexed_count += 1
-                else:
-                    logger.warning("Failed to index part", 
-                                 part_number=part.get("part_number"))
+            indexed_count = await self.index_parts(self.mock_parts)
             
             logger.info("Parts catalog initialization completed", 
                        total_parts=len(self.mock_parts),
@@ -239,6 +231,38 @@ class PartsCatalogService:
                         error=str(e))
             return False
     
+    async def index_parts(self, parts: List[Dict[str, Any]]) -> int:
+        """Index many parts with batched embedding calls and one vector store write
+        
+        Returns the number of parts indexed.
+        """
+        
+        if not parts:
+            return 0
+        
+        try:
+            embeddings = await self.embedding_service.create_part_embeddings(parts)
+            
+            if len(embeddings) != len(parts):
+                logger.error("Embedding count does not match part count", 
+                           parts=len(parts),
+                           embeddings=len(embeddings))
+                return 0
+            
+            indexed_count = await self.vector_store.index_parts(parts, embeddings)
+            
+            logger.debug("Indexed parts", 
+                       requested=len(parts),
+                       indexed=indexed_count)
+            
+            return indexed_count
+            
+        except Exception as e:
+            logger.error("Failed to index parts", 
+                        count=len(parts),
+                        error=str(e))
+            return 0
+    
     async def search_parts(self, query: str, 
                           filters: Optional[Dict[str, Any]] = None,
                           top_k: int = 10) -> List[Dict[str, Any]]:
@@ -534,29 +558,19 @@ class PartsCatalogService:
     
     async def _process_batch(self, batch: List[Dict[str, Any]], start_row: int, end_row: int) -> int:
         """Process a batch of parts for indexing"""
-        indexed_count = 0
         
         logger.debug("Processing batch", 
                     start_row=start_row, 
                     end_row=end_row, 
                     batch_size=len(batch))
         
-        # Process parts in parallel for better performance
-        tasks = []
-        for part in batch:
-            tasks.append(self.index_part(part))
-        
-        # Wait for all indexing tasks to complete
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        indexed_count = await self.index_parts(batch)
         
-        for i, result in enumerate(results):
-            if isinstance(result, Exception):
-                logger.warning("Failed to index part in batch", 
-                             part_number=batch[i].get("part_number"),
-                             row=start_row + i,
-                             error=str(result))
-            elif result:
-                indexed_count += 1
+        if indexed_count < len(batch):
+            logger.warning("Some parts in batch were not indexed", 
+                         start_row=start_row,
+                         end_row=end_row,
+                         failed=len(batch) - indexed_count)
         
         return indexed_count
     
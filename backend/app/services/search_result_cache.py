@@ -0,0 +1,151 @@
+"""
+Result cache for parts catalog searches
+Keeps recent search_parts results in an in-process TTL + LRU cache, dropped as
+soon as the catalog's data version changes
+"""
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+import structlog
+
+logger = structlog.get_logger()
+
+CacheKey = Tuple[str, str, int]
+
+
+def normalize_query(query: str) -> str:
+    """Collapse whitespace so trivially different spellings share one entry
+
+    Case is kept: exact part-number matching in the catalog is case-sensitive.
+    """
+    return " ".join(query.split())
+
+
+def copy_results(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Copy of search results that callers may annotate (including their "scores")"""
+    return [
+        {key: dict(value) if isinstance(value, dict) else value for key, value in part.items()}
+        for part in results
+    ]
+
+
+class SearchResultCache:
+    """TTL + LRU cache of search results, scoped to one catalog version
+
+    Every lookup passes the current catalog version (see
+    SecureDatabaseManager.get_catalog_version); when it differs from the
+    version the entries were stored under, the whole cache is dropped.
+    Hit/miss counters are also reported to a MetricsCollector, if attached.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 300.0, metrics=None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.metrics = metrics
+        self._entries: "OrderedDict[CacheKey, Tuple[float, List[Dict[str, Any]]]]" = OrderedDict()
+        self._version: Optional[Hashable] = None
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "expired": 0, "invalidations": 0}
+
+    @staticmethod
+    def make_key(query: str, filters: Optional[Dict[str, Any]], top_k: int) -> CacheKey:
+        filters_key = json.dumps(filters or {}, sort_keys=True, default=str)
+        return normalize_query(query), filters_key, top_k
+
+    def _check_version(self, version: Hashable):
+        """Drop every entry if the catalog changed (caller holds the lock)"""
+        if version != self._version:
+            if self._entries:
+                self._stats["invalidations"] += 1
+                logger.info("Catalog changed, clearing search result cache",
+                            entries=len(self._entries), version=version)
+            self._entries.clear()
+            self._version = version
+
+    def get(self, key: CacheKey, version: Hashable) -> Optional[List[Dict[str, Any]]]:
+        """Cached results for ``key`` under catalog ``version``, or None"""
+        with self._lock:
+            self._check_version(version)
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] < time.monotonic():
+                del self._entries[key]
+                self._stats["expired"] += 1
+                entry = None
+
+            if entry is None:
+                self._stats["misses"] += 1
+            else:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+            hit_rate = self._hit_rate()
+
+        self._record_lookup(entry is not None, hit_rate)
+        return copy_results(entry[1]) if entry is not None else None
+
+    def put(self, key: CacheKey, version: Hashable, results: List[Dict[str, Any]]):
+        """Store results computed against catalog ``version``
+
+        Dropped if a lookup has since seen another version: the results may
+        predate a change that already cleared the cache.
+        """
+        with self._lock:
+            if self._version is not None and version != self._version:
+                return
+            self._version = version
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, copy_results(results))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def _hit_rate(self) -> float:
+        lookups = self._stats["hits"] + self._stats["misses"]
+        return self._stats["hits"] / lookups if lookups else 0.0
+
+    def _record_lookup(self, hit: bool, hit_rate: float):
+        if self.metrics is None:
+            return
+        try:
+            self.metrics.increment_counter(
+                "catalog_search_cache_hits_total" if hit else "catalog_search_cache_misses_total"
+            )
+            self.metrics.record_gauge("catalog_search_cache_hit_rate", hit_rate)
+        except Exception as e:
+            logger.warning("Failed to record search cache metrics", error=str(e))
+
+    def get_stats(self) -> Dict[str, float]:
+        """Hit/miss counters for the cache"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._entries)
+            stats["hit_rate"] = self._hit_rate()
+        return stats
+
+
+# Process-wide cache shared by every LocalPartsCatalogService instance
+_search_result_cache: Optional[SearchResultCache] = None
+_search_result_cache_lock = threading.Lock()
+
+
+def get_search_result_cache() -> SearchResultCache:
+    """Get the global search result cache, configured from CATALOG_SEARCH_CACHE_* env vars
+
+    Set CATALOG_SEARCH_CACHE_ENTRIES to 0 to disable caching.
+    """
+    global _search_result_cache
+    if _search_result_cache is None:
+        with _search_result_cache_lock:
+            if _search_result_cache is None:
+                _search_result_cache = SearchResultCache(
+                    max_entries=int(os.getenv("CATALOG_SEARCH_CACHE_ENTRIES", "1024")),
+                    ttl_seconds=float(os.getenv("CATALOG_SEARCH_CACHE_TTL_SECONDS", "300"))
+                )
+    return _search_result_cache
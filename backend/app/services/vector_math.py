@@ -0,0 +1,56 @@
+"""
+Shared NumPy helpers for cosine-similarity scoring and top-k selection
+"""
+
+from typing import Sequence, Union
+
+import numpy as np
+
+VectorLike = Union[Sequence[float], np.ndarray]
+MatrixLike = Union[Sequence[Sequence[float]], np.ndarray]
+
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """L2-normalize each row in place, leaving zero rows as zeros"""
+    if matrix.size == 0:
+        return matrix
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    np.divide(matrix, norms, out=matrix, where=norms > 0)
+    return matrix
+
+
+def as_normalized_matrix(vectors: MatrixLike) -> np.ndarray:
+    """Copy vectors into a 2-D float32 matrix with L2-normalized rows"""
+    matrix = np.array(vectors, dtype=np.float32, ndmin=2)
+    return normalize_rows(matrix)
+
+
+def top_k_indices(scores: np.ndarray, top_k: int) -> np.ndarray:
+    """Indices of the top_k highest scores, sorted descending"""
+    if top_k <= 0 or scores.size == 0:
+        return np.empty(0, dtype=np.int64)
+    if top_k < scores.size:
+        candidates = np.argpartition(-scores, top_k - 1)[:top_k]
+    else:
+        candidates = np.arange(scores.size)
+    return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+
+def top_k_indices_2d(scores: np.ndarray, top_k: int) -> np.ndarray:
+    """Row-wise top_k column indices of an (m, n) score matrix, each row sorted descending"""
+    rows, cols = scores.shape
+    top_k = min(top_k, cols)
+    if top_k <= 0:
+        return np.empty((rows, 0), dtype=np.int64)
+    if top_k < cols:
+        candidates = np.argpartition(-scores, top_k - 1, axis=1)[:, :top_k]
+    else:
+        candidates = np.broadcast_to(np.arange(cols), (rows, cols))
+    candidate_scores = np.take_along_axis(scores, candidates, axis=1)
+    order = np.argsort(-candidate_scores, axis=1, kind="stable")
+    return np.take_along_axis(candidates, order, axis=1)
+
+
+def cosine_similarity_matrix(queries: MatrixLike, candidates: MatrixLike) -> np.ndarray:
+    """(m, n) cosine similarities between m queries and n candidates as one GEMM"""
+    return as_normalized_matrix(queries) @ as_normalized_matrix(candidates).T
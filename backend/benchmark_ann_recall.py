@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Measure recall@k and latency of the IVF vector index against the exact scan
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+import numpy as np
+
+# Add the app directory to the path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from app.services.ivf_index import IVFIndex
+from app.services.local_vector_store import LocalVectorStore
+from app.services.vector_math import normalize_rows, top_k_indices
+
+
+def synthetic_matrix(rows: int, dimensions: int, clusters: int, seed: int) -> np.ndarray:
+    """Clustered unit vectors, closer to real embeddings than uniform noise"""
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((clusters, dimensions)).astype(np.float32)
+    labels = rng.integers(0, clusters, size=rows)
+    noise = rng.standard_normal((rows, dimensions)).astype(np.float32) * 0.6
+    return normalize_rows(centers[labels] + noise)
+
+
+async def load_matrix(args) -> np.ndarray:
+    if args.collection:
+        store = LocalVectorStore(args.storage_dir)
+        collection = await store.get_collection_matrix(args.collection)
+        if not len(collection):
+            raise SystemExit(f"Collection '{args.collection}' is empty or missing")
+        return np.asarray(collection.matrix)
+    return synthetic_matrix(args.rows, args.dimensions, args.clusters, args.seed)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Benchmark IVF recall@k and latency against exact search")
+    parser.add_argument("--collection", help="Benchmark an existing collection instead of synthetic data")
+    parser.add_argument("--storage-dir", default="data/vectors", help="Vector storage directory (default: data/vectors)")
+    parser.add_argument("--rows", type=int, default=100000, help="Synthetic rows (default: 100000)")
+    parser.add_argument("--dimensions", type=int, default=256, help="Synthetic dimensions (default: 256)")
+    parser.add_argument("--clusters", type=int, default=200, help="Synthetic cluster count (default: 200)")
+    parser.add_argument("--queries", type=int, default=200, help="Number of queries (default: 200)")
+    parser.add_argument("--top-k", type=int, default=10, help="k for recall@k (default: 10)")
+    parser.add_argument("--n-lists", type=int, help="IVF lists (default: ~4*sqrt(rows))")
+    parser.add_argument("--n-probe", type=int, nargs="+", default=[1, 4, 8, 16, 32],
+                        help="n_probe values to sweep (default: 1 4 8 16 32)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (default: 0)")
+    args = parser.parse_args()
+
+    matrix = await load_matrix(args)
+    rng = np.random.default_rng(args.seed + 1)
+
+    # Queries are perturbed copies of stored rows, like near-duplicate part descriptions
+    query_rows = rng.choice(matrix.shape[0], size=min(args.queries, matrix.shape[0]), replace=False)
+    queries = normalize_rows(
+        matrix[query_rows] + rng.standard_normal((query_rows.size, matrix.shape[1])).astype(np.float32) * 0.05
+    )
+
+    print(f"📊 {matrix.shape[0]} vectors x {matrix.shape[1]} dims, {queries.shape[0]} queries, k={args.top_k}")
+
+    start = time.perf_counter()
+    truth = []
+    for query in queries:
+        truth.append(set(top_k_indices(matrix @ query, args.top_k).tolist()))
+    exact_ms = (time.perf_counter() - start) * 1000 / queries.shape[0]
+    print(f"   exact scan: {exact_ms:.2f} ms/query")
+
+    start = time.perf_counter()
+    index = IVFIndex(n_lists=args.n_lists, seed=args.seed)
+    index.train(matrix)
+    print(f"   trained {index.n_lists} lists in {time.perf_counter() - start:.2f}s")
+    print()
+    print(f"   {'n_probe':>8} {'recall@k':>9} {'ms/query':>9} {'speedup':>8} {'scanned':>8}")
+
+    for n_probe in args.n_probe:
+        hits = 0
+        scanned = 0
+        start = time.perf_counter()
+        for query, expected in zip(queries, truth):
+            rows, _ = index.search(matrix, query, args.top_k, n_probe)
+            hits += len(expected.intersection(rows.tolist()))
+        elapsed_ms = (time.perf_counter() - start) * 1000 / queries.shape[0]
+
+        for query in queries:
+            scanned += index.candidate_rows(query, n_probe).size
+
+        recall = hits / (len(truth) * args.top_k)
+        print(f"   {n_probe:>8} {recall:>9.3f} {elapsed_ms:>9.2f} {exact_ms / elapsed_ms:>7.1f}x "
+              f"{scanned / queries.shape[0] / matrix.shape[0]:>7.1%}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
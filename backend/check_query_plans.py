@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Fail if any canonical parts catalog query is planned as a full table scan
+Run after migrate_database.py, and in CI against a generated catalog
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+from pathlib import Path
+
+# Add the app directory to the path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from app.database.query_plans import check_query_plans
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check EXPLAIN QUERY PLAN for the canonical catalog queries")
+    parser.add_argument(
+        "--db",
+        default=str(Path(__file__).parent / "parts_catalog.db"),
+        help="Path to parts_catalog.db (default: next to this script)"
+    )
+    parser.add_argument(
+        "--verbose",
+        action="store_true",
+        help="Print the full plan of every query, not just failing ones"
+    )
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        print(f"❌ Database not found: {args.db}")
+        return 1
+
+    # Read-only: the check must never modify the catalog
+    conn = sqlite3.connect(f"file:{args.db}?mode=ro", uri=True)
+    try:
+        reports = check_query_plans(conn)
+    finally:
+        conn.close()
+
+    failures = 0
+    for report in reports:
+        if report.ok:
+            note = f" ({len(report.temp_sorts)} temp sort)" if report.temp_sorts else ""
+            print(f"✅ {report.name}{note}")
+            for step in report.allowed_scans:
+                print(f"      allowed full scan: {step}")
+        else:
+            failures += 1
+            reason = report.error or "full scan: " + "; ".join(report.full_scans)
+            print(f"❌ {report.name}: {reason}")
+
+        if args.verbose or not report.ok:
+            for step in report.plan:
+                print(f"      {step}")
+
+    print(f"\n{len(reports) - failures}/{len(reports)} queries use an index")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
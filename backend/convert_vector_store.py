@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Convert legacy JSON vector collections to the binary (.npy + sidecar) format
+used by LocalVectorStore
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+
+# Add the app directory to the path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from app.services.local_vector_store import LocalVectorStore
+
+
+async def main():
+    parser = argparse.ArgumentParser(
+        description="Convert {collection}.json vector files to the memory-mappable binary format"
+    )
+    parser.add_argument(
+        "collections",
+        nargs="*",
+        help="Collection names to convert (default: every *.json collection in the storage dir)"
+    )
+    parser.add_argument(
+        "--storage-dir",
+        default="data/vectors",
+        help="Vector storage directory (default: data/vectors)"
+    )
+    parser.add_argument(
+        "--remove-json",
+        action="store_true",
+        help="Delete each JSON file after it has been converted successfully"
+    )
+    args = parser.parse_args()
+
+    store = LocalVectorStore(args.storage_dir)
+
+    collections = args.collections or sorted(
+        path.stem for path in store.storage_dir.glob("*.json")
+        if not path.name.endswith(".meta.json")
+    )
+    if not collections:
+        print(f"No JSON collections found in {store.storage_dir}")
+        return 1
+
+    for collection_name in collections:
+        try:
+            count = await store.convert_json_collection(collection_name)
+        except Exception as e:
+            print(f"❌ {collection_name}: {e}")
+            return 1
+
+        print(f"✅ {collection_name}: {count} vectors -> {store._get_matrix_path(collection_name)}")
+
+        if args.remove_json:
+            store._get_collection_path(collection_name).unlink()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
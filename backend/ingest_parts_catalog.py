@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Stream a parts catalog export (CSV, JSON or JSON Lines) into parts_catalog.db
+Creates the database if needed; existing parts are updated in place, so the
+same command applies price and stock delta files
+"""
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+# Add the app directory to the path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from app.database.ingestion import ensure_catalog_schema, iter_records, load_catalog
+from app.database.migrations import connect_for_migration
+from app.database.sharding import SHARD_KEYS
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk-load parts into the catalog database")
+    parser.add_argument("files", nargs="+", help="Catalog files (.csv, .json, .jsonl)")
+    parser.add_argument(
+        "--db",
+        default=str(Path(__file__).parent / "parts_catalog.db"),
+        help="Path to parts_catalog.db (default: next to this script)"
+    )
+    parser.add_argument(
+        "--shards",
+        help="Comma-separated shard databases to route parts into instead of --db "
+             "(same order as CATALOG_DB_SHARDS)"
+    )
+    parser.add_argument(
+        "--shard-key",
+        choices=SHARD_KEYS,
+        default="part_number",
+        help="Column the shards are partitioned by (default: part_number)"
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=10000,
+        help="Rows per executemany call (default: 10000)"
+    )
+    parser.add_argument(
+        "--transaction-size",
+        type=int,
+        default=100000,
+        help="Rows per committed transaction (default: 100000)"
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Keep indexes and FTS triggers live instead of rebuilding them; "
+             "faster for small delta files against a large catalog"
+    )
+    args = parser.parse_args()
+
+    paths = [path.strip() for path in args.shards.split(",")] if args.shards else [args.db]
+
+    for file in args.files:
+        if not os.path.exists(file):
+            print(f"❌ File not found: {file}")
+            return 1
+
+    conns = [connect_for_migration(path) for path in paths]
+    try:
+        for conn in conns:
+            ensure_catalog_schema(conn)
+
+        for file in args.files:
+            print(f"📥 Loading {file} into {len(conns)} database(s)...")
+            stats = load_catalog(
+                conns,
+                iter_records(file),
+                shard_key=args.shard_key,
+                batch_size=args.batch_size,
+                transaction_size=args.transaction_size,
+                defer_indexes=not args.incremental
+            )
+            print(
+                f"✅ {stats.rows_read:,} records in {stats.elapsed:.1f}s "
+                f"({stats.rows_per_second:,.0f}/s): {stats.inserted:,} inserted, "
+                f"{stats.updated:,} updated, {stats.skipped:,} skipped"
+            )
+        return 0
+
+    except Exception as e:
+        print(f"❌ Ingestion failed: {e}")
+        return 1
+    finally:
+        for conn in conns:
+            conn.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
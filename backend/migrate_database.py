@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Apply schema migrations to the local parts catalog database and rebuild its
+full-text search indexes
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+# Add the app directory to the path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from app.database.migrations import (
+    MIGRATIONS,
+    apply_migrations,
+    connect_for_migration,
+    get_applied_migrations,
+    rebuild_search_index,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Migrate the parts catalog database schema")
+    parser.add_argument(
+        "--db",
+        default=str(Path(__file__).parent / "parts_catalog.db"),
+        help="Path to parts_catalog.db (default: next to this script)"
+    )
+    parser.add_argument(
+        "--list",
+        action="store_true",
+        help="Show applied and pending migrations without changing anything"
+    )
+    parser.add_argument(
+        "--rebuild-search-index",
+        action="store_true",
+        help="Repopulate and optimize the FTS5 tables from parts_catalog after migrating"
+    )
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        print(f"❌ Database not found: {args.db}")
+        return 1
+
+    conn = connect_for_migration(args.db)
+    try:
+        if args.list:
+            applied = set(get_applied_migrations(conn))
+            for version, _ in MIGRATIONS:
+                print(f"{'✅' if version in applied else '⏳'} {version}")
+            return 0
+
+        start = time.time()
+        applied = apply_migrations(conn)
+        for version in applied:
+            print(f"✅ Applied {version}")
+        if not applied:
+            print("Database schema is up to date")
+
+        if args.rebuild_search_index and "001_fts5_search_index" not in applied:
+            conn.execute("BEGIN")
+            rebuild_search_index(conn)
+            conn.execute("COMMIT")
+            print("✅ Rebuilt full-text search indexes")
+
+        print(f"Done in {time.time() - start:.1f}s")
+        return 0
+
+    except Exception as e:
+        print(f"❌ Migration failed: {e}")
+        return 1
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
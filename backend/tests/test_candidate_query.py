@@ -0,0 +1,137 @@
+"""
+search_parts candidate retrieval: the single UNION ALL query returns the
+same candidates, sources and source counts as running each strategy as its
+own query and combining the results in Python - on one database and on a
+sharded catalog
+"""
+
+import asyncio
+import random
+
+import pytest
+
+from app.database.connection_pool import SecureDatabaseManager
+from app.database.ingestion import ensure_catalog_schema, load_catalog
+from app.database.migrations import connect_for_migration
+from app.services.local_parts_catalog import LocalPartsCatalogService
+
+LIMIT = 10
+
+QUERIES = [
+    "BOL-000012",     # exact part number
+    "BOL-00001",      # partial part number
+    "hex bolt",
+    "stainless",
+    "m6",             # shorter than the trigram index's minimum
+    "washer 304",
+    "0.5in",
+    "no such part",
+]
+FILTERS = [None, {"category": "Fasteners", "material": "Steel", "price_range": {"min": 5, "max": 60}}]
+
+WORDS = "hex bolt nut washer flat lock stainless steel brass 304 316 m6 m8 0.5in zinc plated socket cap".split()
+
+
+def _parts(count=300, seed=31):
+    rng = random.Random(seed)
+    prices = rng.sample(range(100, 10000), count)
+    return [
+        {
+            "part_number": f"{rng.choice(['BOL', 'NUT', 'WSH'])}-{i:06d}",
+            "description": " ".join(rng.choice(WORDS) for _ in range(rng.randint(2, 8))),
+            "category": rng.choice(["Fasteners", "Hardware"]),
+            "material": rng.choice(["Steel", "Stainless Steel", "Brass"]),
+            "list_price": prices[i] / 100,
+            "active": 0 if i % 17 == 0 else 1,
+        }
+        for i in range(count)
+    ]
+
+
+def _catalog(paths, parts):
+    conns = []
+    for path in paths:
+        conn = connect_for_migration(str(path))
+        ensure_catalog_schema(conn)
+        conns.append(conn)
+    load_catalog(conns, parts)
+    for conn in conns:
+        conn.close()
+    return [str(path) for path in paths]
+
+
+def _multi_query_candidates(manager, query, filters):
+    """One query per strategy, combined as search_parts used to"""
+    term = query.strip()
+    branches = []
+
+    exact = manager.get_part_by_number_safe(term)
+    branches.append(("exact_part_number", [exact] if exact else []))
+    if not exact:
+        branches.append(("partial_part_number", manager.execute_query(
+            """SELECT *, CASE WHEN part_number = ? THEN 1 WHEN part_number LIKE ? THEN 2 ELSE 3 END
+                AS match_rank
+            FROM parts_catalog WHERE part_number LIKE ? AND active = 1
+            ORDER BY match_rank, part_number
+            LIMIT 20""",
+            (term, f"{term}%", f"%{term}%"),
+            order_by=("match_rank", "part_number"), limit=20
+        ).rows))
+
+    # As search_parts_full_text_safe, but equal ranks are now cut by part
+    # number rather than row order, and inactive parts are left out like in
+    # every other branch
+    full_text = manager.execute_query(
+        """SELECT p.*, f.rank AS search_rank FROM parts_search f JOIN parts_catalog p ON p.id = f.rowid
+        WHERE parts_search MATCH ? ORDER BY search_rank, p.part_number LIMIT ?""",
+        (manager.fts_match_expression(term), LIMIT),
+        order_by=("search_rank", "part_number"), limit=LIMIT
+    ).rows
+    branches.append(("full_text", [row for row in full_text if row["active"] == 1]))
+    branches.append(("description", manager.execute_safe_search(term, limit=LIMIT).rows))
+
+    if filters:
+        conditions = [
+            "active = 1", "category = ?", "material LIKE ?",
+            "list_price >= ?", "list_price <= ?", "description LIKE ?",
+        ]
+        branches.append(("filtered", manager.execute_query(
+            f"SELECT * FROM parts_catalog WHERE {' AND '.join(conditions)} ORDER BY list_price ASC LIMIT ?",
+            (filters["category"], f"%{filters['material']}%", filters["price_range"]["min"],
+             filters["price_range"]["max"], f"%{term}%", LIMIT),
+            order_by=("list_price",), limit=LIMIT
+        ).rows))
+
+    combined = {}
+    for match_type, rows in branches:
+        for row in rows:
+            entry = combined.setdefault(row["part_number"], [match_type, 0])
+            entry[1] += 1
+    return {part_number: tuple(entry) for part_number, entry in combined.items()}
+
+
+def _single_query_candidates(service, filters):
+    candidates = asyncio.run(service._retrieve_candidates(QUERIES, filters, LIMIT))
+    return [
+        {row["part_number"]: (row["match_type"], row["source_count"]) for row in rows}
+        for rows in candidates
+    ]
+
+
+@pytest.mark.parametrize("filters", FILTERS)
+def test_single_query_matches_per_strategy_queries(tmp_path, filters):
+    parts = _parts()
+    single = SecureDatabaseManager(_catalog([tmp_path / "catalog.db"], parts)[0])
+    sharded = SecureDatabaseManager(shard_paths=_catalog(
+        [tmp_path / "shard_0.db", tmp_path / "shard_1.db"], parts
+    ))
+
+    service = LocalPartsCatalogService()
+    for manager in (single, sharded):
+        service.db_manager = manager
+        found = _single_query_candidates(service, filters)
+        for query, candidates in zip(QUERIES, found):
+            # Shards rank full-text hits by their own bm25 statistics, so each
+            # catalog is compared with per-strategy queries against itself
+            assert candidates == _multi_query_candidates(manager, query, filters), (query, manager.is_sharded)
+        assert any(len(candidates) > LIMIT for candidates in found)
@@ -0,0 +1,54 @@
+"""
+Catalog snapshot reloads: callers keep the old snapshot while a single
+background reload runs
+"""
+
+import asyncio
+import threading
+import time
+
+from app.services.catalog_snapshot import CatalogSnapshotService
+
+
+def test_reload_runs_in_background(tmp_path):
+    version = [1]
+    loads = []
+    release = threading.Event()
+
+    service = CatalogSnapshotService(str(tmp_path), check_interval=0, catalog_version=lambda: version[0])
+
+    def read_all_parts():
+        loads.append(version[0])
+        release.wait(5)
+        return [{"part_number": f"P-{version[0]}"}]
+
+    service.vector_store.read_all_parts = read_all_parts
+
+    async def scenario():
+        # Nothing to serve yet: the first load is waited for
+        release.set()
+        first = await service.get_snapshot()
+        assert first.parts[0]["part_number"] == "P-1"
+
+        # Changed catalog: every caller gets the old snapshot right away
+        release.clear()
+        version[0] = 2
+        snapshots = await asyncio.wait_for(
+            asyncio.gather(*(service.get_snapshot() for _ in range(10))), timeout=1
+        )
+        assert all(snapshot is first for snapshot in snapshots)
+        deadline = time.monotonic() + 5
+        while len(loads) < 2 and time.monotonic() < deadline:
+            await asyncio.sleep(0.01)
+        assert loads == [1, 2]
+
+        release.set()
+        deadline = time.monotonic() + 5
+        while service.reload_count < 2 and time.monotonic() < deadline:
+            await asyncio.sleep(0.01)
+
+        second = await service.get_snapshot()
+        assert second.parts[0]["part_number"] == "P-2"
+        assert loads == [1, 2]
+
+    asyncio.run(scenario())
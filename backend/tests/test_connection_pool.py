@@ -0,0 +1,51 @@
+"""
+Result rows are labelled with the columns of the cursor that produced them,
+even when the same SQL text yields a different column layout
+"""
+
+import sqlite3
+
+from app.database.connection_pool import CatalogRow, SecureDatabaseManager
+
+
+def _create(path, columns):
+    conn = sqlite3.connect(path)
+    conn.execute(f"CREATE TABLE parts_catalog ({', '.join(columns)})")
+    conn.commit()
+    return conn
+
+
+def test_rows_follow_each_shards_column_order(tmp_path):
+    paths = [str(tmp_path / "shard_0.db"), str(tmp_path / "shard_1.db")]
+    for path, columns in zip(paths, (["part_number", "description"], ["description", "part_number"])):
+        conn = _create(path, columns)
+        conn.execute("INSERT INTO parts_catalog (part_number, description) VALUES (?, ?)",
+                     (f"P-{path[-4]}", "washer"))
+        conn.commit()
+        conn.close()
+
+    manager = SecureDatabaseManager(paths[0], shard_paths=paths)
+    for row_type in (dict, CatalogRow):
+        rows = manager.execute_query("SELECT * FROM parts_catalog", row_type=row_type).rows
+        assert sorted(row["part_number"] for row in rows) == ["P-0", "P-1"]
+        assert {row["description"] for row in rows} == {"washer"}
+
+
+def test_rows_follow_a_renamed_column(tmp_path):
+    path = str(tmp_path / "catalog.db")
+    conn = _create(path, ["part_number", "description"])
+    conn.execute("INSERT INTO parts_catalog VALUES ('P-1', 'washer')")
+    conn.commit()
+
+    manager = SecureDatabaseManager(path)
+    query = "SELECT * FROM parts_catalog"
+    assert dict(manager.execute_query(query, row_type=CatalogRow).rows[0]) == {
+        "part_number": "P-1", "description": "washer"
+    }
+
+    conn.execute("ALTER TABLE parts_catalog RENAME COLUMN description TO notes")
+    conn.commit()
+    conn.close()
+    assert dict(manager.execute_query(query, row_type=CatalogRow).rows[0]) == {
+        "part_number": "P-1", "notes": "washer"
+    }
@@ -0,0 +1,62 @@
+"""
+Embedding cache: vectors keyed by (model, dimensions, sha256(text)) in an LRU
+in front of SQLite, and EmbeddingService only embedding texts it has not seen
+"""
+
+import asyncio
+
+import pytest
+
+from app.services.embedding_cache import EmbeddingCache
+from app.services.embedding_scheduler import EmbeddingBatchScheduler
+from app.services.embeddings import EmbeddingService
+
+
+def test_memory_and_disk_tiers(tmp_path):
+    path = str(tmp_path / "embeddings.db")
+    cache = EmbeddingCache(path, max_memory_entries=2)
+    cache.put_many("model", 3, ["a", "b", "c"], [[1, 0, 0], [0, 1, 0], [0, 0, 1]])
+
+    # "a" was evicted from memory but is still on disk
+    assert cache.get_many("model", 3, ["a", "c", "missing"]) == {
+        "a": pytest.approx([1, 0, 0]), "c": pytest.approx([0, 0, 1])
+    }
+    stats = cache.get_stats()
+    assert (stats["memory_hits"], stats["disk_hits"], stats["misses"]) == (1, 1, 1)
+
+    # Another process (or a restart) reads the same store
+    reopened = EmbeddingCache(path)
+    assert reopened.get_many("model", 3, ["b"]) == {"b": pytest.approx([0, 1, 0])}
+
+
+def test_model_and_dimensions_are_part_of_the_key(tmp_path):
+    cache = EmbeddingCache(str(tmp_path / "embeddings.db"))
+    cache.put_many("model", 2, ["a"], [[1, 2]])
+    assert cache.get_many("other-model", 2, ["a"]) == {}
+    assert cache.get_many("model", 3, ["a"]) == {}
+
+    memory_only = EmbeddingCache(None)
+    memory_only.put_many("model", 2, ["a"], [[1, 2]])
+    assert memory_only.get_many("model", 2, ["a"]) == {"a": pytest.approx([1, 2])}
+
+
+def test_service_embeds_only_uncached_texts(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    monkeypatch.setenv("EMBEDDING_PROVIDER", "openai")
+    service = EmbeddingService(cache=EmbeddingCache(None),
+                               scheduler=EmbeddingBatchScheduler(base_delay=0))
+    requests = []
+
+    async def embed(batch):
+        requests.append(list(batch))
+        return [[float(len(text)), 1.0] for text in batch]
+
+    monkeypatch.setattr(service, "_embed_openai_batch", embed)
+
+    first = asyncio.run(service.generate_embeddings(["bolt", "nut", "bolt"], batch_size=1))
+    assert first == [[4.0, 1.0], [3.0, 1.0], [4.0, 1.0]]
+    assert requests == [["bolt"], ["nut"]]
+
+    second = asyncio.run(service.generate_embeddings(["washer", "nut", "bolt"]))
+    assert second == [[6.0, 1.0], [3.0, 1.0], [4.0, 1.0]]
+    assert requests[2:] == [["washer"]]
@@ -0,0 +1,66 @@
+"""
+Embedding batch scheduler: results in batch order, bounded concurrency,
+retries for transient errors only, and no partial results on failure
+"""
+
+import asyncio
+
+import pytest
+
+from app.services.embedding_scheduler import EmbeddingBatchError, EmbeddingBatchScheduler
+
+
+def test_results_keep_batch_order_under_bounded_concurrency():
+    scheduler = EmbeddingBatchScheduler(max_concurrency=2, base_delay=0)
+    running = []
+    peak = [0]
+
+    async def call(batch):
+        running.append(batch)
+        peak[0] = max(peak[0], len(running))
+        # Later batches finish first
+        await asyncio.sleep(0.01 * (5 - int(batch[0])))
+        running.remove(batch)
+        return [f"v{text}" for text in batch]
+
+    batches = [[str(i)] for i in range(5)]
+    results = asyncio.run(scheduler.run(batches, call))
+    assert results == [[f"v{i}"] for i in range(5)]
+    assert peak[0] == 2
+
+
+def test_transient_errors_are_retried():
+    scheduler = EmbeddingBatchScheduler(max_retries=2, base_delay=0)
+    attempts = []
+
+    async def call(batch):
+        attempts.append(batch[0])
+        if len(attempts) < 3:
+            raise ConnectionError("reset")
+        return ["ok"]
+
+    assert asyncio.run(scheduler.run([["a"]], call)) == [["ok"]]
+    assert attempts == ["a", "a", "a"]
+
+
+def test_failed_batch_cancels_the_rest():
+    scheduler = EmbeddingBatchScheduler(max_concurrency=4, max_retries=3, base_delay=0)
+    attempts = []
+    cancelled = []
+
+    async def call(batch):
+        attempts.append(batch[0])
+        if batch[0] == "bad":
+            raise ValueError("rejected")
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.append(batch[0])
+            raise
+        return ["ok"]
+
+    with pytest.raises(EmbeddingBatchError):
+        asyncio.run(scheduler.run([["slow"], ["bad"]], call, is_retryable=lambda e: not isinstance(e, ValueError)))
+    # Not retried, and the other batch does not run on in the background
+    assert attempts == ["slow", "bad"]
+    assert cancelled == ["slow"]
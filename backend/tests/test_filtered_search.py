@@ -0,0 +1,116 @@
+"""
+Filtered parts search: the row mask built from MetadataIndex selects the same
+parts as the per-record filter it replaced, and searching with it returns the
+best matching parts instead of filtering a fixed-size shortlist
+"""
+
+import asyncio
+import random
+
+import numpy as np
+import pytest
+
+from app.services.local_vector_store import LocalPartsCatalogVectorStore
+
+DIMENSIONS = 16
+
+FILTERS = [
+    {"category": "Fasteners"},
+    {"category": "fasteners", "material": "steel"},
+    {"material": "STAIN"},
+    {"max_price": 20},
+    {"min_availability": 10},
+    {"supplier": "acme"},
+    {"category": "Bearings", "max_price": 50, "min_availability": 1},
+    {"category": "No Such Category"},
+]
+
+
+def _parts(count=600, seed=21):
+    rng = random.Random(seed)
+    parts = []
+    for i in range(count):
+        parts.append({
+            "part_number": f"P-{i:04d}",
+            "description": f"Part {i}",
+            "category": rng.choice(["Fasteners", "FASTENERS", "Bearings", "Seals", "", None]),
+            "material": rng.choice(["Stainless Steel", "Carbon steel", "Brass", "nylon", None]),
+            "supplier": rng.choice(["Acme", "ACME", "Globex", None]),
+            "unit_price": rng.choice([0, None, round(rng.uniform(1, 100), 2)]),
+            "availability": rng.choice([0, None, rng.randint(1, 50)]),
+        })
+    return parts
+
+
+def _passes(metadata, filters):
+    """The per-record filter search_parts used to apply (a missing value passes)
+
+    Apart from supplier, which is a new filter, and an availability of 0,
+    which no longer counts as missing.
+    """
+    if filters.get("category") and metadata.get("category"):
+        if metadata["category"].lower() != filters["category"].lower():
+            return False
+    if filters.get("material") and metadata.get("material"):
+        if filters["material"].lower() not in metadata["material"].lower():
+            return False
+    if filters.get("supplier") and metadata.get("supplier"):
+        if metadata["supplier"].lower() != filters["supplier"].lower():
+            return False
+    if filters.get("max_price") and metadata.get("unit_price"):
+        if metadata["unit_price"] > filters["max_price"]:
+            return False
+    if filters.get("min_availability") and metadata.get("availability") is not None:
+        if metadata["availability"] < filters["min_availability"]:
+            return False
+    return True
+
+
+def _store(tmp_path, parts):
+    vectors = np.random.default_rng(22).standard_normal((len(parts), DIMENSIONS))
+    store = LocalPartsCatalogVectorStore(str(tmp_path))
+    asyncio.run(store.index_parts(parts, vectors.tolist()))
+    return store, vectors
+
+
+@pytest.mark.parametrize("filters", FILTERS)
+def test_mask_matches_per_record_filter(tmp_path, filters):
+    store, _ = _store(tmp_path, _parts())
+
+    async def mask():
+        collection = await store.get_collection_matrix(store.collection_name)
+        return collection, store._filter_mask(collection, filters)
+
+    collection, row_mask = asyncio.run(mask())
+    expected = [_passes(metadata, filters) for metadata in collection.metadata]
+    assert row_mask.tolist() == expected
+
+
+def test_search_returns_best_matching_parts(tmp_path):
+    parts = _parts()
+    store, vectors = _store(tmp_path, parts)
+    normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    rng = np.random.default_rng(23)
+
+    async def scenario():
+        collection = await store.get_collection_matrix(store.collection_name)
+        for filters in FILTERS:
+            query = rng.standard_normal(DIMENSIONS)
+            scores = normalized @ (query / np.linalg.norm(query))
+            matching = [
+                row for row, metadata in enumerate(collection.metadata) if _passes(metadata, filters)
+            ]
+            expected = sorted(matching, key=lambda row: -scores[row])[:10]
+
+            results = await store.search_parts(query.tolist(), filters, top_k=10, min_similarity=-1.0)
+            assert [r["id"] for r in results] == [parts[row]["part_number"] for row in expected], filters
+
+            # Through an IVF index, selective filters still fill top_k with matching parts
+            await store.build_ann_index(n_lists=8, n_probe=1)
+            results = await store.search_parts(query.tolist(), filters, top_k=10, min_similarity=-1.0)
+            await store.drop_ann_index()
+            ids = {parts[row]["part_number"] for row in matching}
+            assert len(results) == min(10, len(matching)), filters
+            assert all(r["id"] in ids for r in results), filters
+
+    asyncio.run(scenario())
@@ -0,0 +1,91 @@
+"""
+FuzzyTextIndex against the full scan it replaces: every text scored with
+partial_ratio, stable-sorted by score, first term winning ties
+"""
+
+import random
+
+import pytest
+
+from app.services import fuzzy_index
+from app.services.fuzzy_index import FuzzyTextIndex, partial_ratio
+
+WORDS = (
+    "stainless steel 304 316 ss bar round hex sheet plate aluminum 6061 t6 brass c360 "
+    "tube pipe bolt washer nut 1/4-20 x 2 in od id length wall 0.065 grade a36 carbon"
+).split()
+
+TERM_SETS = [
+    ["alumnum bar"],
+    ["304 ss"],
+    ["stainles steel sheet", "ss sheet"],
+    ["brass c360 hex"],
+    ["bolt"],
+    ["1/4-20 x 2 hex bolt grade 5"],
+    ["tube 0.065 wall", "pipe"],
+    ["xy"],
+]
+
+
+def _texts(count=600, seed=3):
+    rng = random.Random(seed)
+    texts = []
+    for _ in range(count):
+        words = [rng.choice(WORDS) for _ in range(rng.randint(2, 25))]
+        if rng.random() < 0.3:
+            # Misspell a word
+            i = rng.randrange(len(words))
+            word = words[i]
+            j = rng.randrange(len(word))
+            words[i] = word[:j] + word[j + 1:]
+        texts.append(" ".join(words))
+    return texts
+
+
+def _full_scan(texts, terms, threshold, limit, row_filter=None):
+    matches = []
+    for row, text in enumerate(texts):
+        if row_filter is not None and not row_filter(row):
+            continue
+        best_score, best_term = 0, 0
+        for term_index, term in enumerate(terms):
+            score = partial_ratio(term.lower(), text.lower())
+            if score > best_score:
+                best_score, best_term = score, term_index
+        if best_score >= threshold:
+            matches.append((row, best_score, best_term))
+    matches.sort(key=lambda match: match[1], reverse=True)
+    return matches[:limit]
+
+
+@pytest.mark.parametrize("rapidfuzz", [True, False])
+@pytest.mark.parametrize("threshold", [50, 70, 85])
+def test_search_matches_full_scan(monkeypatch, rapidfuzz, threshold):
+    if rapidfuzz and not fuzzy_index.RAPIDFUZZ_AVAILABLE:
+        pytest.skip("rapidfuzz not installed")
+    monkeypatch.setattr(fuzzy_index, "RAPIDFUZZ_AVAILABLE", rapidfuzz)
+
+    texts = _texts()
+    index = FuzzyTextIndex(texts)
+    for terms in TERM_SETS:
+        expected = _full_scan(texts, terms, threshold, 20)
+        found = [(m.row, m.score, m.term_index) for m in index.search(terms, threshold, 20)]
+        assert found == expected, terms
+
+
+def test_search_with_row_filter_matches_full_scan():
+    texts = _texts(seed=5)
+    index = FuzzyTextIndex(texts)
+    row_filter = lambda row: row % 3 == 0
+    for terms in TERM_SETS:
+        expected = _full_scan(texts, terms, 60, 20, row_filter)
+        found = [(m.row, m.score, m.term_index) for m in index.search(terms, 60, 20, row_filter)]
+        assert found == expected, terms
+
+
+def test_partial_ratio_is_the_difflib_scorer():
+    # Scores of fuzzywuzzy's difflib implementation
+    assert partial_ratio("abc", "abc") == 100
+    assert partial_ratio("", "abc") == 0
+    assert partial_ratio("bolt", "hex bolt grade 5") == 100
+    assert partial_ratio("alumnum bar", "aluminum bar 6061") == 91
@@ -0,0 +1,120 @@
+"""
+Category-sharded ingestion: deltas without a category and category changes
+must reach the shard that holds the part
+"""
+
+from app.database.ingestion import ensure_catalog_schema, load_catalog
+from app.database.migrations import connect_for_migration
+from app.database.sharding import shard_index
+
+SHARD_COUNT = 2
+
+
+def _categories():
+    """One category per shard"""
+    categories = {}
+    for i in range(100):
+        categories.setdefault(shard_index(f"Category {i}", SHARD_COUNT), f"Category {i}")
+        if len(categories) == SHARD_COUNT:
+            return [categories[shard] for shard in range(SHARD_COUNT)]
+    raise AssertionError("no category for some shard")
+
+
+def _connect(tmp_path):
+    conns = []
+    for shard in range(SHARD_COUNT):
+        conn = connect_for_migration(str(tmp_path / f"shard_{shard}.db"))
+        ensure_catalog_schema(conn)
+        conns.append(conn)
+    return conns
+
+
+def _locate(conns, part_number):
+    return [
+        (shard, row[0], row[1]) for shard, conn in enumerate(conns)
+        for row in conn.execute(
+            "SELECT category, list_price FROM parts_catalog WHERE part_number = ?", (part_number,)
+        )
+    ]
+
+
+def test_category_sharded_deltas_and_moves(tmp_path):
+    first, second = _categories()
+    conns = _connect(tmp_path)
+    try:
+        parts = [
+            {"part_number": f"P-{i}", "description": f"Part {i}", "category": first, "list_price": 10.0}
+            for i in range(5)
+        ]
+        stats = load_catalog(conns, parts, shard_key="category")
+        assert (stats.inserted, stats.updated, stats.skipped) == (5, 0, 0)
+
+        stats = load_catalog(conns, [
+            # Price delta without a category
+            {"part_number": "P-0", "list_price": 12.5},
+            # Delta for a part that does not exist
+            {"part_number": "MISSING", "list_price": 1.0},
+            # Category change, given as a partial record
+            {"part_number": "P-1", "category": second},
+            # Category change, then a delta in the same load
+            {"part_number": "P-2", "description": "Part 2", "category": second, "list_price": 20.0},
+            {"part_number": "P-2", "list_price": 21.0},
+        ], shard_key="category")
+        assert (stats.inserted, stats.updated, stats.skipped) == (0, 4, 1)
+
+        assert _locate(conns, "P-0") == [(0, first, 12.5)]
+        assert _locate(conns, "P-1") == [(1, second, 10.0)]
+        assert _locate(conns, "P-2") == [(1, second, 21.0)]
+        assert _locate(conns, "MISSING") == []
+        assert sum(conn.execute("SELECT COUNT(*) FROM parts_catalog").fetchone()[0] for conn in conns) == 5
+    finally:
+        for conn in conns:
+            conn.close()
+
+
+def _schema(conn):
+    return sorted(conn.execute(
+        "SELECT type, name FROM sqlite_master WHERE type IN ('index', 'trigger') AND name NOT LIKE 'sqlite_%'"
+    ))
+
+
+def test_invalid_records_are_skipped(tmp_path):
+    conns = _connect(tmp_path)
+    try:
+        before = [_schema(conn) for conn in conns]
+        stats = load_catalog(conns, [
+            {"part_number": "P-0", "description": "Part 0", "category": "Bolts", "quantity_on_hand": "12"},
+            {"part_number": "P-1", "description": "Part 1", "category": "Bolts", "quantity_on_hand": "n/a"},
+            {"part_number": "P-2", "description": {"text": "Part 2"}, "category": "Bolts"},
+            ["P-3", "Part 3"],
+            {"part_number": "P-4", "description": "Part 4", "category": "Bolts", "quantity_on_hand": 0},
+        ])
+        assert (stats.rows_read, stats.inserted, stats.skipped) == (5, 2, 3)
+        assert [_schema(conn) for conn in conns] == before
+    finally:
+        for conn in conns:
+            conn.close()
+
+
+def test_failed_load_restores_indexes_and_triggers(tmp_path):
+    conns = _connect(tmp_path)
+
+    def records():
+        for i in range(10):
+            yield {"part_number": f"P-{i}", "description": f"Part {i}", "category": "Bolts"}
+        raise OSError("read failed")
+
+    try:
+        before = [_schema(conn) for conn in conns]
+        assert any(name for kind, name in before[0] if kind == 'trigger')
+        try:
+            load_catalog(conns, records(), batch_size=4)
+        except OSError:
+            pass
+        else:
+            raise AssertionError("load did not fail")
+        assert [_schema(conn) for conn in conns] == before
+        assert not any(conn.in_transaction for conn in conns)
+    finally:
+        for conn in conns:
+            conn.close()
@@ -0,0 +1,147 @@
+"""
+Restart behaviour of the local vector store: a catalog that has not been
+compacted yet lives only in the WAL and must survive a reopen
+"""
+
+import asyncio
+import json
+
+import numpy as np
+
+from app.services.local_vector_store import LocalPartsCatalogVectorStore
+
+PART_COUNT = 200
+DIMENSIONS = 16
+
+
+def _parts_and_vectors():
+    rng = np.random.default_rng(7)
+    parts = [
+        {
+            "part_number": f"TEST-{i:04d}",
+            "description": f"Test part {i}",
+            "category": "bar" if i % 2 else "sheet",
+            "material": "steel",
+            "specifications": {"length": i},
+        }
+        for i in range(PART_COUNT)
+    ]
+    vectors = rng.standard_normal((PART_COUNT, DIMENSIONS)).tolist()
+    return parts, vectors
+
+
+def test_wal_only_catalog_survives_restart(tmp_path):
+    parts, vectors = _parts_and_vectors()
+
+    async def scenario():
+        store = LocalPartsCatalogVectorStore(str(tmp_path))
+        assert await store.index_parts(parts, vectors) == PART_COUNT
+        # Below the compaction threshold, so nothing but the WAL is on disk
+        assert not store._get_metadata_path(store.collection_name).exists()
+
+        reopened = LocalPartsCatalogVectorStore(str(tmp_path))
+        stats = await reopened.get_collection_stats(reopened.collection_name)
+        assert stats["exists"] and stats["count"] == PART_COUNT
+
+        results = await reopened.search_similar(vectors[42], top_k=1, min_similarity=0.0, exact=True)
+        assert results[0]["id"] == "TEST-0042"
+        assert (await reopened.get_part_by_number("TEST-0007")) is not None
+        assert len(reopened.read_all_parts()) == PART_COUNT
+
+        assert await reopened.compact(reopened.collection_name)
+
+        compacted = LocalPartsCatalogVectorStore(str(tmp_path))
+        assert not compacted._get_wal_path(compacted.collection_name).exists()
+        stats = await compacted.get_collection_stats(compacted.collection_name)
+        assert stats["count"] == PART_COUNT
+        results = await compacted.search_similar(vectors[42], top_k=1, min_similarity=0.0, exact=True)
+        assert results[0]["id"] == "TEST-0042"
+
+    asyncio.run(scenario())
+
+
+def test_compact_keeps_unreadable_collection(tmp_path):
+    parts, vectors = _parts_and_vectors()
+
+    async def scenario():
+        store = LocalPartsCatalogVectorStore(str(tmp_path))
+        await store.index_parts(parts, vectors)
+        assert await store.compact(store.collection_name)
+
+        # Corrupt the sidecar so the base no longer loads
+        metadata_path = store._get_metadata_path(store.collection_name)
+        metadata_path.write_text("{not json")
+
+        reopened = LocalPartsCatalogVectorStore(str(tmp_path))
+        assert not await reopened.compact(reopened.collection_name)
+        assert await reopened.index_parts(parts[:1], vectors[:1]) == 0
+        assert metadata_path.read_text() == "{not json"
+
+    asyncio.run(scenario())
+
+
+def _write_json_collection(store, vectors):
+    path = store._get_collection_path(store.collection_name)
+    path.write_text(json.dumps({"vectors": vectors}))
+
+
+def test_convert_json_keeps_logged_upserts(tmp_path):
+    async def scenario():
+        store = LocalPartsCatalogVectorStore(str(tmp_path))
+        _write_json_collection(store, [{"id": "a", "vector": [1.0, 0.0], "metadata": {"part_number": "a"}}])
+        assert await store.add_vector([0.0, 1.0], {"part_number": "b"}, "b", store.collection_name)
+
+        assert await store.convert_json_collection(store.collection_name) == 2
+        assert not store._get_wal_path(store.collection_name).exists()
+
+        reopened = LocalPartsCatalogVectorStore(str(tmp_path))
+        assert sorted(part["part_number"] for part in reopened.read_all_parts()) == ["a", "b"]
+
+    asyncio.run(scenario())
+
+
+def test_readers_leave_torn_wal_record_to_writers(tmp_path):
+    parts, vectors = _parts_and_vectors()
+
+    async def scenario():
+        store = LocalPartsCatalogVectorStore(str(tmp_path))
+        await store.index_parts(parts[:3], vectors[:3])
+
+        wal_path = store._get_wal_path(store.collection_name)
+        with open(wal_path, "ab") as f:
+            f.write(b'{"id":"TEST-9999","vec')
+        size = wal_path.stat().st_size
+
+        # Reading skips the incomplete record without touching the file
+        assert len(LocalPartsCatalogVectorStore(str(tmp_path)).read_all_parts()) == 3
+        assert wal_path.stat().st_size == size
+
+        # The next append cuts it before writing
+        writer = LocalPartsCatalogVectorStore(str(tmp_path))
+        assert await writer.index_parts(parts[3:4], vectors[3:4]) == 1
+        assert len(LocalPartsCatalogVectorStore(str(tmp_path)).read_all_parts()) == 4
+
+    asyncio.run(scenario())
+
+
+def test_interrupted_base_write_keeps_previous_generation(tmp_path):
+    parts, vectors = _parts_and_vectors()
+
+    async def scenario():
+        store = LocalPartsCatalogVectorStore(str(tmp_path))
+        await store.index_parts(parts, vectors)
+        assert await store.compact(store.collection_name)
+
+        # A crash after writing the next matrix, before publishing its sidecar
+        orphan = store._get_matrix_path(store.collection_name, "1")
+        np.save(orphan, np.zeros((3, DIMENSIONS), dtype=np.float32))
+
+        reopened = LocalPartsCatalogVectorStore(str(tmp_path))
+        assert len(reopened.read_all_parts()) == PART_COUNT
+
+        assert await reopened.compact(reopened.collection_name)
+        assert not orphan.exists()
+        matrices = list(tmp_path.glob(f"{store.collection_name}*.npy"))
+        assert len(matrices) == 1
+
+    asyncio.run(scenario())
@@ -0,0 +1,105 @@
+"""
+search_parts_batch returns exactly what search_parts returns for each query,
+whether candidates come from one statement, several chunks, shards or the
+result cache
+"""
+
+import asyncio
+import random
+
+import pytest
+
+from app.database.connection_pool import SecureDatabaseManager
+from app.database.ingestion import ensure_catalog_schema, load_catalog
+from app.database.migrations import connect_for_migration
+from app.services.local_parts_catalog import LocalPartsCatalogService
+from app.services.search_result_cache import SearchResultCache
+
+QUERIES = [
+    "hex bolt", "BOL-000012", "  hex   bolt", "m6", "washer 304", "BOL-00001",
+    "stainless", "hex bolt", "no such part", "socket cap zinc",
+]
+FILTERS = [None, {"category": "Fasteners", "material": "Steel"}]
+
+WORDS = "hex bolt nut washer flat lock stainless steel brass 304 316 m6 m8 zinc plated socket cap".split()
+
+
+def _parts(count=300, seed=41):
+    rng = random.Random(seed)
+    return [
+        {
+            "part_number": f"{rng.choice(['BOL', 'NUT', 'WSH'])}-{i:06d}",
+            "description": " ".join(rng.choice(WORDS) for _ in range(rng.randint(2, 8))),
+            "category": rng.choice(["Fasteners", "Hardware"]),
+            "material": rng.choice(["Steel", "Stainless Steel", "Brass"]),
+            "list_price": round(rng.uniform(1, 100), 2),
+            "quantity_on_hand": rng.choice([0, 5, 500]),
+        }
+        for i in range(count)
+    ]
+
+
+def _catalog(paths, parts):
+    conns = []
+    for path in paths:
+        conn = connect_for_migration(str(path))
+        ensure_catalog_schema(conn)
+        conns.append(conn)
+    load_catalog(conns, parts)
+    for conn in conns:
+        conn.close()
+    return [str(path) for path in paths]
+
+
+def _service(manager, cache_entries=0):
+    service = LocalPartsCatalogService()
+    service.db_manager = manager
+    service.result_cache = SearchResultCache(max_entries=cache_entries)
+    return service
+
+
+def _ids(results):
+    return [(part["part_number"], part["scores"]["combined_score"]) for part in results]
+
+
+@pytest.mark.parametrize("sharded", [False, True])
+@pytest.mark.parametrize("filters", FILTERS)
+def test_batch_matches_individual_searches(tmp_path, monkeypatch, sharded, filters):
+    paths = [tmp_path / "shard_0.db", tmp_path / "shard_1.db"] if sharded else [tmp_path / "catalog.db"]
+    service = _service(SecureDatabaseManager(shard_paths=_catalog(paths, _parts())))
+
+    async def scenario():
+        expected = [await service.search_parts(query, filters, top_k=8) for query in QUERIES]
+        batch = await service.search_parts_batch(QUERIES, filters, top_k=8)
+        # Several statements when the batch is larger than one chunk
+        monkeypatch.setattr(LocalPartsCatalogService, "MAX_BATCH_QUERIES", 3)
+        chunked = await service.search_parts_batch(QUERIES, filters, top_k=8)
+        return expected, batch, chunked
+
+    expected, batch, chunked = asyncio.run(scenario())
+    assert any(expected)
+    for query, want, got, got_chunked in zip(QUERIES, expected, batch, chunked):
+        assert _ids(got) == _ids(want), query
+        assert _ids(got_chunked) == _ids(want), query
+
+
+def test_batch_with_cache_and_repeated_queries(tmp_path):
+    service = _service(SecureDatabaseManager(_catalog([tmp_path / "catalog.db"], _parts())[0]),
+                       cache_entries=100)
+
+    async def scenario():
+        # Some queries cached by earlier single searches, the rest retrieved in the batch
+        first = [await service.search_parts(query, None, top_k=8) for query in QUERIES[:3]]
+        batch = await service.search_parts_batch(QUERIES, None, top_k=8)
+        again = await service.search_parts_batch(QUERIES, None, top_k=8)
+        return first, batch, again
+
+    first, batch, again = asyncio.run(scenario())
+    for want, got in zip(first, batch):
+        assert _ids(got) == _ids(want)
+    assert [_ids(results) for results in again] == [_ids(results) for results in batch]
+
+    # "hex bolt" appears three times; every occurrence is a separate copy
+    batch[0][0]["scores"]["combined_score"] = -1
+    assert batch[2][0]["scores"]["combined_score"] != -1
+    assert batch[7][0]["scores"]["combined_score"] != -1
@@ -0,0 +1,130 @@
+"""
+Search result cache: LRU and TTL eviction, and invalidation whenever the
+catalog version changes - including a read replica being replaced
+"""
+
+import asyncio
+import os
+import shutil
+import sqlite3
+
+from app.database.connection_pool import SecureDatabaseManager
+from app.database.ingestion import ensure_catalog_schema, load_catalog
+from app.database.migrations import connect_for_migration
+from app.services.local_parts_catalog import LocalPartsCatalogService
+from app.services.search_result_cache import SearchResultCache
+
+
+def _parts(price=1.0):
+    return [
+        {"part_number": f"BOL-{i:04d}", "description": f"hex bolt {i} steel", "category": "Fasteners",
+         "material": "Steel", "list_price": price + i}
+        for i in range(20)
+    ]
+
+
+def _catalog(path, parts):
+    conn = connect_for_migration(str(path))
+    ensure_catalog_schema(conn)
+    load_catalog([conn], parts)
+    conn.close()
+    return str(path)
+
+
+def _reprice(path, part_number, price):
+    conn = sqlite3.connect(path)
+    conn.execute("UPDATE parts_catalog SET list_price = ? WHERE part_number = ?", (price, part_number))
+    conn.commit()
+    conn.close()
+
+
+def _replace_replica(primary, replica):
+    """Catch a replica up the supported way: rename a fresh copy over it"""
+    source, copy = sqlite3.connect(primary), sqlite3.connect(replica + ".new")
+    source.backup(copy)
+    source.close()
+    copy.close()
+    os.replace(replica + ".new", replica)
+
+
+def _service(manager, cache):
+    service = LocalPartsCatalogService()
+    service.db_manager = manager
+    service.result_cache = cache
+    return service
+
+
+def test_lru_and_ttl_eviction():
+    cache = SearchResultCache(max_entries=2)
+    for query in ("a", "b", "c"):
+        cache.put(cache.make_key(query, None, 10), 1, [{"part_number": query}])
+    assert cache.get(cache.make_key("a", None, 10), 1) is None
+    assert cache.get(cache.make_key("c", None, 10), 1) == [{"part_number": "c"}]
+
+    expired = SearchResultCache(ttl_seconds=0)
+    key = expired.make_key("a", None, 10)
+    expired.put(key, 1, [{"part_number": "a"}])
+    assert expired.get(key, 1) is None
+    assert expired.get_stats()["expired"] == 1
+
+
+def test_version_change_clears_and_stale_puts_are_dropped():
+    cache = SearchResultCache()
+    key = cache.make_key("bolt", None, 10)
+    cache.put(key, 1, [{"part_number": "old"}])
+    assert cache.get(key, 1) == [{"part_number": "old"}]
+
+    assert cache.get(key, 2) is None
+    assert cache.get_stats()["invalidations"] == 1
+    # A search that started before the change finishes late
+    cache.put(key, 1, [{"part_number": "old"}])
+    assert cache.get(key, 2) is None
+
+
+def test_catalog_version_covers_replicas_and_is_reused_briefly(tmp_path):
+    primary = _catalog(tmp_path / "primary.db", _parts())
+    replica = str(tmp_path / "replica.db")
+    shutil.copy(primary, replica)
+
+    cached = SecureDatabaseManager(primary, replica_paths=[replica], version_check_interval=60)
+    manager = SecureDatabaseManager(primary, replica_paths=[replica], version_check_interval=0)
+    cached_version = cached.get_catalog_version()
+    version = manager.get_catalog_version()
+
+    _reprice(primary, "BOL-0000", 5.0)
+    assert cached.get_catalog_version() == cached_version
+    primary_changed = manager.get_catalog_version()
+    assert primary_changed != version
+    # The replica catching up changes the version again
+    _replace_replica(primary, replica)
+    assert asyncio.run(manager.fetch_catalog_version()) != primary_changed
+    cached.close_all()
+    manager.close_all()
+
+
+def test_search_results_follow_the_replica_that_served_them(tmp_path):
+    primary = _catalog(tmp_path / "primary.db", _parts())
+    replica = str(tmp_path / "replica.db")
+    shutil.copy(primary, replica)
+    manager = SecureDatabaseManager(primary, replica_paths=[replica], version_check_interval=0)
+    service = _service(manager, SearchResultCache())
+
+    def price():
+        results = asyncio.run(service.search_parts("BOL-0000", top_k=1))
+        return results[0]["list_price"]
+
+    assert price() == 1.0
+    assert service.result_cache.get_stats()["hits"] == 0
+    assert price() == 1.0
+    assert service.result_cache.get_stats()["hits"] == 1
+
+    # The primary changes but the replica lags: results still come from the replica
+    _reprice(primary, "BOL-0000", 7.5)
+    assert price() == 1.0
+    # Once the replica catches up, neither the cache nor connections to the
+    # old file serve its rows
+    _replace_replica(primary, replica)
+    assert price() == 7.5
+    assert price() == 7.5
+    assert service.result_cache.get_stats()["hits"] == 2
+    manager.close_all()
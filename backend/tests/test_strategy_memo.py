@@ -0,0 +1,66 @@
+"""
+Per-order strategy memo: concurrent and repeated searches with the same key
+run once, every caller gets its own copy, and a cancelled caller does not
+cancel the search for the others
+"""
+
+import asyncio
+
+from app.agents.search_strategies.base import SearchContext, SearchStrategy, StrategyMemo
+
+
+class CountingStrategy(SearchStrategy):
+    def __init__(self, delay=0.01):
+        super().__init__(weight=0.9)
+        self.delay = delay
+        self.calls = []
+
+    async def execute(self, query, filters=None, top_k=10):
+        self.calls.append((query, top_k))
+        await asyncio.sleep(self.delay)
+        return [{"part_number": f"P-{i}", "scores": {"combined_score": 0.9}} for i in range(top_k)]
+
+
+def test_same_key_runs_once_and_callers_get_copies():
+    strategy = CountingStrategy()
+    context = SearchContext(parts_catalog=None, embedding_service=None)
+    memo = StrategyMemo()
+
+    async def scenario():
+        results = await asyncio.gather(
+            context.execute_strategy(strategy, "hex bolt", None, 3, memo),
+            context.execute_strategy(strategy, "  hex   bolt ", None, 3, memo),
+            context.execute_strategy(strategy, "hex bolt", None, 3, memo),
+            context.execute_strategy(strategy, "hex bolt", None, 5, memo),
+        )
+        # A later search for the same key reuses the finished one
+        results.append(await context.execute_strategy(strategy, "hex bolt", None, 3, memo))
+        return results
+
+    results = asyncio.run(scenario())
+    assert strategy.calls == [("hex bolt", 3), ("hex bolt", 5)]
+    assert memo.stats == {"hits": 3, "misses": 2}
+    assert results[0] == results[1] == results[2] == results[4]
+    assert results[0][0]["scores"]["strategy_weighted_score"] == 0.9 * 0.9
+
+    results[0][0]["scores"]["combined_score"] = 0.0
+    assert results[1][0]["scores"]["combined_score"] == 0.9
+
+
+def test_cancelled_caller_does_not_cancel_shared_search():
+    strategy = CountingStrategy(delay=0.05)
+    context = SearchContext(parts_catalog=None, embedding_service=None)
+    memo = StrategyMemo()
+
+    async def scenario():
+        first = asyncio.ensure_future(context.execute_strategy(strategy, "washer", None, 2, memo))
+        second = asyncio.ensure_future(context.execute_strategy(strategy, "washer", None, 2, memo))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        results = await second
+        assert first.cancelled()
+        return results
+
+    results = asyncio.run(scenario())
+    assert [r["part_number"] for r in results] == ["P-0", "P-1"]
+    assert len(strategy.calls) == 1